@@ -2,12 +2,19 @@
 """
 원래 namecard-web 프로젝트에서 uslab 프로젝트로 데이터 마이그레이션
 Python으로 데이터를 가져와서 SQL을 생성하고 실행
+
+사용 방법:
+  python execute_migration.py              # 배치 INSERT 문 (migrate_all_tables.sql)
+  python execute_migration.py --copy       # COPY 형식 (migrate_all_tables_copy.sql)
+  --max-mb 5 로 파일을 5MB 단위로 나누고(migrate_all_tables_001.sql …), --gzip 으로 압축
+COPY 형식은 테이블마다 임시 스테이징 테이블에 COPY로 적재한 뒤 INSERT ... SELECT ...
+ON CONFLICT 한 번으로 옮깁니다. COPY FROM STDIN이 들어 있으므로 psql로 실행합니다:
+  psql "$DATABASE_URL" -f migrate_all_tables_copy.sql
 """
 
 from supabase import create_client, Client
-from typing import List, Dict, Any
-import json
-import re
+import argparse
+from migration_utils import iter_table_rows, SqlFileWriter, write_insert_batches, write_copy_table
 
 # 원래 프로젝트 정보 (namecard-web)
 OLD_PROJECT_URL = "https://ekmuddykdzebbxmgigif.supabase.co"
@@ -21,110 +28,53 @@ TABLES_ORDER = [
 ]
 
 
-def get_table_data(client: Client, table: str) -> List[Dict[str, Any]]:
-    """테이블의 모든 데이터 조회"""
-    try:
-        response = client.table(table).select('*').execute()
-        return response.data if response.data else []
-    except Exception as e:
-        print(f"Error fetching {table}: {e}")
-        return []
-
-
-def format_sql_value(value):
-    """SQL 값 포맷팅"""
-    if value is None:
-        return 'NULL'
-    elif isinstance(value, str):
-        # SQL 인젝션 방지 및 JSON 문자열 처리
-        escaped = value.replace("'", "''").replace("\\", "\\\\")
-        return f"'{escaped}'"
-    elif isinstance(value, bool):
-        return 'TRUE' if value else 'FALSE'
-    elif isinstance(value, (int, float)):
-        return str(value)
-    elif isinstance(value, dict):
-        # JSON 객체
-        json_str = json.dumps(value, ensure_ascii=False)
-        escaped = json_str.replace("'", "''")
-        return f"'{escaped}'::jsonb"
-    else:
-        # UUID, 날짜 등은 문자열로 처리
-        escaped = str(value).replace("'", "''")
-        return f"'{escaped}'"
-
-
-def generate_insert_sql(table: str, data: List[Dict[str, Any]], schema: str = 'nametag') -> str:
-    """데이터를 SQL INSERT 문으로 변환"""
-    if not data:
-        return ""
-    
-    # 컬럼 목록 추출
-    columns = list(data[0].keys())
-    columns_str = ', '.join(columns)
-    
-    # VALUES 생성
-    values_list = []
-    for row in data:
-        values = [format_sql_value(row.get(col)) for col in columns]
-        values_list.append(f"({', '.join(values)})")
-    
-    # SQL 문 생성
-    sql = f"INSERT INTO {schema}.{table} ({columns_str})\nVALUES\n"
-    sql += ",\n".join(values_list)
-    sql += "\nON CONFLICT (id) DO NOTHING;"
-    
-    return sql
+def parse_args():
+    parser = argparse.ArgumentParser(description="데이터 추출 및 마이그레이션 SQL 생성")
+    parser.add_argument('--copy', action='store_true', help="COPY 형식으로 생성")
+    parser.add_argument('--max-mb', type=float, help="파일 하나의 최대 크기 (MB, 넘으면 다음 파일로)")
+    parser.add_argument('--gzip', action='store_true', help="gzip으로 압축해 저장")
+    return parser.parse_args()
 
 
-def main():
-    """메인 함수 - SQL 생성 및 출력"""
+def main(args):
+    """메인 함수 - 테이블을 읽으면서 SQL을 바로 파일에 씀 (메모리에는 한 페이지만)"""
     print("=" * 60)
-    print("원래 프로젝트에서 데이터 추출 및 SQL 생성")
+    print("원래 프로젝트에서 데이터 추출 및 SQL 생성" + (" (COPY 형식)" if args.copy else ""))
     print("=" * 60)
     
     # 클라이언트 생성
     old_client: Client = create_client(OLD_PROJECT_URL, OLD_PROJECT_KEY)
     
-    all_sql = []
-    
-    # 각 테이블 순서대로 처리
-    for table in TABLES_ORDER:
-        print(f"\n[{table}] 테이블 처리 중...")
-        
-        # 원래 프로젝트에서 데이터 조회
-        data = get_table_data(old_client, table)
-        
-        if not data:
-            print(f"  ⚠️  마이그레이션할 데이터가 없습니다.")
-            continue
-        
-        print(f"  📊 {len(data)}개의 레코드 발견")
-        
-        # 배치로 나누어 SQL 생성
-        batch_size = 50  # 배치 크기를 줄여서 안정성 확보
-        for i in range(0, len(data), batch_size):
-            batch = data[i:i + batch_size]
-            sql = generate_insert_sql(table, batch)
-            all_sql.append(f"-- {table} 테이블 배치 {i//batch_size + 1} ({len(batch)}개 레코드)\n{sql}\n")
-            print(f"  ✅ 배치 {i//batch_size + 1}/{(len(data) + batch_size - 1)//batch_size} SQL 생성 완료")
+    output_file = "migrate_all_tables_copy.sql" if args.copy else "migrate_all_tables.sql"
+    header = "-- 전체 테이블 마이그레이션 SQL" + (" (COPY 형식, psql -f 로 실행)" if args.copy else "") + "\n\n"
+    max_bytes = int(args.max_mb * 1024 * 1024) if args.max_mb else None
     
-    # 모든 SQL을 하나의 파일로 저장
-    output_file = "migrate_all_tables.sql"
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write("-- 전체 테이블 마이그레이션 SQL\n")
-        f.write("-- 생성일: 2025-01-XX\n\n")
-        for sql in all_sql:
-            f.write(sql)
-            f.write("\n")
+    with SqlFileWriter(output_file, max_bytes=max_bytes, compress=args.gzip, header=header) as writer:
+        # 각 테이블 순서대로 처리
+        for table in TABLES_ORDER:
+            print(f"\n[{table}] 테이블 처리 중...")
+            rows = iter_table_rows(old_client, table)
+            if args.copy:
+                count = write_copy_table(writer, table, rows)
+                writer.end_statement()
+            else:
+                batch_size = 50  # 배치 크기를 줄여서 안정성 확보
+                count = write_insert_batches(writer, table, rows, batch_size)
+            
+            if not count:
+                print(f"  ⚠️  마이그레이션할 데이터가 없습니다.")
+                continue
+            
+            print(f"  📊 {count}개의 레코드 처리")
     
-    print(f"\n✅ 모든 SQL이 {output_file} 파일에 저장되었습니다.")
-    print(f"📝 총 {len(all_sql)}개의 배치 SQL이 생성되었습니다.")
+    print(f"\n✅ 모든 SQL이 저장되었습니다 ({writer.bytes_written / 1024:.0f}KB):")
+    for path in writer.paths:
+        print(f"  💾 {path}")
 
 
 if __name__ == "__main__":
     try:
-        main()
+        main(parse_args())
     except KeyboardInterrupt:
         print("\n\n작업이 중단되었습니다.")
     except Exception as e:
@@ -0,0 +1,387 @@
+#!/usr/bin/env python3
+"""
+라벨/감열 프린터 직접 출력 (ZPL / ESC-POS)
+
+A4 전체 래스터 대신 명찰 영역만 프린터 고유 DPI로 그려 1비트 래스터로 보냅니다.
+
+- ZPL: 배경 레이어는 레이아웃마다 한 번만 ~DG로 프린터 메모리에 올리고(^XG로 재사용),
+  라벨마다 텍스트 레이어만 ^GFA(ASCII 압축)로 보냅니다.
+- ESC/POS: GS v 0 래스터. 배경 비트맵은 레이아웃마다 한 번만 만들어 텍스트와 OR 합성합니다.
+- 출력 대상: 파일/장치 경로(/dev/usb/lp0, out.zpl 등) 또는 tcp://호스트:포트 (보통 9100)
+
+테스트:
+  python label_printer.py decode out.zpl --pbm label
+  → 저장된 작업을 다시 비트맵으로 풀어 label-1.pbm, label-2.pbm ... 로 저장
+"""
+
+import re
+import socket
+import argparse
+
+ZPL = "zpl"
+ESCPOS = "escpos"
+LANGUAGES = (ZPL, ESCPOS)
+SCENE_DPI = 144  # namecard_maker 씬 좌표 기준 DPI
+ESCPOS_BAND_ROWS = 256  # GS v 0 한 번에 보내는 최대 행 수
+
+
+class MonoBitmap:
+    """1비트 비트맵 (행 단위 MSB 우선, 1 = 검정)"""
+    def __init__(self, width, height, data=None):
+        self.width = width
+        self.height = height
+        self.bytes_per_row = (width + 7) // 8
+        self.data = bytes(data) if data is not None else bytes(self.bytes_per_row * height)
+        if len(self.data) != self.bytes_per_row * height:
+            raise ValueError("비트맵 데이터 크기가 맞지 않습니다.")
+
+    def row(self, y):
+        start = y * self.bytes_per_row
+        return self.data[start:start + self.bytes_per_row]
+
+    def rows(self):
+        for y in range(self.height):
+            yield self.row(y)
+
+    def union(self, other):
+        """같은 크기 비트맵과 OR 합성"""
+        if (self.width, self.height) != (other.width, other.height):
+            raise ValueError("비트맵 크기가 다릅니다.")
+        size = len(self.data)
+        merged = int.from_bytes(self.data, "big") | int.from_bytes(other.data, "big")
+        return MonoBitmap(self.width, self.height, merged.to_bytes(size, "big"))
+
+    def paste(self, other, x, y):
+        """other를 (x, y)에 OR로 겹칩니다 (x는 8의 배수만 지원)."""
+        if x % 8:
+            raise ValueError("x 위치는 8의 배수여야 합니다.")
+        data = bytearray(self.data)
+        offset = x // 8
+        for row_index, row in enumerate(other.rows()):
+            target_y = y + row_index
+            if not 0 <= target_y < self.height:
+                continue
+            start = target_y * self.bytes_per_row + offset
+            length = max(0, min(len(row), self.bytes_per_row - offset))
+            current = data[start:start + length]
+            data[start:start + length] = (
+                int.from_bytes(current, "big") | int.from_bytes(row[:length], "big")
+            ).to_bytes(length, "big")
+        return MonoBitmap(self.width, self.height, data)
+
+    def black_pixels(self):
+        return sum(bin(byte).count("1") for byte in self.data)
+
+    def to_pbm(self):
+        """PBM(P4) 바이트 (확인용)"""
+        return f"P4\n{self.width} {self.height}\n".encode("ascii") + self.data
+
+
+# 회색조(0~255) → '1'(검정)/'0'(흰색) 문자 변환표. 행을 int(…, 2)로 한 번에 묶기 위함
+_THRESHOLD_TABLES = {}
+
+
+def _threshold_table(threshold):
+    table = _THRESHOLD_TABLES.get(threshold)
+    if table is None:
+        table = bytes(ord("1") if value < threshold else ord("0") for value in range(256))
+        _THRESHOLD_TABLES[threshold] = table
+    return table
+
+
+def bitmap_from_grayscale(width, height, pixels, stride, threshold=128):
+    """8비트 회색조 버퍼를 임계값으로 1비트 비트맵으로 바꿉니다."""
+    table = _threshold_table(threshold)
+    bytes_per_row = (width + 7) // 8
+    padding = b"0" * (bytes_per_row * 8 - width)
+    out = bytearray()
+    for y in range(height):
+        bits = pixels[y * stride:y * stride + width].translate(table) + padding
+        out += int(bits, 2).to_bytes(bytes_per_row, "big")
+    return MonoBitmap(width, height, out)
+
+
+# ---------------------------------------------------------------------------
+# ZPL
+# ---------------------------------------------------------------------------
+
+def zpl_graphic_hex(bitmap):
+    """^GFA/~DG 용 ASCII hex (ZPL ASCII 압축: ':' 이전 행 반복, ',' 행 나머지 0)"""
+    parts = []
+    previous = None
+    for row in bitmap.rows():
+        if row == previous:
+            parts.append(":")
+            continue
+        previous = row
+        hex_row = row.hex().upper()
+        stripped = hex_row.rstrip("0")
+        if len(stripped) < len(hex_row):
+            parts.append(stripped + ",")
+        else:
+            parts.append(hex_row)
+    return "".join(parts)
+
+
+def zpl_download_graphic(name, bitmap):
+    """배경을 프린터 메모리(R:)에 저장하는 ~DG 명령"""
+    total = bitmap.bytes_per_row * bitmap.height
+    return f"~DGR:{name}.GRF,{total},{bitmap.bytes_per_row},{zpl_graphic_hex(bitmap)}\n".encode("ascii")
+
+
+def zpl_label(text_bitmap, background_name=None):
+    """라벨 한 장 (저장된 배경 ^XG + 텍스트 레이어 ^GFA)"""
+    total = text_bitmap.bytes_per_row * text_bitmap.height
+    parts = [f"^XA^PW{text_bitmap.width}^LL{text_bitmap.height}^LH0,0"]
+    if background_name:
+        parts.append(f"^FO0,0^XGR:{background_name}.GRF,1,1^FS")
+    parts.append(f"^FO0,0^GFA,{total},{total},{text_bitmap.bytes_per_row},"
+                 f"{zpl_graphic_hex(text_bitmap)}^FS")
+    parts.append("^XZ\n")
+    return "".join(parts).encode("ascii")
+
+
+def _decode_zpl_hex(text, total, bytes_per_row):
+    row_hex = bytes_per_row * 2
+    rows = []
+    current = ""
+    for char in text:
+        if char == ":":
+            if current:
+                rows.append(current.ljust(row_hex, "0"))
+                current = ""
+            rows.append(rows[-1] if rows else "0" * row_hex)
+        elif char == ",":
+            rows.append(current.ljust(row_hex, "0"))
+            current = ""
+        elif not char.isspace():
+            current += char
+            if len(current) == row_hex:
+                rows.append(current)
+                current = ""
+    if current:
+        rows.append(current.ljust(row_hex, "0"))
+    data = bytes.fromhex("".join(rows))
+    if len(data) != total:
+        raise ValueError(f"그래픽 크기 불일치 ({len(data)} != {total})")
+    return data
+
+
+def decode_zpl(data):
+    """encode한 ZPL을 라벨별 비트맵 목록으로 되돌립니다 (테스트용, 이 모듈이 만든 명령만 지원)."""
+    text = data.decode("ascii") if isinstance(data, bytes) else data
+    graphics = {}
+    for match in re.finditer(r"~DGR:([^.]+)\.GRF,(\d+),(\d+),([^~^]*)", text):
+        name, total, bytes_per_row, payload = match.group(1), int(match.group(2)), int(match.group(3)), match.group(4)
+        height = total // bytes_per_row
+        graphics[name] = MonoBitmap(bytes_per_row * 8, height,
+                                    _decode_zpl_hex(payload, total, bytes_per_row))
+    labels = []
+    for label in re.findall(r"\^XA(.*?)\^XZ", text, re.S):
+        width = int(re.search(r"\^PW(\d+)", label).group(1))
+        height = int(re.search(r"\^LL(\d+)", label).group(1))
+        canvas = MonoBitmap(width, height)
+        for match in re.finditer(r"\^FO(\d+),(\d+)\^(XGR:([^.]+)\.GRF,1,1|GFA,(\d+),\d+,(\d+),([^^]*))\^FS", label):
+            x, y = int(match.group(1)), int(match.group(2))
+            if match.group(4):
+                graphic = graphics[match.group(4)]
+            else:
+                total, bytes_per_row = int(match.group(5)), int(match.group(6))
+                graphic = MonoBitmap(bytes_per_row * 8, total // bytes_per_row,
+                                     _decode_zpl_hex(match.group(7), total, bytes_per_row))
+            canvas = canvas.paste(_crop_width(graphic, width - x), x, y)
+        labels.append(canvas)
+    return labels
+
+
+def _crop_width(bitmap, width):
+    """바이트 단위로 패딩된 그래픽을 라벨 폭에 맞춥니다."""
+    width = min(width, bitmap.width)
+    bytes_per_row = (width + 7) // 8
+    if bytes_per_row == bitmap.bytes_per_row:
+        return MonoBitmap(width, bitmap.height, bitmap.data)
+    return MonoBitmap(width, bitmap.height, b"".join(row[:bytes_per_row] for row in bitmap.rows()))
+
+
+# ---------------------------------------------------------------------------
+# ESC/POS
+# ---------------------------------------------------------------------------
+
+def escpos_label(bitmap, cut=True):
+    """ESC @ 초기화 + GS v 0 래스터(띠 단위) + 급지/절단"""
+    parts = [b"\x1b@"]
+    for top in range(0, bitmap.height, ESCPOS_BAND_ROWS):
+        rows = min(ESCPOS_BAND_ROWS, bitmap.height - top)
+        start = top * bitmap.bytes_per_row
+        parts.append(b"\x1dv0\x00"
+                     + bitmap.bytes_per_row.to_bytes(2, "little")
+                     + rows.to_bytes(2, "little")
+                     + bitmap.data[start:start + rows * bitmap.bytes_per_row])
+    if cut:
+        parts.append(b"\x1dVB\x00")  # 급지 후 부분 절단
+    return b"".join(parts)
+
+
+def decode_escpos(data):
+    """escpos_label 출력 스트림을 라벨별 비트맵 목록으로 되돌립니다 (테스트용)."""
+    labels = []
+    width = None
+    chunks = []
+    position = 0
+    while position < len(data):
+        if data.startswith(b"\x1b@", position):
+            position += 2
+        elif data.startswith(b"\x1dv0", position):
+            bytes_per_row = int.from_bytes(data[position + 4:position + 6], "little")
+            rows = int.from_bytes(data[position + 6:position + 8], "little")
+            size = bytes_per_row * rows
+            chunks.append(data[position + 8:position + 8 + size])
+            width = bytes_per_row * 8
+            position += 8 + size
+        elif data.startswith(b"\x1dVB", position):
+            position += 4
+            body = b"".join(chunks)
+            labels.append(MonoBitmap(width, len(body) // (width // 8), body))
+            chunks = []
+        else:
+            raise ValueError(f"알 수 없는 ESC/POS 명령 (위치 {position})")
+    return labels
+
+
+# ---------------------------------------------------------------------------
+# 출력 대상
+# ---------------------------------------------------------------------------
+
+class LabelSink:
+    """파일/장치 경로 또는 tcp://호스트:포트 로 작업을 스트리밍합니다."""
+    def __init__(self, target, timeout=10):
+        self.target = target
+        if target.startswith("tcp://"):
+            host, _, port = target[len("tcp://"):].rpartition(":")
+            self._socket = socket.create_connection((host, int(port or 9100)), timeout=timeout)
+            self._file = None
+        else:
+            self._socket = None
+            self._file = open(target, "ab")
+        self.bytes_written = 0
+
+    def write(self, data):
+        if self._socket is not None:
+            self._socket.sendall(data)
+        else:
+            self._file.write(data)
+            self._file.flush()
+        self.bytes_written += len(data)
+
+    def close(self):
+        if self._socket is not None:
+            self._socket.close()
+        if self._file is not None:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ---------------------------------------------------------------------------
+# 명찰 렌더링 (Qt, GUI 스레드)
+# ---------------------------------------------------------------------------
+
+def render_region_bitmap(picture, region, dpi, threshold=128):
+    """씬 좌표 QPicture의 region(QRectF, 144DPI 씬 픽셀)을 dpi로 그려 1비트로 바꿉니다."""
+    from PyQt5.QtCore import Qt
+    from PyQt5.QtGui import QImage, QPainter
+
+    scale = dpi / SCENE_DPI
+    width = max(1, round(region.width() * scale))
+    height = max(1, round(region.height() * scale))
+    image = QImage(width, height, QImage.Format_Grayscale8)
+    image.fill(Qt.white)
+    painter = QPainter(image)
+    painter.setRenderHint(QPainter.TextAntialiasing, False)
+    painter.scale(scale, scale)
+    painter.translate(-region.left(), -region.top())
+    painter.drawPicture(0, 0, picture)
+    painter.end()
+    pixels = image.constBits()
+    pixels.setsize(image.byteCount())
+    return bitmap_from_grayscale(width, height, bytes(pixels), image.bytesPerLine(), threshold)
+
+
+class LabelPrinterBackend:
+    """명찰 영역만 라벨 프린터 DPI의 1비트 래스터로 출력합니다.
+
+    배경 레이어는 레이아웃 해시별로 한 번만 래스터화·인코딩해 두고, ZPL은 연결마다
+    한 번만 프린터 메모리에 내려보냅니다.
+    """
+    def __init__(self, window, language=ZPL, dpi=203, threshold=128):
+        if language not in LANGUAGES:
+            raise ValueError(f"지원하지 않는 언어: {language}")
+        self.window = window
+        self.language = language
+        self.dpi = dpi
+        self.threshold = threshold
+        self._backgrounds = {}  # 레이아웃 해시 -> (비트맵, ZPL 이름, ~DG 명령)
+
+    def badge_region(self):
+        from PyQt5.QtCore import QRectF
+        window = self.window
+        return QRectF(window.badge_left, window.badge_top, window.badge_width_px, window.badge_height_px)
+
+    def background(self, layout_hash, static_picture):
+        entry = self._backgrounds.get(layout_hash)
+        if entry is None:
+            bitmap = render_region_bitmap(static_picture, self.badge_region(), self.dpi, self.threshold)
+            name = "BG" + layout_hash[:6].upper()
+            download = zpl_download_graphic(name, bitmap) if self.language == ZPL else None
+            entry = (bitmap, name, download)
+            self._backgrounds[layout_hash] = entry
+        return entry
+
+    def encode_record(self, record, sent_backgrounds):
+        """레코드 한 장의 명령 바이트. sent_backgrounds는 이 연결에 이미 보낸 배경 이름 집합."""
+        renderer, static_picture, picture = self.window.record_layers(record)
+        background, name, download = self.background(renderer.layout_hash, static_picture)
+        text = render_region_bitmap(picture, self.badge_region(), self.dpi, self.threshold)
+        if self.language == ESCPOS:
+            return escpos_label(background.union(text))
+        prefix = b""
+        if background.black_pixels() == 0:
+            name = None
+        elif name not in sent_backgrounds:
+            prefix = download
+            sent_backgrounds.add(name)
+        return prefix + zpl_label(text, name)
+
+    def print_records(self, records, target):
+        """레코드를 차례로 인코딩하며 바로 대상에 씁니다. 보낸 바이트 수를 반환."""
+        sent_backgrounds = set()
+        with LabelSink(target) as sink:
+            for record in records:
+                sink.write(self.encode_record(record, sent_backgrounds))
+            return sink.bytes_written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="라벨 프린터 출력 파일 확인")
+    sub = parser.add_subparsers(dest="command", required=True)
+    decode_parser = sub.add_parser("decode", help="저장된 ZPL/ESC-POS 작업을 PBM으로 풀기")
+    decode_parser.add_argument("path")
+    decode_parser.add_argument("--pbm", help="PBM 파일 이름 접두사")
+    args = parser.parse_args()
+
+    with open(args.path, "rb") as f:
+        data = f.read()
+    labels = decode_escpos(data) if data.startswith(b"\x1b@") else decode_zpl(data)
+    for number, bitmap in enumerate(labels, 1):
+        print(f"라벨 {number}: {bitmap.width}x{bitmap.height}, 검정 픽셀 {bitmap.black_pixels()}")
+        if args.pbm:
+            with open(f"{args.pbm}-{number}.pbm", "wb") as f:
+                f.write(bitmap.to_pbm())
+
+
+if __name__ == "__main__":
+    main()
@@ -8,10 +8,19 @@ Supabase Storage 파일 마이그레이션 스크립트
 사용 방법:
 1. pip install supabase
 2. 환경 변수 설정 또는 스크립트 내 URL/KEY 수정
-3. python migrate_storage.py
+3. python migrate_storage.py [--download-workers 4] [--upload-workers 4] [--queue-size 8] [--retries 3]
+4. 다시 실행할 때는 바뀐 파일만: python migrate_storage.py --sync [--dry-run]
+   (경로·크기·내용 해시(eTag, 없으면 SHA-256)를 비교하고 옮긴 결과를 storage_sync_manifest.json에 기록)
 """
 
 import os
+import json
+import time
+import hashlib
+import queue
+import random
+import argparse
+import threading
 from supabase import create_client, Client
 from typing import List, Optional
 
@@ -27,11 +36,24 @@ NEW_PROJECT_KEY = "eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9.eyJpc3MiOiJzdXBhYmFzZSIs
 NEW_BUCKET = "nametag-images"
 
 
+# 목록 조회 한 번에 받을 항목 수 (지정하지 않으면 폴더당 100개에서 잘림)
+LIST_PAGE_SIZE = 1000
+
+
 def get_all_files(client: Client, bucket: str, path: str = "") -> List[dict]:
-    """버킷의 모든 파일 목록 가져오기"""
+    """버킷의 모든 파일 목록 가져오기
+
+    폴더마다 LIST_PAGE_SIZE개씩 짧은 페이지가 나올 때까지 읽습니다. 조회 오류는 그대로
+    올려 보냅니다 (목록이 빠진 채로 "옮길 파일 없음"처럼 보이지 않도록).
+    """
     files = []
-    try:
-        result = client.storage.from_(bucket).list(path)
+    offset = 0
+    while True:
+        result = client.storage.from_(bucket).list(path, {
+            "limit": LIST_PAGE_SIZE,
+            "offset": offset,
+            "sortBy": {"column": "name", "order": "asc"},
+        })
         for item in result:
             if item.get("id") is None:  # 폴더인 경우
                 # 재귀적으로 하위 폴더 탐색
@@ -39,66 +61,326 @@ def get_all_files(client: Client, bucket: str, path: str = "") -> List[dict]:
                 files.extend(sub_files)
             else:  # 파일인 경우
                 file_path = f"{path}/{item['name']}" if path else item['name']
+                metadata = item.get("metadata") or {}
                 files.append({
                     "name": item['name'],
                     "path": file_path,
-                    "size": item.get("metadata", {}).get("size", 0),
+                    "size": metadata.get("size", 0),
+                    "etag": (metadata.get("eTag") or "").strip('"') or None,
                     "created_at": item.get("created_at"),
                 })
-    except Exception as e:
-        print(f"Error listing files in {path}: {e}")
-    return files
+        if len(result) < LIST_PAGE_SIZE:
+            return files
+        offset += len(result)
 
 
-def download_file(client: Client, bucket: str, file_path: str) -> Optional[bytes]:
-    """파일 다운로드"""
-    try:
-        response = client.storage.from_(bucket).download(file_path)
-        return response
-    except Exception as e:
-        print(f"Error downloading {file_path}: {e}")
-        return None
+def content_type_for(file_path: str) -> str:
+    """파일 확장자에 따라 MIME 타입 결정"""
+    if file_path.endswith('.png'):
+        return "image/png"
+    elif file_path.endswith('.jpg') or file_path.endswith('.jpeg'):
+        return "image/jpeg"
+    elif file_path.endswith('.gif'):
+        return "image/gif"
+    elif file_path.endswith('.webp'):
+        return "image/webp"
+    return "image/png"  # 기본값
 
 
-def upload_file(client: Client, bucket: str, file_path: str, file_data: bytes) -> bool:
-    """파일 업로드"""
-    try:
-        # 파일 확장자에 따라 MIME 타입 결정
-        if file_path.endswith('.png'):
-            content_type = "image/png"
-        elif file_path.endswith('.jpg') or file_path.endswith('.jpeg'):
-            content_type = "image/jpeg"
-        elif file_path.endswith('.gif'):
-            content_type = "image/gif"
-        elif file_path.endswith('.webp'):
-            content_type = "image/webp"
-        else:
-            content_type = "image/png"  # 기본값
-        
-        # upsert 옵션 사용하여 기존 파일 덮어쓰기
-        response = client.storage.from_(bucket).upload(
-            file_path, 
-            file_data, 
-            file_options={
-                "content-type": content_type,
-                "upsert": "true"
+def download_file(client: Client, bucket: str, file_path: str) -> bytes:
+    """파일 다운로드 (실패하면 예외)"""
+    return client.storage.from_(bucket).download(file_path)
+
+
+def upload_file(client: Client, bucket: str, file_path: str, file_data: bytes) -> None:
+    """파일 업로드 (실패하면 예외)"""
+    # upsert 옵션 사용하여 기존 파일 덮어쓰기
+    client.storage.from_(bucket).upload(
+        file_path, 
+        file_data, 
+        file_options={
+            "content-type": content_type_for(file_path),
+            "upsert": "true"
+        }
+    )
+
+
+def with_retries(func, *args, retries: int = 3, base_delay: float = 0.5):
+    """func(*args)를 실패 시 지수 백오프(+지터)로 최대 retries번 더 시도"""
+    for attempt in range(retries + 1):
+        try:
+            return func(*args)
+        except Exception:
+            if attempt == retries:
+                raise
+            time.sleep(base_delay * (2 ** attempt) * (0.5 + random.random()))
+
+
+class StorageCopier:
+    """다운로드 단계와 업로드 단계를 크기 제한 큐로 이은 동시 복사기
+
+    다운로드 워커가 받은 파일을 큐에 넣고 업로드 워커가 꺼내 올립니다. 큐가 차면
+    다운로드가 멈추므로 메모리에 올라가는 파일은 최대
+    (다운로드 워커 + 큐 크기 + 업로드 워커)개입니다.
+    클라이언트는 스레드마다 따로 만듭니다.
+    """
+
+    def __init__(self, source_factory, target_factory, download_workers: int = 4,
+                 upload_workers: int = 4, queue_size: int = 8, retries: int = 3,
+                 report_interval: float = 5.0):
+        self.source_factory = source_factory
+        self.target_factory = target_factory
+        self.download_workers = download_workers
+        self.upload_workers = upload_workers
+        self.queue_size = queue_size
+        self.retries = retries
+        self.report_interval = report_interval
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.copied = 0
+        self.copied_bytes = 0
+        self.failed = []  # (경로, 단계, 오류)
+        self.unchanged = 0
+        self.on_copied = None  # 복사 성공 시 콜백 (file_info, data)
+        self.skip_upload = None  # 업로드 전 확인 콜백 (file_info, data), True면 올리지 않음
+
+    def _client(self, name: str, factory):
+        client = getattr(self._local, name, None)
+        if client is None:
+            client = factory()
+            setattr(self._local, name, client)
+        return client
+
+    def _fail(self, file_info: dict, stage: str, error: Exception) -> None:
+        with self._lock:
+            self.failed.append((file_info["path"], stage, str(error)))
+        print(f"  ❌ {stage} 실패: {file_info['path']} ({error})")
+
+    def _download_worker(self, pending: queue.Queue, transfer: queue.Queue) -> None:
+        while True:
+            file_info = pending.get()
+            if file_info is None:
+                return
+            try:
+                data = with_retries(download_file, self._client("source", self.source_factory),
+                                    OLD_BUCKET, file_info["path"], retries=self.retries)
+            except Exception as e:
+                self._fail(file_info, "다운로드", e)
+                continue
+            transfer.put((file_info, data))  # 큐가 차 있으면 업로드가 따라올 때까지 대기
+
+    def _upload_worker(self, transfer: queue.Queue) -> None:
+        while True:
+            item = transfer.get()
+            if item is None:
+                return
+            file_info, data = item
+            try:
+                if self.skip_upload is not None and self.skip_upload(file_info, data):
+                    with self._lock:
+                        self.unchanged += 1
+                    continue
+                with_retries(upload_file, self._client("target", self.target_factory),
+                             NEW_BUCKET, file_info["path"], data, retries=self.retries)
+            except Exception as e:
+                self._fail(file_info, "업로드", e)
+                continue
+            if self.on_copied is not None:
+                # 콜백 예외로 워커가 죽으면 큐가 안 비워져 다운로드 워커가 멈추므로 실패로만 기록
+                try:
+                    self.on_copied(file_info, data)
+                except Exception as e:
+                    self._fail(file_info, "기록", e)
+                    continue
+            with self._lock:
+                self.copied += 1
+                self.copied_bytes += len(data)
+
+    def _report(self, total: int, started: float) -> None:
+        elapsed = max(time.perf_counter() - started, 1e-6)
+        with self._lock:
+            copied, copied_bytes, failed = self.copied, self.copied_bytes, len(self.failed)
+            done = copied + failed + self.unchanged
+        print(f"  📈 {done}/{total} 처리 (실패 {failed}) | "
+              f"{copied / elapsed:.1f}개/초, {copied_bytes / elapsed / 1024 / 1024:.2f}MB/초")
+
+    def run(self, files: List[dict]) -> None:
+        pending = queue.Queue()
+        for file_info in files:
+            pending.put(file_info)
+        for _ in range(self.download_workers):
+            pending.put(None)
+        transfer = queue.Queue(maxsize=self.queue_size)
+
+        started = time.perf_counter()
+        downloaders = [threading.Thread(target=self._download_worker, args=(pending, transfer), daemon=True)
+                       for _ in range(self.download_workers)]
+        uploaders = [threading.Thread(target=self._upload_worker, args=(transfer,), daemon=True)
+                     for _ in range(self.upload_workers)]
+        for thread in downloaders + uploaders:
+            thread.start()
+
+        # 다운로드가 모두 끝나면 업로드 워커에 종료 신호
+        for thread in downloaders:
+            while thread.is_alive():
+                thread.join(self.report_interval)
+                if thread.is_alive():
+                    self._report(len(files), started)
+        for _ in range(self.upload_workers):
+            transfer.put(None)
+        for thread in uploaders:
+            while thread.is_alive():
+                thread.join(self.report_interval)
+                if thread.is_alive():
+                    self._report(len(files), started)
+        self._report(len(files), started)
+
+
+class SyncManifest:
+    """복사를 마친 객체를 기록하는 로컬 매니페스트 (경로 → 원본 크기·eTag·SHA-256)
+
+    복사할 때마다 기록하고 주기적으로 파일에 저장하므로, 중간에 끊긴 실행은 다음 실행에서
+    이미 옮긴 객체를 건너뛰고 이어 갑니다. 저장은 임시 파일에 쓴 뒤 바꿔치기합니다.
+    """
+
+    def __init__(self, path: str, save_every: int = 50):
+        self.path = path
+        self.save_every = save_every
+        self.entries = {}
+        self._dirty = 0
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self.entries = json.load(f).get("objects", {})
+
+    def matches(self, file_info: dict) -> bool:
+        """원본이 마지막으로 옮긴 때와 같은지 (크기와 eTag, 원본에 eTag가 없으면 바뀐 것으로 봄)"""
+        entry = self.entries.get(file_info["path"])
+        return (entry is not None and entry["size"] == file_info["size"]
+                and file_info.get("etag") is not None and entry.get("etag") == file_info["etag"])
+
+    def same_content(self, file_info: dict, data: bytes) -> bool:
+        """받은 내용이 마지막으로 옮긴 내용과 같은지 (기록된 SHA-256과 비교)"""
+        entry = self.entries.get(file_info["path"])
+        return (entry is not None and entry.get("sha256") is not None
+                and entry["sha256"] == hashlib.sha256(data).hexdigest())
+
+    def record(self, file_info: dict, data: Optional[bytes] = None) -> None:
+        with self._lock:
+            self.entries[file_info["path"]] = {
+                "size": file_info["size"],
+                "etag": file_info.get("etag"),
+                "sha256": hashlib.sha256(data).hexdigest() if data is not None else None,
+                "synced_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
             }
-        )
-        return True
-    except Exception as e:
-        print(f"Error uploading {file_path}: {e}")
-        return False
+            self._dirty += 1
+            if self._dirty >= self.save_every:
+                self._save_locked()
+
+    def save(self) -> None:
+        with self._lock:
+            self._save_locked()
+
+    def _save_locked(self) -> None:
+        partial_path = self.path + ".tmp"
+        with open(partial_path, "w", encoding="utf-8") as f:
+            json.dump({"source": OLD_BUCKET, "target": NEW_BUCKET, "objects": self.entries},
+                      f, ensure_ascii=False, indent=1)
+        os.replace(partial_path, self.path)
+        self._dirty = 0
+
+
+def plan_sync(source_files: List[dict], target_files: List[dict], manifest: SyncManifest):
+    """옮겨야 할 객체와 (이미 같아서) 매니페스트에만 기록할 객체를 나눕니다.
+
+    대상에 같은 경로·크기의 객체가 있고, 양쪽 eTag(내용 해시)가 같거나 매니페스트에
+    지금 eTag 그대로 옮긴 기록이 있으면 같은 객체로 봅니다. eTag가 없으면 옮길 목록에
+    넣고, 내려받은 뒤 매니페스트의 SHA-256과 비교해 같으면 업로드만 생략합니다.
+    """
+    targets = {file_info["path"]: file_info for file_info in target_files}
+    to_copy, unchanged = [], []
+    for file_info in source_files:
+        target = targets.get(file_info["path"])
+        if target is not None and target["size"] == file_info["size"]:
+            if manifest.matches(file_info):
+                continue
+            if file_info.get("etag") and file_info.get("etag") == target.get("etag"):
+                unchanged.append(file_info)
+                continue
+        to_copy.append(file_info)
+    return to_copy, unchanged
 
 
-def migrate_storage():
+def sync_storage(args):
+    """두 버킷을 비교해 새로 생기거나 바뀐 객체만 옮깁니다 (중단 후 다시 실행하면 이어서)."""
+    print("=" * 60)
+    print("Supabase Storage 동기화")
+    print("=" * 60)
+    
+    old_client: Client = create_client(OLD_PROJECT_URL, OLD_PROJECT_KEY)
+    new_client: Client = create_client(NEW_PROJECT_URL, NEW_PROJECT_KEY)
+    manifest = SyncManifest(args.manifest)
+    
+    print(f"\n[{OLD_BUCKET}] / [{NEW_BUCKET}] 파일 목록 조회 중...")
+    source_files = get_all_files(old_client, OLD_BUCKET)
+    target_files = get_all_files(new_client, NEW_BUCKET)
+    to_copy, unchanged = plan_sync(source_files, target_files, manifest)
+    skipped = len(source_files) - len(to_copy)
+    print(f"원본 {len(source_files)}개 / 대상 {len(target_files)}개 / 매니페스트 {len(manifest.entries)}개")
+    print(f"옮길 파일 {len(to_copy)}개 ({sum(f['size'] or 0 for f in to_copy) / 1024 / 1024:.1f}MB), "
+          f"같은 파일 {skipped}개")
+    
+    for file_info in unchanged:
+        manifest.record(file_info)
+    if args.dry_run:
+        for file_info in to_copy:
+            print(f"  - {file_info['path']} ({file_info['size']} bytes)")
+        manifest.save()
+        return
+    
+    copier = StorageCopier(
+        lambda: create_client(OLD_PROJECT_URL, OLD_PROJECT_KEY),
+        lambda: create_client(NEW_PROJECT_URL, NEW_PROJECT_KEY),
+        download_workers=args.download_workers, upload_workers=args.upload_workers,
+        queue_size=args.queue_size, retries=args.retries)
+    copier.on_copied = manifest.record
+    # eTag로 비교하지 못한 파일: 대상에 같은 크기로 있고 내용 해시가 기록과 같으면 올리지 않음
+    target_sizes = {file_info["path"]: file_info["size"] for file_info in target_files}
+    copier.skip_upload = lambda file_info, data: (
+        target_sizes.get(file_info["path"]) == len(data) and manifest.same_content(file_info, data))
+    try:
+        copier.run(to_copy)
+    finally:
+        manifest.save()
+    
+    print("\n" + "=" * 60)
+    print("동기화 완료")
+    print("=" * 60)
+    print(f"복사: {copier.copied}개 ({copier.copied_bytes / 1024 / 1024:.1f}MB)")
+    print(f"건너뜀: {skipped + copier.unchanged}개 (내려받아 내용 해시로 확인 {copier.unchanged}개)")
+    print(f"실패: {len(copier.failed)}개 (다시 실행하면 실패한 파일만 재시도)")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Supabase Storage 파일 마이그레이션")
+    parser.add_argument("--download-workers", type=int, default=4)
+    parser.add_argument("--upload-workers", type=int, default=4)
+    parser.add_argument("--queue-size", type=int, default=8, help="다운로드 후 업로드를 기다리는 최대 파일 수")
+    parser.add_argument("--retries", type=int, default=3, help="실패 시 재시도 횟수")
+    parser.add_argument("--sync", action="store_true", help="새로 생기거나 바뀐 파일만 옮김 (매니페스트로 이어하기)")
+    parser.add_argument("--manifest", default="storage_sync_manifest.json", help="동기화 매니페스트 경로")
+    parser.add_argument("--dry-run", action="store_true", help="--sync에서 옮길 파일 목록만 출력")
+    return parser.parse_args()
+
+
+def migrate_storage(args):
     """Storage 파일 마이그레이션 실행"""
     print("=" * 60)
     print("Supabase Storage 파일 마이그레이션 시작")
     print("=" * 60)
     
-    # 클라이언트 생성
+    # 클라이언트 생성 (목록 조회용, 복사는 스레드별 클라이언트 사용)
     old_client: Client = create_client(OLD_PROJECT_URL, OLD_PROJECT_KEY)
-    new_client: Client = create_client(NEW_PROJECT_URL, NEW_PROJECT_KEY)
     
     # 기존 버킷의 모든 파일 목록 가져오기
     print(f"\n[{OLD_BUCKET}] 버킷에서 파일 목록 조회 중...")
@@ -109,42 +391,36 @@ def migrate_storage():
         return
     
     print(f"총 {len(files)}개의 파일을 발견했습니다.")
+    print(f"다운로드 {args.download_workers}개 / 업로드 {args.upload_workers}개 워커, 대기 큐 {args.queue_size}개")
     
     # 파일 마이그레이션
-    success_count = 0
-    fail_count = 0
-    
-    for i, file_info in enumerate(files, 1):
-        file_path = file_info["path"]
-        print(f"\n[{i}/{len(files)}] {file_path} 마이그레이션 중...")
-        
-        # 파일 다운로드
-        file_data = download_file(old_client, OLD_BUCKET, file_path)
-        if file_data is None:
-            print(f"  ❌ 다운로드 실패")
-            fail_count += 1
-            continue
-        
-        # 파일 업로드
-        if upload_file(new_client, NEW_BUCKET, file_path, file_data):
-            print(f"  ✅ 업로드 완료 ({file_info['size']} bytes)")
-            success_count += 1
-        else:
-            print(f"  ❌ 업로드 실패")
-            fail_count += 1
+    copier = StorageCopier(
+        lambda: create_client(OLD_PROJECT_URL, OLD_PROJECT_KEY),
+        lambda: create_client(NEW_PROJECT_URL, NEW_PROJECT_KEY),
+        download_workers=args.download_workers, upload_workers=args.upload_workers,
+        queue_size=args.queue_size, retries=args.retries)
+    started = time.perf_counter()
+    copier.run(files)
+    elapsed = time.perf_counter() - started
     
     # 결과 출력
     print("\n" + "=" * 60)
     print("마이그레이션 완료")
     print("=" * 60)
-    print(f"성공: {success_count}개")
-    print(f"실패: {fail_count}개")
+    print(f"성공: {copier.copied}개 ({copier.copied_bytes / 1024 / 1024:.1f}MB, {elapsed:.1f}초)")
+    print(f"실패: {len(copier.failed)}개")
+    for path, stage, error in copier.failed:
+        print(f"  - {path} ({stage}): {error}")
     print(f"전체: {len(files)}개")
 
 
 if __name__ == "__main__":
     try:
-        migrate_storage()
+        args = parse_args()
+        if args.sync:
+            sync_storage(args)
+        else:
+            migrate_storage(args)
     except KeyboardInterrupt:
         print("\n\n마이그레이션이 중단되었습니다.")
     except Exception as e:
@@ -5,8 +5,7 @@ MCP를 사용하여 직접 SQL 실행
 """
 
 from supabase import create_client, Client
-from typing import List, Dict, Any
-import json
+from migration_utils import iter_table_rows, batched, generate_insert_sql
 
 # 원래 프로젝트 정보 (namecard-web)
 OLD_PROJECT_URL = "https://ekmuddykdzebbxmgigif.supabase.co"
@@ -20,60 +19,6 @@ TABLES_ORDER = [
 ]
 
 
-def get_table_data(client: Client, table: str) -> List[Dict[str, Any]]:
-    """테이블의 모든 데이터 조회"""
-    try:
-        response = client.table(table).select('*').execute()
-        return response.data if response.data else []
-    except Exception as e:
-        print(f"Error fetching {table}: {e}")
-        return []
-
-
-def format_value(value):
-    """SQL 값 포맷팅"""
-    if value is None:
-        return 'NULL'
-    elif isinstance(value, str):
-        # SQL 인젝션 방지
-        escaped = value.replace("'", "''")
-        return f"'{escaped}'"
-    elif isinstance(value, bool):
-        return 'TRUE' if value else 'FALSE'
-    elif isinstance(value, (int, float)):
-        return str(value)
-    elif isinstance(value, dict):
-        # JSON 객체
-        return f"'{json.dumps(value).replace("'", "''")}'"
-    else:
-        # UUID, 날짜 등은 문자열로 처리
-        escaped = str(value).replace("'", "''")
-        return f"'{escaped}'"
-
-
-def generate_insert_sql(table: str, data: List[Dict[str, Any]], schema: str = 'nametag') -> str:
-    """데이터를 SQL INSERT 문으로 변환"""
-    if not data:
-        return ""
-    
-    # 컬럼 목록 추출
-    columns = list(data[0].keys())
-    columns_str = ', '.join(columns)
-    
-    # VALUES 생성
-    values_list = []
-    for row in data:
-        values = [format_value(row.get(col)) for col in columns]
-        values_list.append(f"({', '.join(values)})")
-    
-    # SQL 문 생성
-    sql = f"INSERT INTO {schema}.{table} ({columns_str})\nVALUES\n"
-    sql += ",\n".join(values_list)
-    sql += "\nON CONFLICT (id) DO NOTHING;"
-    
-    return sql
-
-
 def main():
     """메인 함수 - SQL 생성만 수행"""
     print("=" * 60)
@@ -87,29 +32,26 @@ def main():
     for table in TABLES_ORDER:
         print(f"\n[{table}] 테이블 처리 중...")
         
-        # 원래 프로젝트에서 데이터 조회
-        data = get_table_data(old_client, table)
-        
-        if not data:
-            print(f"  ⚠️  마이그레이션할 데이터가 없습니다.")
-            continue
-        
-        print(f"  📊 {len(data)}개의 레코드 발견")
-        
-        # 배치로 나누어 SQL 생성
+        # 원래 프로젝트에서 페이지 단위로 읽으면서 배치로 나누어 SQL 생성
         batch_size = 100
-        for i in range(0, len(data), batch_size):
-            batch = data[i:i + batch_size]
+        total = 0
+        for batch_number, batch in enumerate(batched(iter_table_rows(old_client, table), batch_size), 1):
             sql = generate_insert_sql(table, batch)
+            total += len(batch)
             
             # SQL 파일로 저장
-            filename = f"migrate_{table}_batch_{i//batch_size + 1}.sql"
+            filename = f"migrate_{table}_batch_{batch_number}.sql"
             with open(filename, 'w', encoding='utf-8') as f:
-                f.write(f"-- {table} 테이블 배치 {i//batch_size + 1} 마이그레이션 SQL\n")
+                f.write(f"-- {table} 테이블 배치 {batch_number} 마이그레이션 SQL\n")
                 f.write(f"-- 총 {len(batch)}개 레코드\n\n")
                 f.write(sql)
             
             print(f"  💾 SQL 파일 저장: {filename} ({len(batch)}개 레코드)")
+        
+        if total:
+            print(f"  📊 {total}개의 레코드 처리")
+        else:
+            print(f"  ⚠️  마이그레이션할 데이터가 없습니다.")
     
     print("\n" + "=" * 60)
     print("SQL 파일 생성 완료")
@@ -0,0 +1,675 @@
+#!/usr/bin/env python3
+"""
+마이그레이션 스크립트 공통 유틸리티
+
+- iter_table_rows: 테이블을 키셋 페이지네이션으로 끝까지 읽는 제너레이터
+  (select('*') 한 번으로 읽으면 API 최대 행 수에서 조용히 잘리고 전부 메모리에 올라감)
+- batched: 제너레이터를 일정 크기 리스트로 끊어 주는 헬퍼
+- byte_budget_batches / insert_with_bisect / RejectFile: 행 수 대신 인코딩 크기로 배치를
+  나누고, 배치가 데이터 오류로 실패하면 반씩 나눠 다시 보내 문제 행만 골라 거부 파일에 기록
+- TableEncoder / generate_insert_sql: 테이블마다 한 번 컬럼 타입을 정해 컬럼별 SQL 리터럴
+  인코더를 만들어 두고, 캐스트까지 붙여 INSERT 문을 생성 (추정과 다른 형식의 값은 값별 인코더로)
+- write_copy_table: 같은 인코더로 COPY 텍스트 형식을 써서 임시 스테이징 테이블에 적재한 뒤
+  INSERT ... SELECT ... ON CONFLICT 한 번으로 옮기는 SQL 스크립트 (psql -f 로 실행)
+- topological_order / run_dag: 외래 키 의존 그래프 순서 정렬과, 의존이 끝난 테이블부터
+  동시에 처리하는 실행기 (전체 동시 실행 수 제한)
+- SqlFileWriter: 생성한 SQL을 모아 두지 않고 바로 파일에 쓰는 writer
+  (바이트 크기로 파일 나누기, 선택적으로 gzip 압축)
+
+벤치마크: python migration_utils.py bench
+"""
+
+import io
+import os
+import re
+import gzip
+import json
+import math
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+# 한 번에 가져올 행 수 (PostgREST 기본 최대 행 수 1000 이하로)
+DEFAULT_PAGE_SIZE = 1000
+
+
+def table_query(client, table: str, schema: str = 'public'):
+    """스키마를 지정한 테이블 쿼리 빌더"""
+    if schema == 'public':
+        return client.table(table)
+    return client.schema(schema).table(table)
+
+
+def _quote(value) -> str:
+    # or 필터 안의 값은 콜론·더하기 기호가 들어가는 타임스탬프가 있으므로 큰따옴표로 감쌈
+    return '"' + str(value).replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
+def iter_table_rows(client, table: str, page_size: int = DEFAULT_PAGE_SIZE,
+                    order_by: str = 'id', schema: str = 'public',
+                    columns: str = '*',
+                    start_after: Optional[Dict[str, Any]] = None,
+                    where: Optional[Callable[[Any], Any]] = None) -> Iterator[Dict[str, Any]]:
+    """테이블의 모든 행을 order_by 순서로 page_size씩 읽어 한 행씩 내보냅니다.
+
+    order_by='id'면 기본 키 기준 (id > 마지막 id), 'created_at'처럼 유일하지 않은
+    컬럼이면 (order_by, id) 기준으로 이어 읽습니다. 이때 order_by가 NULL인 행은 키셋으로
+    이어 읽을 수 없으므로 빼고 읽습니다 (필요하면 where로 따로 읽을 것).
+    오프셋을 쓰지 않으므로 페이지가 뒤로 갈수록 느려지지 않고, 읽는 도중 행이 추가돼도
+    건너뛰거나 중복되지 않습니다.
+    서버 최대 행 수가 page_size보다 작아도 잘리지 않도록 빈 페이지가 나올 때까지 읽습니다.
+    조회 오류는 그대로 올려 보냅니다 (일부만 옮기고 성공처럼 보이지 않도록).
+    start_after({order_by: 값, 'id': 값})를 주면 그 위치 다음 행부터 읽습니다 (증분 동기화).
+    where는 쿼리에 조건을 더하는 함수입니다 (예: lambda q: q.gte('id', a).lt('id', b)).
+    """
+    last: Optional[Dict[str, Any]] = start_after
+    while True:
+        query = table_query(client, table, schema).select(columns).order(order_by)
+        if where is not None:
+            query = where(query)
+        if order_by != 'id':
+            query = query.not_.is_(order_by, 'null').order('id')
+        if last is not None:
+            if order_by == 'id':
+                query = query.gt('id', last['id'])
+            else:
+                value = _quote(last[order_by])
+                query = query.or_(
+                    f"{order_by}.gt.{value},"
+                    f"and({order_by}.eq.{value},id.gt.{_quote(last['id'])})")
+        rows = query.limit(page_size).execute().data or []
+        if not rows:
+            return
+        yield from rows
+        last = rows[-1]
+
+
+def rpc_missing(error: Exception) -> bool:
+    """RPC 함수가 없어서 난 오류인지 (PostgREST PGRST202)"""
+    message = str(error)
+    return 'PGRST202' in message or 'Could not find the function' in message
+
+
+def count_rows(client, table: str, schema: str = 'public') -> int:
+    """행 수만 조회 (count=exact, 행은 한 개만 받음)"""
+    return table_query(client, table, schema).select('id', count='exact').limit(1).execute().count or 0
+
+
+def upsert_rows(client, table: str, rows: List[Dict[str, Any]], schema: str = 'nametag') -> None:
+    """id 기준 업서트 (이미 있는 행은 새 값으로 덮어씀)"""
+    table_query(client, table, schema).upsert(rows, on_conflict='id').execute()
+
+
+def batched(rows: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """rows를 size개씩 리스트로 끊어 내보냅니다 (마지막 묶음은 더 작을 수 있음)."""
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+# 배치 하나의 최대 요청 크기 (JSON 인코딩 기준)
+DEFAULT_BATCH_BYTES = 1024 * 1024
+DEFAULT_BATCH_ROWS = 500
+
+
+def encoded_size(row: Dict[str, Any]) -> int:
+    """행을 요청 본문(JSON)으로 보냈을 때의 바이트 수"""
+    return len(json.dumps(row, ensure_ascii=False, separators=(',', ':'), default=str).encode('utf-8'))
+
+
+def byte_budget_batches(rows: Iterable[Dict[str, Any]], max_bytes: int = DEFAULT_BATCH_BYTES,
+                        max_rows: int = DEFAULT_BATCH_ROWS) -> Iterator[List[Dict[str, Any]]]:
+    """인코딩 크기 합이 max_bytes(행 수는 max_rows)를 넘지 않도록 묶습니다.
+
+    한 행만으로 max_bytes를 넘으면 그 행 혼자 한 배치가 됩니다.
+    """
+    batch, batch_bytes = [], 0
+    for row in rows:
+        size = encoded_size(row)
+        if batch and (batch_bytes + size > max_bytes or len(batch) >= max_rows):
+            yield batch
+            batch, batch_bytes = [], 0
+        batch.append(row)
+        batch_bytes += size
+    if batch:
+        yield batch
+
+
+class RejectFile:
+    """삽입에 실패한 행을 JSON Lines로 남기는 파일 (여러 스레드에서 써도 됨)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def reject(self, table: str, row: Dict[str, Any], error: Exception) -> None:
+        line = json.dumps({'table': table, 'id': row.get('id'), 'error': str(error), 'row': row},
+                          ensure_ascii=False, default=str)
+        with self._lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line + '\n')
+            self.count += 1
+
+
+_SQLSTATE_PATTERN = re.compile(r"""['"]code['"]\s*:\s*['"]([0-9A-Z]{5})['"]""")
+
+
+def is_data_error(error: Exception) -> bool:
+    """행 내용 때문에 난 오류인지 (SQLSTATE 22xxx 데이터 예외, 23xxx 제약 조건 위반)
+
+    인증·권한·네트워크·시간 초과처럼 어떤 행을 보내도 똑같이 실패하는 오류는 False.
+    """
+    code = getattr(error, 'code', None)
+    if not code:
+        match = _SQLSTATE_PATTERN.search(str(error))
+        code = match.group(1) if match else None
+    return bool(code) and str(code)[:2] in ('22', '23')
+
+
+def insert_with_bisect(insert: Callable[[List[Dict[str, Any]]], Any], rows: List[Dict[str, Any]],
+                       on_reject: Callable[[Dict[str, Any], Exception], None],
+                       retries: int = 2, backoff: float = 1.0) -> int:
+    """insert(rows)가 데이터 오류로 실패하면 반으로 나눠 다시 보내 실패한 행만 on_reject로 넘깁니다.
+
+    문제 행이 k개면 요청 수는 약 2k·log2(n)로, 행마다 한 번씩 보내는 것보다 훨씬 적습니다.
+    insert는 배치 단위로 원자적이어야 합니다 (실패한 배치는 아무것도 반영되지 않아야 함).
+    데이터 오류(is_data_error)가 아니면 나누지 않고 retries번 다시 시도한 뒤 예외를 그대로
+    올립니다 (키·권한 오류 등으로 모든 행이 거부 파일로 가고 성공처럼 끝나지 않도록).
+    성공한 행 수를 돌려줍니다.
+    """
+    for attempt in range(retries + 1):
+        try:
+            insert(rows)
+            return len(rows)
+        except Exception as e:
+            if is_data_error(e):
+                error = e
+                break
+            if attempt == retries:
+                raise
+            time.sleep(backoff * 2 ** attempt)
+    if len(rows) == 1:
+        on_reject(rows[0], error)
+        return 0
+    middle = len(rows) // 2
+    return (insert_with_bisect(insert, rows[:middle], on_reject, retries, backoff)
+            + insert_with_bisect(insert, rows[middle:], on_reject, retries, backoff))
+
+
+# ---------------------------------------------------------------------------
+# 의존 그래프 (외래 키)
+# ---------------------------------------------------------------------------
+
+def topological_order(dependencies: Dict[str, List[str]]) -> List[str]:
+    """의존 대상이 항상 먼저 오는 순서 (같은 단계에서는 선언 순서 유지). 순환이면 ValueError."""
+    order: List[str] = []
+    done = set()
+    remaining = list(dependencies)
+    while remaining:
+        ready = [name for name in remaining if all(dep in done for dep in dependencies[name])]
+        if not ready:
+            raise ValueError(f"순환 의존: {', '.join(remaining)}")
+        order.extend(ready)
+        done.update(ready)
+        remaining = [name for name in remaining if name not in done]
+    return order
+
+
+def run_dag(dependencies: Dict[str, List[str]], task: Callable[[str], Any],
+            max_workers: int = 3) -> Dict[str, str]:
+    """의존 대상이 모두 성공한 항목부터 최대 max_workers개씩 동시에 task(name)를 실행합니다.
+
+    실패한 항목에 (직간접으로) 의존하는 항목은 실행하지 않습니다.
+    항목별 결과('done' / 'failed' / 'skipped')를 돌려줍니다.
+    """
+    unknown = {dep for deps in dependencies.values() for dep in deps} - set(dependencies)
+    if unknown:
+        raise ValueError(f"정의되지 않은 의존 대상: {', '.join(sorted(unknown))}")
+    order = topological_order(dependencies)
+    status: Dict[str, str] = {}
+    running = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while len(status) < len(order):
+            for name in order:
+                if name in status or name in running.values():
+                    continue
+                deps = [status.get(dep) for dep in dependencies[name]]
+                if any(state in ('failed', 'skipped') for state in deps):
+                    status[name] = 'skipped'
+                elif all(state == 'done' for state in deps):
+                    running[executor.submit(task, name)] = name
+            if not running:
+                continue
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name = running.pop(future)
+                status[name] = 'failed' if future.exception() is not None else 'done'
+    return status
+
+
+# ---------------------------------------------------------------------------
+# SQL 리터럴 인코더
+# ---------------------------------------------------------------------------
+
+# 값이 문자열로 와도 JSON으로 넣어야 하는 컬럼
+JSON_COLUMNS = frozenset([
+    'canvas_json', 'snapshot_data', 'template_settings', 'print_areas',
+    'company_layout', 'name_layout', 'title_layout', 'full_state',
+])
+
+UUID_PATTERN = re.compile(r'^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$')
+TIMESTAMP_PATTERN = re.compile(r'^\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(\.\d+)?(Z|[+-]\d{2}(:?\d{2})?)?$')
+
+
+def quote_literal(text: str) -> str:
+    # standard_conforming_strings=on 기준: 작은따옴표만 두 번 씀 (역슬래시는 그대로)
+    return "'" + text.replace("'", "''") + "'"
+
+
+def _encode_text(value) -> str:
+    return 'NULL' if value is None else quote_literal(value if isinstance(value, str) else str(value))
+
+
+def _encode_jsonb(value) -> str:
+    if value is None:
+        return 'NULL'
+    if not isinstance(value, str):
+        value = json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+    return quote_literal(value) + '::jsonb'
+
+
+# 타입별 인코더는 컬럼 타입을 표본으로 추정한 것이므로 값이 그 타입 형식이 아니면
+# _encode_any로 넘깁니다. INSERT ... VALUES는 값마다 대상 컬럼 타입으로 변환하므로
+# 같은 문장 안에서 캐스트가 붙은 값과 안 붙은 값이 섞여도 됩니다.
+
+def _encode_timestamptz(value) -> str:
+    # ISO 8601(…T…+00:00)은 PostgreSQL이 그대로 받으므로 형식 변환 없이 캐스트만 붙임
+    if isinstance(value, str) and TIMESTAMP_PATTERN.match(value):
+        return quote_literal(value) + '::timestamptz'
+    return _encode_any(value)
+
+
+def _encode_bool(value) -> str:
+    if isinstance(value, bool):
+        return 'TRUE' if value else 'FALSE'
+    return _encode_any(value)
+
+
+def _encode_numeric(value) -> str:
+    if isinstance(value, int) and not isinstance(value, bool):
+        return str(value)
+    if isinstance(value, float):
+        # nan·inf는 str()로 쓰면 컬럼 이름처럼 해석되므로 PostgreSQL 특수 값 리터럴로
+        if math.isnan(value):
+            return "'NaN'"
+        if math.isinf(value):
+            return "'Infinity'" if value > 0 else "'-Infinity'"
+        return repr(value)
+    return _encode_any(value)
+
+
+def _encode_uuid(value) -> str:
+    if isinstance(value, str) and UUID_PATTERN.match(value):
+        return quote_literal(value) + '::uuid'
+    return _encode_any(value)
+
+
+def _encode_any(value) -> str:
+    """타입을 정하지 못한 컬럼(표본이 모두 NULL)이나 추정한 타입과 다른 값용 값별 인코더"""
+    if value is None:
+        return 'NULL'
+    if isinstance(value, (bool, int, float)):
+        return _encode_bool(value) if isinstance(value, bool) else _encode_numeric(value)
+    if isinstance(value, (dict, list)):
+        return _encode_jsonb(value)
+    return _encode_text(value)
+
+
+COPY_NULL = '\\N'
+
+
+def copy_escape(text: str) -> str:
+    """COPY 텍스트 형식 이스케이프 (특수 문자가 없으면 그대로 돌려줌)"""
+    if '\\' in text or '\t' in text or '\n' in text or '\r' in text:
+        return (text.replace('\\', '\\\\').replace('\t', '\\t')
+                .replace('\n', '\\n').replace('\r', '\\r'))
+    return text
+
+
+def _copy_text(value) -> str:
+    return COPY_NULL if value is None else copy_escape(value if isinstance(value, str) else str(value))
+
+
+def _copy_jsonb(value) -> str:
+    if value is None:
+        return COPY_NULL
+    if not isinstance(value, str):
+        value = json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+    return copy_escape(value)
+
+
+def _copy_plain(value) -> str:
+    # uuid·타임스탬프·숫자는 이스케이프할 문자가 없음 (추정과 다른 문자열 값만 이스케이프)
+    if value is None:
+        return COPY_NULL
+    return copy_escape(value) if isinstance(value, str) else str(value)
+
+
+def _copy_bool(value) -> str:
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    return _copy_any(value)
+
+
+def _copy_any(value) -> str:
+    if value is None:
+        return COPY_NULL
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    if isinstance(value, (int, float)):
+        return str(value)
+    if isinstance(value, (dict, list)):
+        return _copy_jsonb(value)
+    return _copy_text(value)
+
+
+SQL_ENCODERS: Dict[str, Callable[[Any], str]] = {
+    'text': _encode_text,
+    'jsonb': _encode_jsonb,
+    'timestamptz': _encode_timestamptz,
+    'bool': _encode_bool,
+    'numeric': _encode_numeric,
+    'uuid': _encode_uuid,
+    None: _encode_any,
+}
+
+COPY_ENCODERS: Dict[str, Callable[[Any], str]] = {
+    'text': _copy_text,
+    'jsonb': _copy_jsonb,
+    'timestamptz': _copy_plain,
+    'bool': _copy_bool,
+    'numeric': _copy_plain,
+    'uuid': _copy_plain,
+    None: _copy_any,
+}
+
+
+def infer_column_type(column: str, values: Iterable[Any]) -> Optional[str]:
+    """표본 값으로 컬럼 타입을 정합니다 (모두 NULL이면 None).
+
+    추정이므로 이후 값이 다른 형식이어도 인코더가 값마다 확인하고 _encode_any로 넘깁니다.
+    """
+    values = [value for value in values if value is not None]
+    if column in JSON_COLUMNS:
+        return 'jsonb'
+    if not values:
+        return None
+    first = values[0]
+    if isinstance(first, bool):
+        return 'bool'
+    if isinstance(first, (int, float)):
+        return 'numeric'
+    if isinstance(first, (dict, list)):
+        return 'jsonb'
+    if all(isinstance(value, str) and UUID_PATTERN.match(value) for value in values):
+        return 'uuid'
+    if all(isinstance(value, str) and TIMESTAMP_PATTERN.match(value) for value in values):
+        return 'timestamptz'
+    return 'text'
+
+
+class TableEncoder:
+    """테이블 한 개의 컬럼별 SQL 리터럴 인코더 (컬럼 타입은 만들 때 한 번만 정함)"""
+
+    def __init__(self, table: str, column_types: Dict[str, Optional[str]], schema: str = 'nametag'):
+        self.table = table
+        self.schema = schema
+        self.column_types = dict(column_types)
+        self.columns = list(column_types)
+        self._encoders = [(column, SQL_ENCODERS[column_type])
+                          for column, column_type in column_types.items()]
+        self._copy_encoders = [(column, COPY_ENCODERS[column_type])
+                               for column, column_type in column_types.items()]
+
+    @classmethod
+    def from_rows(cls, table: str, rows: List[Dict[str, Any]], schema: str = 'nametag') -> 'TableEncoder':
+        columns = list(rows[0].keys())
+        return cls(table, {column: infer_column_type(column, (row.get(column) for row in rows))
+                           for column in columns}, schema)
+
+    def encode_row(self, row: Dict[str, Any]) -> str:
+        return '(' + ', '.join([encode(row.get(column)) for column, encode in self._encoders]) + ')'
+
+    def insert_sql(self, rows: List[Dict[str, Any]]) -> str:
+        return ''.join(self.iter_insert_sql(rows))
+
+    def iter_insert_sql(self, rows: Iterable[Dict[str, Any]]) -> Iterator[str]:
+        """INSERT 문을 조각 단위로 내보냅니다 (writelines로 큰 문자열 없이 쓰기 위함)."""
+        yield f"INSERT INTO {self.schema}.{self.table} ({', '.join(self.columns)})\nVALUES\n"
+        separator = ""
+        for row in rows:
+            yield separator + self.encode_row(row)
+            separator = ",\n"
+        yield "\nON CONFLICT (id) DO NOTHING;"
+
+    def copy_row(self, row: Dict[str, Any]) -> str:
+        """COPY 텍스트 형식 한 줄 (탭 구분, 줄바꿈 포함)"""
+        return '\t'.join([encode(row.get(column)) for column, encode in self._copy_encoders]) + '\n'
+
+    @property
+    def staging_table(self) -> str:
+        return f"_stage_{self.table}"
+
+    def copy_prologue(self) -> str:
+        columns = ', '.join(self.columns)
+        return (f"BEGIN;\n"
+                f"CREATE TEMP TABLE {self.staging_table} (LIKE {self.schema}.{self.table} INCLUDING DEFAULTS) ON COMMIT DROP;\n"
+                f"COPY {self.staging_table} ({columns}) FROM STDIN WITH (FORMAT text);\n")
+
+    def copy_epilogue(self) -> str:
+        columns = ', '.join(self.columns)
+        return (f"\\.\n"
+                f"INSERT INTO {self.schema}.{self.table} ({columns})\n"
+                f"SELECT {columns} FROM {self.staging_table}\n"
+                f"ON CONFLICT (id) DO NOTHING;\n"
+                f"COMMIT;\n")
+
+
+_table_encoders: Dict[tuple, TableEncoder] = {}
+
+
+def table_encoder(table: str, rows: List[Dict[str, Any]], schema: str = 'nametag') -> TableEncoder:
+    """(스키마, 테이블, 컬럼 목록)마다 처음 본 배치로 한 번만 만든 인코더"""
+    key = (schema, table, tuple(rows[0].keys()))
+    encoder = _table_encoders.get(key)
+    if encoder is None:
+        encoder = _table_encoders[key] = TableEncoder.from_rows(table, rows, schema)
+    return encoder
+
+
+def generate_insert_sql(table: str, data: List[Dict[str, Any]], schema: str = 'nametag') -> str:
+    """데이터를 SQL INSERT 문으로 변환"""
+    if not data:
+        return ""
+    return table_encoder(table, data, schema).insert_sql(data)
+
+
+def write_copy_table(f, table: str, rows: Iterable[Dict[str, Any]], schema: str = 'nametag',
+                     chunk_size: int = DEFAULT_PAGE_SIZE) -> int:
+    """rows를 스테이징 COPY + INSERT ... SELECT 블록으로 f에 바로 씁니다. 쓴 행 수를 돌려줍니다.
+
+    행은 chunk_size개씩만 메모리에 두며, 인코더는 첫 묶음으로 정합니다.
+    """
+    encoder = None
+    count = 0
+    for chunk in batched(rows, chunk_size):
+        if encoder is None:
+            encoder = table_encoder(table, chunk, schema)
+            f.write(encoder.copy_prologue())
+        f.write(''.join([encoder.copy_row(row) for row in chunk]))
+        count += len(chunk)
+    if encoder is not None:
+        f.write(encoder.copy_epilogue())
+    return count
+
+
+class SqlFileWriter:
+    """SQL을 생성되는 대로 파일에 쓰는 writer
+
+    max_bytes를 주면 문장이 끝난 뒤(end_statement) 현재 파일이 그 크기를 넘었을 때
+    다음 문장부터 새 파일(<이름>_001.sql, <이름>_002.sql …)에 씁니다. 문장 중간에서는
+    나누지 않습니다. compress=True면 .gz로 바로 압축해 씁니다.
+    """
+
+    def __init__(self, path: str, max_bytes: Optional[int] = None, compress: bool = False,
+                 header: str = '', buffer_size: int = 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.compress = compress
+        self.header = header
+        self.buffer_size = buffer_size
+        self.paths: List[str] = []
+        self.bytes_written = 0  # 전체 (압축 전) 바이트
+        self._file = None
+        self._file_bytes = 0
+
+    def _next_path(self) -> str:
+        path = self.path
+        if self.max_bytes:
+            stem, ext = os.path.splitext(self.path)
+            path = f"{stem}_{len(self.paths) + 1:03d}{ext}"
+        return path + '.gz' if self.compress else path
+
+    def _open(self):
+        path = self._next_path()
+        if self.compress:
+            self._file = gzip.open(path, 'wt', encoding='utf-8')
+        else:
+            self._file = open(path, 'w', encoding='utf-8', buffering=self.buffer_size)
+        self.paths.append(path)
+        self._file_bytes = 0
+        if self.header:
+            self.write(self.header)
+
+    def write(self, text: str) -> None:
+        if self._file is None:
+            self._open()
+        self._file.write(text)
+        size = len(text.encode('utf-8')) if not text.isascii() else len(text)
+        self._file_bytes += size
+        self.bytes_written += size
+
+    def writelines(self, pieces: Iterable[str]) -> None:
+        for piece in pieces:
+            self.write(piece)
+
+    def end_statement(self) -> None:
+        """문장 경계 표시 (크기를 넘었으면 다음 문장은 새 파일에)"""
+        if self.max_bytes and self._file is not None and self._file_bytes >= self.max_bytes:
+            self._file.close()
+            self._file = None
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def write_insert_batches(writer, table: str, rows: Iterable[Dict[str, Any]], batch_size: int,
+                         schema: str = 'nametag') -> int:
+    """rows를 batch_size개씩 INSERT 문으로 writer에 바로 씁니다. 쓴 행 수를 돌려줍니다."""
+    count = 0
+    for batch_number, batch in enumerate(batched(rows, batch_size), 1):
+        writer.write(f"-- {table} 테이블 배치 {batch_number} ({len(batch)}개 레코드)\n")
+        writer.writelines(table_encoder(table, batch, schema).iter_insert_sql(batch))
+        writer.write("\n\n")
+        writer.end_statement()
+        count += len(batch)
+    return count
+
+
+# ---------------------------------------------------------------------------
+# 벤치마크
+# ---------------------------------------------------------------------------
+
+def _sample_rows(count: int) -> List[Dict[str, Any]]:
+    """text_object_snapshots 모양의 합성 행"""
+    layout = {'left': 120.5, 'top': 300, 'fontSize': 48, 'fontFamily': "Noto Sans KR", 'fill': '#000000'}
+    return [{
+        'id': f'{n:08x}-0000-4000-8000-{n:012x}',
+        'namecard_id': f'{n // 10:08x}-1111-4000-8000-{n:012x}',
+        'name': f"참가자 {n}", 'company': "유스튜디오 O'Neil", 'title': '팀장',
+        'is_active': n % 2 == 0, 'version': n,
+        'company_layout': layout, 'name_layout': layout, 'title_layout': layout,
+        'full_state': {'objects': [layout] * 5, 'background': None},
+        'created_at': '2025-09-13T20:40:16.949205+00:00',
+        'updated_at': '2025-09-14T08:01:02.000001+00:00',
+    } for n in range(count)]
+
+
+def _legacy_insert_sql(table: str, data: List[Dict[str, Any]]) -> str:
+    # 이전 방식: 행마다 JSON 컬럼 목록을 만들고 값마다 isinstance 분기, 생성 후 정규식으로 날짜 수정
+    columns = list(data[0].keys())
+    values_list = []
+    for row in data:
+        values = []
+        for col in columns:
+            value = row.get(col)
+            if value is None:
+                values.append('NULL')
+            elif isinstance(value, bool):
+                values.append('TRUE' if value else 'FALSE')
+            elif isinstance(value, (int, float)):
+                values.append(str(value))
+            elif isinstance(value, (dict, list)):
+                values.append("'" + json.dumps(value, ensure_ascii=False).replace("'", "''") + "'")
+            else:
+                values.append("'" + str(value).replace("'", "''") + "'")
+        values_list.append(f"({', '.join(values)})")
+    sql = f"INSERT INTO nametag.{table} ({', '.join(columns)})\nVALUES\n" + ",\n".join(values_list)
+    sql += "\nON CONFLICT (id) DO NOTHING;"
+    for _ in range(2):
+        sql = re.sub(r"(\d{4}-\d{2}-\d{2})T(\d{2}:\d{2}:\d{2}\.\d+)\+00:00", r"\1 \2+00", sql)
+    return sql
+
+
+def benchmark_encoder(rows: int = 20000, batch_size: int = 100) -> None:
+    data = _sample_rows(rows)
+    batches = [data[i:i + batch_size] for i in range(0, len(data), batch_size)]
+    for label, encode in (("이전 방식", lambda batch: _legacy_insert_sql('text_object_snapshots', batch)),
+                          ("컬럼별 인코더", lambda batch: generate_insert_sql('text_object_snapshots', batch))):
+        started = time.perf_counter()
+        size = sum(len(encode(batch)) for batch in batches)
+        elapsed = time.perf_counter() - started
+        print(f"{label}: {rows / elapsed:,.0f}행/초 ({elapsed:.2f}초, SQL {size / 1024 / 1024:.1f}MB)")
+    output = io.StringIO()
+    started = time.perf_counter()
+    write_copy_table(output, 'text_object_snapshots', data)
+    elapsed = time.perf_counter() - started
+    size = len(output.getvalue())
+    print(f"COPY 형식: {rows / elapsed:,.0f}행/초 ({elapsed:.2f}초, SQL {size / 1024 / 1024:.1f}MB)")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="마이그레이션 유틸리티")
+    sub = parser.add_subparsers(dest="command", required=True)
+    bench_parser = sub.add_parser("bench", help="SQL 인코딩 처리량 측정")
+    bench_parser.add_argument("--rows", type=int, default=20000)
+    bench_parser.add_argument("--batch-size", type=int, default=100)
+    args = parser.parse_args()
+    benchmark_encoder(args.rows, args.batch_size)
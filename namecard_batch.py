@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+"""
+대량 명찰 분산 렌더링 (작업 매니페스트 → 샤드별 PDF → 병합)
+
+만 명 단위 행사에서 한 대의 PC로는 모든 코어를 써도 출력물 생성이 오래 걸리므로,
+출력 순서를 샤드(연속 구간)로 나눠 여러 PC가 같은 입력 파일 사본으로 각자 렌더링하고
+마지막에 한 곳에서 합칩니다.
+
+- plan:  입력(엑셀·설정·배경 이미지·템플릿과 템플릿 배경 이미지)을 읽어 매니페스트를 만듭니다.
+         레이아웃 해시, 명단 해시, 출력 순서, 샤드 구간, 입력 파일 해시를 기록합니다.
+- render: 샤드 하나를 PDF로 렌더링합니다. 입력 해시와 레이아웃/명단 해시가 매니페스트와
+          다르면 렌더링하지 않습니다. 결과 옆에 페이지 수와 SHA-256을 적은 JSON을 남깁니다.
+- merge: 모든 샤드 결과의 체크섬·페이지 수·해시를 확인한 뒤 출력 순서대로 이어 붙입니다 (pypdf 필요).
+- run-local: 한 PC에서 샤드마다 별도 프로세스를 띄워 렌더링하고 병합합니다 (시험용).
+
+사용 방법:
+1. python namecard_batch.py plan --excel 명단.xlsx --settings 설정.html --image 배경.png \\
+       --shards 8 --dpi 300 --out job/manifest.json
+2. (각 PC) python namecard_batch.py render job/manifest.json --shard 3 --out-dir job/shards
+   입력 파일을 다른 경로에 복사했다면 --input-dir 로 그 폴더를 지정합니다.
+3. python namecard_batch.py merge job/manifest.json --shard-dir job/shards --out 명찰.pdf
+   또는 한 PC에서: python namecard_batch.py run-local job/manifest.json --workers 4 --out 명찰.pdf
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+MANIFEST_VERSION = 1
+
+
+def file_sha256(path, chunk_size=1024 * 1024):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def shard_ranges(total, shard_count):
+    """출력 순서 [0, total)을 거의 같은 크기의 연속 구간 shard_count개로 나눕니다."""
+    shard_count = max(1, min(shard_count, total or 1))
+    size, extra = divmod(total, shard_count)
+    ranges = []
+    start = 0
+    for index in range(shard_count):
+        end = start + size + (1 if index < extra else 0)
+        ranges.append({"index": index, "start": start, "end": end})
+        start = end
+    return ranges
+
+
+def shard_basename(index):
+    return f"shard-{index:04d}"
+
+
+def load_manifest(path):
+    with open(path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("version") != MANIFEST_VERSION:
+        raise ValueError(f"지원하지 않는 매니페스트 버전입니다: {manifest.get('version')}")
+    return manifest
+
+
+# ---------------------------------------------------------------------------
+# 렌더링 쪽 (Qt)
+# ---------------------------------------------------------------------------
+
+TEMPLATE_IMAGE_PREFIX = "template_image:"
+
+
+def portable_profile(profile):
+    """기기마다 다른 배경 이미지 경로·수정 시각 대신 파일 내용 해시를 넣은 레이아웃 프로필
+
+    입력 파일을 다른 PC로 복사하면 경로와 mtime이 바뀌므로 해시에는 내용만 반영합니다.
+    """
+    image = profile.get("image")
+    if not image:
+        return profile
+    image = dict(image, mtime=None)
+    if image.get("path"):
+        image["path"] = file_sha256(image["path"]) if os.path.exists(image["path"]) else None
+    return dict(profile, image=image)
+
+
+def template_images(window):
+    """템플릿 배경 이미지 (입력 종류 → 경로). 매니페스트 입력으로 함께 기록합니다."""
+    images = {}
+    for name, profile in window.templates.items():
+        image = profile.get("image")
+        if image and image.get("path") and os.path.exists(image["path"]):
+            images[TEMPLATE_IMAGE_PREFIX + name] = image["path"]
+    return images
+
+
+def use_template_images(window, inputs):
+    """템플릿 배경 이미지 경로를 이 PC에서 찾은 입력 파일 경로로 바꿉니다."""
+    for kind, path in inputs.items():
+        name = kind[len(TEMPLATE_IMAGE_PREFIX):]
+        if kind.startswith(TEMPLATE_IMAGE_PREFIX) and name in window.templates:
+            profile = window.templates[name]
+            window.templates[name] = dict(profile, image=dict(profile["image"], path=path))
+
+
+def batch_layout_hash(window):
+    """현재 레이아웃 + 모든 템플릿 + 템플릿 규칙의 해시 (기기 간 비교용)"""
+    from namecard_maker import content_hash
+    return content_hash({
+        "layout": portable_profile(window.layout_profile()),
+        "templates": {name: portable_profile(profile) for name, profile in window.templates.items()},
+        "rule": window.template_rule,
+    })
+
+
+def print_order(window, record_indices):
+    """실제 출력 순서 (MainWindow.page_pictures와 같이 템플릿별로 묶은 순서)"""
+    groups = {}
+    for record_index in record_indices:
+        groups.setdefault(window.template_for(window.records[record_index]), []).append(record_index)
+    return [record_index for indices in groups.values() for record_index in indices]
+
+
+def open_window(inputs):
+    """입력 파일로 창 없는 MainWindow를 준비합니다. inputs는 종류 → 경로(또는 None)."""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt5.QtWidgets import QApplication
+    from namecard_maker import MainWindow
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    window = MainWindow()
+    if inputs.get("templates"):
+        window.templates_path = inputs["templates"]
+        window.load_templates()
+    if inputs.get("settings"):
+        window.apply_settings_file(inputs["settings"])
+    if inputs.get("image"):
+        window.load_image_file(inputs["image"])
+    if inputs.get("excel"):
+        window.load_excel_file(inputs["excel"])
+    return app, window
+
+
+def plan(args):
+    from namecard_maker import content_hash, OUTPUT_PROFILES
+
+    templates = args.templates
+    if templates is None:
+        default = os.path.join(os.path.expanduser("~"), ".namecard_maker", "templates.json")
+        templates = default if os.path.exists(default) else None
+    inputs = {"settings": args.settings, "image": args.image, "templates": templates, "excel": args.excel}
+    app, window = open_window(inputs)
+    if not window.records:
+        raise SystemExit("명단이 비어 있습니다.")
+    # 템플릿 배경 이미지도 다른 PC에서 찾고 내용을 확인할 수 있도록 입력으로 기록
+    inputs.update(template_images(window))
+
+    dpi = args.dpi or OUTPUT_PROFILES[args.profile]["dpi"]
+    order = print_order(window, range(len(window.records)))
+    manifest_dir = os.path.dirname(os.path.abspath(args.out))
+    os.makedirs(manifest_dir, exist_ok=True)
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "dpi": dpi,
+        "layout_hash": batch_layout_hash(window),
+        "records_hash": content_hash(window.records),
+        "record_count": len(window.records),
+        "inputs": {
+            kind: {"path": os.path.relpath(os.path.abspath(path), manifest_dir),
+                   "sha256": file_sha256(path)}
+            for kind, path in inputs.items() if path
+        },
+        "order": order,
+        "shards": shard_ranges(len(order), args.shards),
+    }
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    print(f"매니페스트: {args.out} (명단 {len(order)}명, 샤드 {len(manifest['shards'])}개, {dpi} DPI)")
+    print(f"레이아웃 {manifest['layout_hash'][:12]} / 명단 {manifest['records_hash'][:12]}")
+
+
+def resolve_inputs(manifest, manifest_path, input_dir=None):
+    """매니페스트의 입력 파일을 찾고 해시를 확인합니다 (input_dir가 있으면 그 폴더에서 파일 이름으로)."""
+    base = os.path.dirname(os.path.abspath(manifest_path))
+    inputs = {}
+    for kind, entry in manifest["inputs"].items():
+        path = (os.path.join(input_dir, os.path.basename(entry["path"])) if input_dir
+                else os.path.join(base, entry["path"]))
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"입력 파일({kind})을 찾을 수 없습니다: {path}")
+        if file_sha256(path) != entry["sha256"]:
+            raise ValueError(f"입력 파일({kind}) 내용이 매니페스트와 다릅니다: {path}")
+        inputs[kind] = path
+    return inputs
+
+
+def render_shard(args):
+    from PyQt5.QtCore import QRectF
+    from PyQt5.QtGui import QPainter
+    from PyQt5.QtPrintSupport import QPrinter
+    from namecard_maker import content_hash, BadgeRenderCache
+    import tempfile
+
+    manifest = load_manifest(args.manifest)
+    shard = manifest["shards"][args.shard]
+    inputs = resolve_inputs(manifest, args.manifest, args.input_dir)
+    app, window = open_window(inputs)
+    use_template_images(window, inputs)
+    layout_hash = batch_layout_hash(window)
+    records_hash = content_hash(window.records)
+    if layout_hash != manifest["layout_hash"]:
+        raise SystemExit(f"레이아웃 해시가 매니페스트와 다릅니다: {layout_hash[:12]}")
+    if records_hash != manifest["records_hash"]:
+        raise SystemExit(f"명단 해시가 매니페스트와 다릅니다: {records_hash[:12]}")
+
+    os.makedirs(args.out_dir, exist_ok=True)
+    name = shard_basename(shard["index"])
+    pdf_path = os.path.join(args.out_dir, f"{name}.pdf")
+    partial_path = pdf_path + ".part"
+    record_indices = manifest["order"][shard["start"]:shard["end"]]
+    dpi = manifest["dpi"]
+
+    started = time.perf_counter()
+    # 같은 PC의 다른 샤드 프로세스와 디스크 캐시 파일을 공유하지 않도록 샤드 전용 캐시 사용
+    with tempfile.TemporaryDirectory(prefix=f"namecard-{name}-") as cache_dir:
+        window.render_cache = BadgeRenderCache(cache_dir)
+        printer = window.create_printer()
+        printer.setResolution(dpi)
+        printer.setOutputFormat(QPrinter.PdfFormat)
+        printer.setOutputFileName(partial_path)
+        painter = QPainter(printer)
+        pages = 0
+        with window.uncached_rendering():
+            for static_picture, picture in window.page_pictures(record_indices, dpi):
+                if pages:
+                    printer.newPage()
+                page_rect = QRectF(printer.pageRect())
+                window.draw_scene_picture(painter, static_picture, page_rect)
+                window.draw_scene_picture(painter, picture, page_rect)
+                pages += 1
+        painter.end()
+    os.replace(partial_path, pdf_path)
+    elapsed = time.perf_counter() - started
+
+    result = {
+        "index": shard["index"],
+        "start": shard["start"],
+        "end": shard["end"],
+        "pages": pages,
+        "file": os.path.basename(pdf_path),
+        "sha256": file_sha256(pdf_path),
+        "layout_hash": layout_hash,
+        "records_hash": records_hash,
+        "seconds": round(elapsed, 3),
+    }
+    with open(os.path.join(args.out_dir, f"{name}.json"), "w", encoding="utf-8") as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+    print(f"{name}: {pages}장, {elapsed:.1f}초 → {pdf_path}")
+
+
+# ---------------------------------------------------------------------------
+# 병합 (Qt 불필요)
+# ---------------------------------------------------------------------------
+
+def verify_shards(manifest, shard_dir):
+    """샤드 결과를 매니페스트와 대조해 출력 순서대로 PDF 경로를 돌려줍니다. 문제가 있으면 ValueError."""
+    paths = []
+    problems = []
+    for shard in manifest["shards"]:
+        name = shard_basename(shard["index"])
+        try:
+            with open(os.path.join(shard_dir, f"{name}.json"), "r", encoding="utf-8") as f:
+                result = json.load(f)
+        except (OSError, ValueError):
+            problems.append(f"{name}: 결과 파일 없음")
+            continue
+        pdf_path = os.path.join(shard_dir, result["file"])
+        expected = shard["end"] - shard["start"]
+        if (result["start"], result["end"]) != (shard["start"], shard["end"]):
+            problems.append(f"{name}: 구간이 다름")
+        elif result["layout_hash"] != manifest["layout_hash"] or result["records_hash"] != manifest["records_hash"]:
+            problems.append(f"{name}: 다른 입력으로 렌더링됨")
+        elif result["pages"] != expected:
+            problems.append(f"{name}: {expected}장이어야 하는데 {result['pages']}장")
+        elif not os.path.exists(pdf_path) or file_sha256(pdf_path) != result["sha256"]:
+            problems.append(f"{name}: PDF 체크섬 불일치")
+        paths.append(pdf_path)
+    if problems:
+        raise ValueError("샤드 확인 실패\n" + "\n".join(problems))
+    return paths
+
+
+def merge_pdfs(paths, out_path):
+    try:
+        from pypdf import PdfWriter
+    except ImportError:
+        raise SystemExit("PDF 병합에는 pypdf가 필요합니다: pip install pypdf")
+    writer = PdfWriter()
+    for path in paths:
+        writer.append(path)
+    partial_path = out_path + ".part"
+    with open(partial_path, "wb") as f:
+        writer.write(f)
+    os.replace(partial_path, out_path)
+
+
+def merge(args):
+    manifest = load_manifest(args.manifest)
+    try:
+        paths = verify_shards(manifest, args.shard_dir)
+    except ValueError as e:
+        raise SystemExit(str(e))
+    merge_pdfs(paths, args.out)
+    print(f"병합 완료: {args.out} (샤드 {len(paths)}개, {len(manifest['order'])}장)")
+
+
+def run_local(args):
+    """한 PC에서 샤드마다 별도 프로세스로 렌더링한 뒤 병합합니다."""
+    manifest = load_manifest(args.manifest)
+    shard_dir = args.shard_dir or os.path.join(os.path.dirname(os.path.abspath(args.manifest)), "shards")
+    script = os.path.abspath(__file__)
+
+    def run(shard):
+        command = [sys.executable, script, "render", args.manifest,
+                   "--shard", str(shard["index"]), "--out-dir", shard_dir]
+        if args.input_dir:
+            command += ["--input-dir", args.input_dir]
+        return shard["index"], subprocess.run(command).returncode
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.workers or os.cpu_count() or 1) as executor:
+        failed = [index for index, code in executor.map(run, manifest["shards"]) if code != 0]
+    if failed:
+        raise SystemExit(f"렌더링 실패 샤드: {', '.join(shard_basename(i) for i in failed)}")
+    print(f"렌더링 {time.perf_counter() - started:.1f}초")
+    if args.out:
+        args.shard_dir = shard_dir
+        merge(args)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="대량 명찰 분산 렌더링")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    plan_parser = sub.add_parser("plan", help="작업 매니페스트 생성")
+    plan_parser.add_argument("--excel", required=True, help="명단 엑셀 파일")
+    plan_parser.add_argument("--settings", help="내보낸 설정 HTML")
+    plan_parser.add_argument("--image", help="배경 이미지")
+    plan_parser.add_argument("--templates", help="templates.json (생략하면 사용자 폴더의 것)")
+    plan_parser.add_argument("--shards", type=int, default=os.cpu_count() or 1)
+    plan_parser.add_argument("--profile", default="print", help="출력 품질 (draft / screen / print)")
+    plan_parser.add_argument("--dpi", type=int, help="출력 DPI (지정하면 --profile 무시)")
+    plan_parser.add_argument("--out", required=True, help="매니페스트 경로")
+
+    render_parser = sub.add_parser("render", help="샤드 하나 렌더링")
+    render_parser.add_argument("manifest")
+    render_parser.add_argument("--shard", type=int, required=True)
+    render_parser.add_argument("--out-dir", required=True)
+    render_parser.add_argument("--input-dir", help="입력 파일 사본이 있는 폴더")
+
+    merge_parser = sub.add_parser("merge", help="샤드 결과 확인 후 병합")
+    merge_parser.add_argument("manifest")
+    merge_parser.add_argument("--shard-dir", required=True)
+    merge_parser.add_argument("--out", required=True)
+
+    local_parser = sub.add_parser("run-local", help="한 PC에서 모든 샤드를 별도 프로세스로 렌더링")
+    local_parser.add_argument("manifest")
+    local_parser.add_argument("--workers", type=int)
+    local_parser.add_argument("--shard-dir")
+    local_parser.add_argument("--input-dir")
+    local_parser.add_argument("--out", help="지정하면 렌더링 후 병합")
+
+    args = parser.parse_args()
+    {"plan": plan, "render": render_shard, "merge": merge, "run-local": run_local}[args.command](args)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,355 @@
 import sys
 import pandas as pd
 import os
+import html
+import json
+import hashlib
+import shutil
+import time
+import tempfile
+import math
+import base64
+import urllib.parse
+import urllib.request
+import threading
+import functools
+import atexit
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QGraphicsScene, QGraphicsView, QToolBar,
     QAction, QFileDialog, QGraphicsPixmapItem, QGraphicsTextItem,
     QGraphicsItemGroup, QMenu, QInputDialog, QMessageBox, QLabel,
     QLineEdit, QPushButton, QWidget, QHBoxLayout, QDialog, QVBoxLayout,
     QCheckBox, QListWidget, QListWidgetItem, QDockWidget, QSlider, QGroupBox, QFormLayout,
-    QGraphicsItem
+    QGraphicsItem, QStyle, QSpinBox, QListView, QStyledItemDelegate, QTableWidget, QTableWidgetItem,
+    QComboBox
 )
-from PyQt5.QtGui import QPixmap, QPainter, QFont, QPen, QColor, QFontDatabase, QTransform
-from PyQt5.QtCore import Qt, QRectF, pyqtSignal
-from PyQt5.QtPrintSupport import QPrinter, QPrintDialog, QPrintPreviewDialog
+from PyQt5.QtGui import (
+    QPixmap, QImage, QPainter, QFont, QPen, QColor, QFontDatabase, QFontInfo, QTransform,
+    QPixmapCache, QPicture
+)
+from PyQt5.QtCore import Qt, QRectF, QSize, QObject, QTimer, QAbstractListModel, QModelIndex, pyqtSignal
+from PyQt5.QtPrintSupport import QPrinter, QPrintDialog, QPrintPreviewDialog, QPrinterInfo
 
 os.environ["QT_AUTO_SCREEN_SCALE_FACTOR"] = "1"
 os.environ["QT_SCALE_FACTOR"] = "1"
 os.environ["QT_ENABLE_HIGHDPI_SCALING"] = "1"
 
+class BadgeField:
+    """명찰 텍스트 필드 하나의 정의 (레코드 키, 엑셀 컬럼, 기본 배치)"""
+    def __init__(self, key, label, column=None, font_size=20, ratio=0.5, visible=True):
+        self.key = key
+        self.label = label
+        self.column = column or label
+        self.font_size = font_size
+        self.ratio = ratio  # 명찰 높이 대비 기본 Y 위치
+        self.visible = visible
+        self.item = None
+
+    @property
+    def role(self):
+        """설정 파일에 기록되는 이름 (예: name_text)"""
+        return f"{self.key}_text"
+
+def default_fields():
+    """기본 필드: 회사명 / 이름 / 직급"""
+    return [
+        BadgeField("company", "회사명", "회사명", font_size=20, ratio=0.30),
+        BadgeField("name", "이름", "이름", font_size=24, ratio=0.50),
+        BadgeField("title", "직급", "직급", font_size=20, ratio=0.75),
+    ]
+
+class _BlankDict(dict):
+    def __missing__(self, key):
+        return ""
+
+def format_qr_payload(template, record):
+    """'{name}|{company}' 같은 템플릿을 레코드 값으로 채웁니다. 없는 키는 빈 문자열."""
+    try:
+        return template.format_map(_BlankDict(record))
+    except (ValueError, IndexError):
+        return template
+
+def encode_qr_png(payload, module_size):
+    """QR 코드를 PNG 바이트로 인코딩합니다 (프로세스 풀에서 실행 가능하도록 모듈 함수)."""
+    import io
+    import qrcode
+    qr = qrcode.QRCode(
+        error_correction=qrcode.constants.ERROR_CORRECT_M,
+        box_size=module_size, border=2)  # 웹 QRCodeGenerator와 같은 margin/오류정정
+    qr.add_data(payload)
+    qr.make(fit=True)
+    buffer = io.BytesIO()
+    qr.make_image(fill_color="black", back_color="white").save(buffer, format="PNG")
+    return buffer.getvalue()
+
+class QrCodeCache:
+    """(payload, 모듈 크기) -> QImage LRU 캐시. 명단 전체는 프로세스 풀로 미리 생성합니다."""
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._images = OrderedDict()
+
+    def __len__(self):
+        return len(self._images)
+
+    def _store(self, key, png_bytes):
+        image = QImage.fromData(png_bytes, "PNG")
+        self._images[key] = image
+        self._images.move_to_end(key)
+        while len(self._images) > self.max_entries:
+            self._images.popitem(last=False)
+        return image
+
+    def get(self, payload, module_size):
+        key = (payload, module_size)
+        image = self._images.get(key)
+        if image is not None:
+            self._images.move_to_end(key)
+        return image
+
+    def get_or_encode(self, payload, module_size):
+        image = self.get(payload, module_size)
+        if image is None:
+            image = self._store((payload, module_size), encode_qr_png(payload, module_size))
+        return image
+
+    def prefetch(self, payloads, module_size, workers=None):
+        """캐시에 없는 payload들을 프로세스 풀에서 한꺼번에 인코딩합니다."""
+        missing = list(dict.fromkeys(
+            p for p in payloads if p and (p, module_size) not in self._images))
+        if not missing:
+            return 0
+        if len(missing) == 1:
+            self._store((missing[0], module_size), encode_qr_png(missing[0], module_size))
+            return 1
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = pool.map(encode_qr_png, missing, [module_size] * len(missing),
+                               chunksize=max(1, len(missing) // 32))
+            for payload, png_bytes in zip(missing, results):
+                self._store((payload, module_size), png_bytes)
+        return len(missing)
+
+SCENE_DPI = 144  # 편집 씬 좌표 1px = 1/144인치
+MM_PER_INCH = 25.4
+
+def mm_to_px(mm, dpi=SCENE_DPI):
+    return mm / MM_PER_INCH * dpi
+
+def cm_to_px(cm, dpi=SCENE_DPI):
+    return mm_to_px(cm * 10, dpi)
+
+def px_to_cm(px, dpi=SCENE_DPI):
+    return px / dpi * MM_PER_INCH / 10
+
+# 출력 해상도 프로필 (지오메트리는 물리 단위라 DPI와 무관, 배경 이미지 해상도와 출력 크기가 달라짐)
+OUTPUT_PROFILES = OrderedDict([
+    ("draft", {"label": "초안", "dpi": 96}),
+    ("screen", {"label": "화면", "dpi": 144}),
+    ("print", {"label": "인쇄", "dpi": 300}),
+])
+
+def content_hash(data):
+    """dict/list를 정렬된 JSON으로 직렬화한 SHA-256 해시"""
+    payload = json.dumps(data, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class SpanStats:
+    """구간 하나의 호출 수·시간 합계·로그2 히스토그램 (마이크로초 버킷)"""
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = 0.0
+        self.buckets = {}  # 2^n µs 이하 -> 횟수
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        self.min = seconds if self.min is None else min(self.min, seconds)
+        self.max = max(self.max, seconds)
+        bucket = int(seconds * 1e6).bit_length()
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+
+    def percentile(self, fraction):
+        """버킷 안에서 선형 보간한 백분위 (ms, 측정한 최솟값~최댓값 범위로 제한)"""
+        if not self.count:
+            return 0.0
+        target = self.count * fraction
+        seen = 0
+        for bucket in sorted(self.buckets):
+            count = self.buckets[bucket]
+            if seen + count >= target:
+                # bit_length가 bucket인 값은 [2^(bucket-1), 2^bucket) µs 구간
+                low = (1 << (bucket - 1)) if bucket else 0
+                estimate = low + ((1 << bucket) - low) * (target - seen) / count
+                return round(min(max(estimate / 1000, self.min * 1000), self.max * 1000), 3)
+            seen += count
+        return round(self.max * 1000, 3)
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "total_ms": round(self.total * 1000, 3),
+            "mean_ms": round(self.total * 1000 / self.count, 3) if self.count else 0.0,
+            "min_ms": round((self.min or 0.0) * 1000, 3),
+            "max_ms": round(self.max * 1000, 3),
+            "p50_ms": self.percentile(0.5),
+            "p95_ms": self.percentile(0.95),
+            "histogram_us": {f"<={1 << bucket}": count for bucket, count in sorted(self.buckets.items())},
+        }
+
+class Profiler:
+    """주요 구간(엑셀 읽기, 텍스트 갱신, scene.render, newPage 등)의 시간 측정
+
+    켤 때 등록된 메서드를 시간 측정 래퍼로 바꾸고, 끌 때 원래 메서드로 되돌리므로
+    꺼져 있을 때는 추가 비용이 전혀 없습니다. NAMECARD_PROFILE=1 로 시작하면 처음부터
+    켜지고, NAMECARD_PROFILE=경로.json 이면 종료할 때 그 파일로 저장합니다.
+    """
+    def __init__(self):
+        self.enabled = False
+        self.started = None
+        self._targets = []  # (구간 이름, 클래스, 메서드 이름)
+        self._originals = {}  # (클래스, 메서드 이름) -> (원래 속성, 클래스 __dict__에 있었는지)
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def register(self, name, owner, attr):
+        self._targets.append((name, owner, attr))
+
+    def record(self, name, seconds):
+        with self._lock:
+            stats = self._stats.get(name)
+            if stats is None:
+                stats = self._stats[name] = SpanStats()
+            stats.add(seconds)
+
+    def _wrap(self, name, func):
+        record = self.record
+
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(name, time.perf_counter() - started)
+        return timed
+
+    def enable(self):
+        if self.enabled:
+            return
+        for name, owner, attr in self._targets:
+            original = getattr(owner, attr)
+            self._originals[(owner, attr)] = (original, attr in owner.__dict__)
+            setattr(owner, attr, self._wrap(name, original))
+        self.enabled = True
+        self.started = self.started or time.time()
+
+    def disable(self):
+        if not self.enabled:
+            return
+        for (owner, attr), (original, own) in self._originals.items():
+            if own:
+                setattr(owner, attr, original)
+            else:
+                delattr(owner, attr)
+        self._originals.clear()
+        self.enabled = False
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+        self.started = time.time() if self.enabled else None
+
+    def snapshot(self):
+        with self._lock:
+            spans = {name: stats.to_dict() for name, stats in sorted(self._stats.items())}
+        return {"started": self.started, "dumped": time.time(), "spans": spans}
+
+    def dump(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.snapshot(), f, ensure_ascii=False, indent=2)
+
+profiler = Profiler()
+
+class BadgeRenderCache:
+    """렌더링된 명찰 텍스트 레이어(QPicture)를 저장하는 디스크 캐시
+
+    <root>/<레이아웃 해시>/<레코드 해시>.pic 구조로 저장하며, 레이아웃이 바뀌면
+    이전 레이아웃 디렉터리는 통째로 지웁니다. 전체 크기가 max_bytes를 넘으면
+    가장 오래 쓰지 않은 파일부터 지웁니다 (mtime 기준 LRU).
+    """
+    def __init__(self, root, max_bytes=256 * 1024 * 1024):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.layout_hash = None
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.root, exist_ok=True)
+        self.total_bytes = sum(size for _, _, size in self._entries())
+
+    def _entries(self):
+        for layout_dir in os.scandir(self.root):
+            if not layout_dir.is_dir():
+                continue
+            for entry in os.scandir(layout_dir.path):
+                if entry.is_file():
+                    stat = entry.stat()
+                    yield entry.path, stat.st_mtime, stat.st_size
+
+    def set_layout(self, layout_hash, keep=()):
+        """현재 레이아웃 해시를 지정하고 keep에 없는 다른 레이아웃의 캐시는 무효화합니다."""
+        if layout_hash == self.layout_hash:
+            return
+        self.layout_hash = layout_hash
+        keep = set(keep) | {layout_hash}
+        for layout_dir in os.scandir(self.root):
+            if layout_dir.is_dir() and layout_dir.name not in keep:
+                shutil.rmtree(layout_dir.path, ignore_errors=True)
+        os.makedirs(os.path.join(self.root, layout_hash), exist_ok=True)
+        self.total_bytes = sum(size for _, _, size in self._entries())
+
+    def _path(self, record_hash):
+        return os.path.join(self.root, self.layout_hash, f"{record_hash}.pic")
+
+    def load(self, record_hash):
+        path = self._path(record_hash)
+        picture = QPicture()
+        if os.path.exists(path) and picture.load(path):
+            os.utime(path)  # LRU 갱신
+            self.hits += 1
+            return picture
+        self.misses += 1
+        return None
+
+    def store(self, record_hash, picture):
+        path = self._path(record_hash)
+        if not picture.save(path):
+            return
+        self.total_bytes += os.path.getsize(path)
+        if self.total_bytes > self.max_bytes:
+            self.evict()
+
+    def evict(self):
+        # 최대 크기의 90%까지 오래된 순서로 삭제
+        target = self.max_bytes * 0.9
+        for path, _, size in sorted(self._entries(), key=lambda entry: entry[1]):
+            if self.total_bytes <= target:
+                break
+            try:
+                os.remove(path)
+                self.total_bytes -= size
+            except OSError:
+                pass
+
+    def clear(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+        os.makedirs(self.root, exist_ok=True)
+        self.layout_hash = None
+        self.total_bytes = 0
+
 class CenteredTextItem(QGraphicsTextItem):
     positionChanged = pyqtSignal(float, float)  # x, y
     def __init__(self, text="", font_size=20):
@@ -24,6 +357,7 @@ class CenteredTextItem(QGraphicsTextItem):
         self.setFlags(QGraphicsTextItem.ItemIsMovable | QGraphicsTextItem.ItemIsSelectable)
         self.setFlag(QGraphicsItem.ItemSendsGeometryChanges, True)
         self.setTextInteractionFlags(Qt.NoTextInteraction)
+        self.setCacheMode(QGraphicsItem.DeviceCoordinateCache)
         self.setFont(QFont("", font_size))
         option = self.document().defaultTextOption()
         option.setAlignment(Qt.AlignCenter)
@@ -79,20 +413,57 @@ class CenteredTextItem(QGraphicsTextItem):
 class DraggablePixmapItem(QGraphicsPixmapItem):
     def __init__(self, pixmap):
         super().__init__(pixmap)
-        self.setFlags(QGraphicsPixmapItem.ItemIsMovable | 
+        self.setFlags(QGraphicsPixmapItem.ItemIsMovable |
                      QGraphicsPixmapItem.ItemIsSelectable)
+        self.setCacheMode(QGraphicsItem.DeviceCoordinateCache)
         self.original_pixmap = pixmap
+        self._pyramid = None
+
+    def setPixmap(self, pixmap):
+        super().setPixmap(pixmap)
+        self._pyramid = None
+
+    def _pyramid_levels(self):
+        """화면 축소 표시용 1/2, 1/4 ... 축소본 목록 (지연 생성)"""
+        if self._pyramid is None:
+            levels = []
+            level = self.pixmap()
+            while level.width() > 64 and level.height() > 64:
+                level = level.scaled(
+                    level.width() // 2, level.height() // 2,
+                    Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
+                levels.append(level)
+            self._pyramid = levels
+        return self._pyramid
+
+    def paint(self, painter, option, widget=None):
+        # 인쇄(widget 없음)는 항상 원본 해상도로 그림
+        lod = option.levelOfDetailFromTransform(painter.worldTransform())
+        if widget is None or lod >= 0.5 or self.pixmap().isNull():
+            super().paint(painter, option, widget)
+            return
+        source = self.pixmap()
+        for level in self._pyramid_levels():
+            if level.width() < self.pixmap().width() * lod:
+                break
+            source = level
+        painter.save()
+        painter.drawPixmap(self.boundingRect(), source, QRectF(source.rect()))
+        if option.state & QStyle.State_Selected:
+            painter.setPen(QPen(Qt.black, 0, Qt.DashLine))
+            painter.setBrush(Qt.NoBrush)
+            painter.drawRect(self.boundingRect())
+        painter.restore()
 
     def contextMenuEvent(self, event):
         menu = QMenu()
         resizeAction = menu.addAction("이미지 크기 조절")
         action = menu.exec_(event.screenPos())
         if action == resizeAction:
-            factor = 144 / 2.54  # DPI to cm conversion
             orig_width = self.original_pixmap.width()
             orig_height = self.original_pixmap.height()
-            default_width_cm = orig_width / factor if orig_width > 0 else 5.0
-            default_height_cm = orig_height / factor if orig_height > 0 else 5.0
+            default_width_cm = px_to_cm(orig_width) if orig_width > 0 else 5.0
+            default_height_cm = px_to_cm(orig_height) if orig_height > 0 else 5.0
             
             new_width_cm, ok1 = QInputDialog.getDouble(
                 None, "이미지 크기 조절", "가로(cm)를 입력하세요:", 
@@ -106,8 +477,8 @@ class DraggablePixmapItem(QGraphicsPixmapItem):
             if not ok2:
                 return
                 
-            new_width_px = int(round(new_width_cm * factor))
-            new_height_px = int(round(new_height_cm * factor))
+            new_width_px = int(round(cm_to_px(new_width_cm)))
+            new_height_px = int(round(cm_to_px(new_height_cm)))
             new_pixmap = self.original_pixmap.scaled(
                 new_width_px, new_height_px, 
                 Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
@@ -115,6 +486,51 @@ class DraggablePixmapItem(QGraphicsPixmapItem):
         else:
             super().contextMenuEvent(event)
 
+class QrCodeItem(QGraphicsPixmapItem):
+    """레코드별 QR 코드 레이어. 이미지는 QrCodeCache에서만 가져옵니다."""
+    def __init__(self, cache, template="{name}|{company}", module_size=6):
+        super().__init__()
+        self.setFlags(QGraphicsPixmapItem.ItemIsMovable |
+                     QGraphicsPixmapItem.ItemIsSelectable)
+        self.setCacheMode(QGraphicsItem.DeviceCoordinateCache)
+        self.cache = cache
+        self.template = template
+        self.module_size = module_size
+        self.payload = None
+
+    def payload_for(self, record):
+        return format_qr_payload(self.template, record)
+
+    def set_record(self, record):
+        payload = self.payload_for(record)
+        if payload != self.payload:
+            self.show_payload(payload)
+
+    def show_payload(self, payload):
+        self.payload = payload
+        # 크기가 바뀌어도 중심 위치는 유지
+        center = self.mapToParent(self.boundingRect().center())
+        if payload:
+            image = self.cache.get_or_encode(payload, self.module_size)
+            self.setPixmap(QPixmap.fromImage(image))
+        else:
+            self.setPixmap(QPixmap())
+        self.setPos(center - self.boundingRect().center())
+
+    def contextMenuEvent(self, event):
+        menu = QMenu()
+        moduleAction = menu.addAction("QR 모듈 크기 조절")
+        action = menu.exec_(event.screenPos())
+        if action == moduleAction:
+            new_size, ok = QInputDialog.getInt(
+                None, "QR 모듈 크기 조절", "모듈 한 칸 크기(px)를 입력하세요:",
+                self.module_size, 1, 50, 1)
+            if ok and new_size != self.module_size:
+                self.module_size = new_size
+                self.show_payload(self.payload)
+        else:
+            super().contextMenuEvent(event)
+
 class FontSelectionDialog(QDialog):
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -134,25 +550,19 @@ class FontSelectionDialog(QDialog):
         return self.list_widget.currentItem().text() if self.list_widget.currentItem() else None
 
 class RecordDialog(QDialog):
-    def __init__(self, parent=None, record=None):
+    def __init__(self, parent=None, record=None, fields=None):
         super().__init__(parent)
         self.setWindowTitle("명단 추가/수정")
         layout = QVBoxLayout(self)
-        
-        self.company_label = QLabel("회사명:")
-        self.company_edit = QLineEdit()
-        layout.addWidget(self.company_label)
-        layout.addWidget(self.company_edit)
-        
-        self.name_label = QLabel("이름:")
-        self.name_edit = QLineEdit()
-        layout.addWidget(self.name_label)
-        layout.addWidget(self.name_edit)
-        
-        self.title_label = QLabel("직급:")
-        self.title_edit = QLineEdit()
-        layout.addWidget(self.title_label)
-        layout.addWidget(self.title_edit)
+        self.fields = fields if fields is not None else default_fields()
+
+        # 필드 정의대로 입력창 생성
+        self.edits = {}
+        for field in self.fields:
+            edit = QLineEdit()
+            layout.addWidget(QLabel(f"{field.label}:"))
+            layout.addWidget(edit)
+            self.edits[field.key] = edit
         
         button_layout = QHBoxLayout()
         self.ok_button = QPushButton("확인")
@@ -165,33 +575,1107 @@ class RecordDialog(QDialog):
         self.cancel_button.clicked.connect(self.reject)
         
         if record is not None:
-            self.company_edit.setText(record.get("company", ""))
-            self.name_edit.setText(record.get("name", ""))
-            self.title_edit.setText(record.get("title", ""))
+            for key, edit in self.edits.items():
+                edit.setText(record.get(key, ""))
     
     def get_record(self):
+        return {key: edit.text().strip() for key, edit in self.edits.items()}
+
+class MultiPrinterDialog(QDialog):
+    """다중 프린터 출력에 쓸 프린터 선택 (테스트용 PDF 장치 포함)"""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("다중 프린터 출력")
+        self.resize(320, 400)
+        layout = QVBoxLayout(self)
+        layout.addWidget(QLabel("사용할 프린터:"))
+        self.list_widget = QListWidget()
+        for name in QPrinterInfo.availablePrinterNames():
+            item = QListWidgetItem(name)
+            item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
+            item.setCheckState(Qt.Unchecked)
+            self.list_widget.addItem(item)
+        layout.addWidget(self.list_widget)
+
+        pdf_layout = QHBoxLayout()
+        pdf_layout.addWidget(QLabel("PDF 테스트 장치 수:"))
+        self.pdf_spin = QSpinBox()
+        self.pdf_spin.setRange(0, 16)
+        pdf_layout.addWidget(self.pdf_spin)
+        layout.addLayout(pdf_layout)
+
+        button_layout = QHBoxLayout()
+        self.ok_button = QPushButton("출력")
+        self.cancel_button = QPushButton("취소")
+        button_layout.addWidget(self.ok_button)
+        button_layout.addWidget(self.cancel_button)
+        layout.addLayout(button_layout)
+        self.ok_button.clicked.connect(self.accept)
+        self.cancel_button.clicked.connect(self.reject)
+
+    def printer_names(self):
+        return [self.list_widget.item(i).text() for i in range(self.list_widget.count())
+                if self.list_widget.item(i).checkState() == Qt.Checked]
+
+    def pdf_device_count(self):
+        return self.pdf_spin.value()
+
+def rasterize_page(static_picture, picture, page_size, width):
+    """배경·텍스트 레이어를 가로 width 픽셀 이미지로 그립니다 (작업 스레드에서 호출 가능)."""
+    scale = width / page_size[0]
+    image = QImage(width, max(1, round(page_size[1] * scale)), QImage.Format_RGB32)
+    image.fill(Qt.white)
+    painter = QPainter(image)
+    painter.setRenderHints(QPainter.Antialiasing | QPainter.TextAntialiasing | QPainter.SmoothPixmapTransform)
+    painter.scale(scale, scale)
+    painter.drawPicture(0, 0, static_picture)
+    painter.drawPicture(0, 0, picture)
+    painter.end()
+    return image
+
+class BadgeThumbnailer(QObject):
+    """명찰 페이지 축소 이미지를 만들어 LRU로 보관합니다.
+
+    레이어(QPicture)는 GUI 스레드에서 캐시를 거쳐 가져오고, 래스터화는 스레드 풀에서
+    합니다 (QPainter는 QImage/QPicture에 한해 다른 스레드에서 쓸 수 있음). 요청은
+    최근 것부터 처리하고 오래된 요청은 버리므로 스크롤이 렌더링을 기다리지 않습니다.
+    refine=True 요청(선명한 버전)은 일반 요청이 모두 끝난 뒤에 처리합니다.
+    캐시 키는 (레이아웃 해시, 레코드 해시, 너비)이며 전체 크기는 max_bytes로 제한됩니다.
+    """
+    thumbnailReady = pyqtSignal(int, int)  # 레코드 번호, 너비
+    _rendered = pyqtSignal(object, int, int, object)  # 키, 레코드 번호, 너비, QImage
+
+    def __init__(self, window, max_bytes=96 * 1024 * 1024, workers=2, max_requests=96, parent=None):
+        super().__init__(parent)
+        self.window = window
+        self.max_bytes = max_bytes
+        self.workers = workers
+        # 미리보기 창은 모달이라 열려 있는 동안 "텍스트만 인쇄" 설정이 바뀌지 않음
+        self.text_only = window.print_text_only
+        self._images = OrderedDict()
+        self._bytes = 0
+        self._record_keys = {}  # 레코드 번호 -> (레이아웃 해시, 레코드 해시)
+        self._requests = deque(maxlen=max_requests)
+        self._refine_requests = deque(maxlen=max_requests)
+        self._requested = set()
+        self._in_flight = set()
+        self._executor = None
+        self._closed = False
+        self._rendered.connect(self._store)
+        self._timer = QTimer(self)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self._dispatch)
+
+    def record_key(self, record_index):
+        key = self._record_keys.get(record_index)
+        if key is None:
+            record = self.window.records[record_index]
+            renderer = self.window.record_renderer(record)
+            key = (renderer.layout_hash, renderer.record_hash(record))
+            self._record_keys[record_index] = key
+        return key
+
+    def get(self, record_index, width):
+        """캐시된 이미지 (없으면 None, 렌더링은 요청하지 않음)"""
+        key = self.record_key(record_index) + (width,)
+        image = self._images.get(key)
+        if image is not None:
+            self._images.move_to_end(key)
+        return image
+
+    def request(self, record_index, width, refine=False):
+        """이미지가 없으면 렌더링을 예약합니다 (가장 최근 요청부터 처리)."""
+        job = (record_index, width)
+        if job in self._requested or self.get(record_index, width) is not None:
+            return
+        requests = self._refine_requests if refine else self._requests
+        if len(requests) == requests.maxlen:
+            self._requested.discard(requests[-1])
+        requests.appendleft(job)
+        self._requested.add(job)
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def reset_layout(self):
+        """레이아웃·레코드가 바뀌었을 때 호출. 대기 중 요청과 레코드 키를 버립니다."""
+        self._record_keys.clear()
+        self._requests.clear()
+        self._refine_requests.clear()
+        self._requested.clear()
+
+    def _dispatch(self):
+        # 작업이 가득 차면 쉬었다가 결과가 도착할 때(_store) 다시 시작
+        if len(self._in_flight) >= self.workers * 2 or not (self._requests or self._refine_requests):
+            self._timer.stop()
+            return
+        requests = self._requests or self._refine_requests
+        record_index, width = requests.popleft()
+        self._requested.discard((record_index, width))
+        if record_index >= len(self.window.records):
+            return
+        key = self.record_key(record_index) + (width,)
+        if key in self._images or key in self._in_flight:
+            return
+        _, static_picture, picture = self.window.record_layers(
+            self.window.records[record_index], dpi=OUTPUT_PROFILES["draft"]["dpi"],
+            include_image=not self.text_only)
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers)
+        self._in_flight.add(key)
+        page_size = (self.window.A4_WIDTH_PX, self.window.A4_HEIGHT_PX)
+
+        def work():
+            if self._closed:
+                return
+            image = rasterize_page(static_picture, picture, page_size, width)
+            try:
+                self._rendered.emit(key, record_index, width, image)
+            except RuntimeError:  # 창이 닫혀 이미 삭제됨
+                pass
+        self._executor.submit(work)
+
+    def _store(self, key, record_index, width, image):
+        self._in_flight.discard(key)
+        if self._closed:
+            return
+        self._images[key] = image
+        self._bytes += image.byteCount()
+        while self._bytes > self.max_bytes and len(self._images) > 1:
+            _, old = self._images.popitem(last=False)
+            self._bytes -= old.byteCount()
+        self.thumbnailReady.emit(record_index, width)
+        if (self._requests or self._refine_requests) and not self._timer.isActive():
+            self._timer.start()
+
+    def shutdown(self):
+        self._closed = True
+        self.reset_layout()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+class BadgePageModel(QAbstractListModel):
+    """미리보기 페이지 목록 (페이지 이미지는 델리게이트가 그릴 때 요청)"""
+    def __init__(self, window, record_indices, parent=None):
+        super().__init__(parent)
+        self.window = window
+        self.record_indices = record_indices
+        self.rows = {record_index: row for row, record_index in enumerate(record_indices)}
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.record_indices)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        record_index = self.record_indices[index.row()]
+        if role == Qt.DisplayRole:
+            record = self.window.records[record_index]
+            return f"{index.row() + 1} / {len(self.record_indices)}  {self.window.record_label(record)}"
+        if role == Qt.UserRole:
+            return record_index
+        return None
+
+    def record_updated(self, record_index, width):
+        row = self.rows.get(record_index)
+        if row is not None:
+            index = self.index(row)
+            self.dataChanged.emit(index, index)
+
+class BadgePageDelegate(QStyledItemDelegate):
+    """페이지를 그립니다. 저해상도 → 화면 해상도 순으로 요청하고, 있는 것 중 가장 선명한 것을 씀"""
+    LABEL_HEIGHT = 22
+    MARGIN = 8
+
+    def __init__(self, thumbnailer, page_size, low_width=120, page_width=420, parent=None):
+        super().__init__(parent)
+        self.thumbnailer = thumbnailer
+        self.page_size = page_size
+        self.low_width = low_width
+        self.page_width = page_width
+
+    def page_height(self):
+        return round(self.page_width * self.page_size[1] / self.page_size[0])
+
+    def sizeHint(self, option, index):
+        return QSize(self.page_width + self.MARGIN * 2,
+                     self.page_height() + self.LABEL_HEIGHT + self.MARGIN * 2)
+
+    def paint(self, painter, option, index):
+        record_index = index.data(Qt.UserRole)
+        page_rect = QRectF(option.rect.left() + (option.rect.width() - self.page_width) / 2,
+                           option.rect.top() + self.MARGIN, self.page_width, self.page_height())
+        high_width = max(self.low_width, round(self.page_width * painter.device().devicePixelRatioF()))
+        image = self.thumbnailer.get(record_index, high_width)
+        if image is None:
+            image = self.thumbnailer.get(record_index, self.low_width)
+            if image is None:
+                self.thumbnailer.request(record_index, self.low_width)
+            self.thumbnailer.request(record_index, high_width, refine=True)
+        painter.save()
+        if image is None:
+            painter.fillRect(page_rect, QColor("#eeeeee"))
+        else:
+            painter.setRenderHint(QPainter.SmoothPixmapTransform)
+            painter.drawImage(page_rect, image)
+        painter.setPen(QPen(QColor("#999999"), 1))
+        painter.drawRect(page_rect)
+        if option.state & QStyle.State_Selected:
+            painter.setPen(QPen(option.palette.highlight().color(), 3))
+            painter.drawRect(page_rect.adjusted(-2, -2, 2, 2))
+        painter.setPen(option.palette.text().color())
+        label = painter.fontMetrics().elidedText(
+            index.data(Qt.DisplayRole), Qt.ElideRight, option.rect.width() - 4)
+        painter.drawText(QRectF(option.rect.left(), page_rect.bottom() + 2,
+                                option.rect.width(), self.LABEL_HEIGHT),
+                         Qt.AlignCenter, label)
+        painter.restore()
+
+class BadgePreviewDialog(QDialog):
+    """체크된 명찰 전체를 페이지로 보여 주는 미리보기 (보이는 페이지만 지연 렌더링)"""
+    ZOOM_WIDTHS = (240, 420, 640, 900)
+
+    def __init__(self, window, record_indices, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(f"미리보기 ({len(record_indices)}장)")
+        self.resize(560, 800)
+        self.window = window
+        self.thumbnailer = BadgeThumbnailer(window, parent=self)
+        self.model = BadgePageModel(window, record_indices, self)
+        self.delegate = BadgePageDelegate(
+            self.thumbnailer, (window.A4_WIDTH_PX, window.A4_HEIGHT_PX), parent=self)
+        self.thumbnailer.thumbnailReady.connect(self.model.record_updated)
+
+        self.list_view = QListView()
+        self.list_view.setUniformItemSizes(True)  # 5,000장도 전체 크기 계산 없이 바로 열림
+        self.list_view.setVerticalScrollMode(QListView.ScrollPerPixel)
+        self.list_view.setModel(self.model)
+        self.list_view.setItemDelegate(self.delegate)
+        self.list_view.doubleClicked.connect(self.show_in_editor)
+
+        zoom_out_button = QPushButton("축소")
+        zoom_out_button.clicked.connect(lambda: self.step_zoom(-1))
+        zoom_in_button = QPushButton("확대")
+        zoom_in_button.clicked.connect(lambda: self.step_zoom(1))
+        close_button = QPushButton("닫기")
+        close_button.clicked.connect(self.accept)
+        button_layout = QHBoxLayout()
+        button_layout.addWidget(zoom_out_button)
+        button_layout.addWidget(zoom_in_button)
+        button_layout.addStretch()
+        button_layout.addWidget(close_button)
+
+        layout = QVBoxLayout(self)
+        layout.addWidget(self.list_view)
+        layout.addLayout(button_layout)
+
+    def step_zoom(self, step):
+        widths = self.ZOOM_WIDTHS
+        current = widths.index(self.delegate.page_width) if self.delegate.page_width in widths else 1
+        self.delegate.page_width = widths[max(0, min(len(widths) - 1, current + step))]
+        # 항목 크기가 바뀌었음을 알려 다시 배치
+        self.list_view.setUniformItemSizes(False)
+        self.list_view.setUniformItemSizes(True)
+        self.list_view.doItemsLayout()
+
+    def show_in_editor(self, index):
+        self.window.list_widget.setCurrentRow(index.data(Qt.UserRole))
+
+    def done(self, result):
+        self.thumbnailer.shutdown()
+        super().done(result)
+
+class ProfilerPanel(QWidget):
+    """성능 측정 결과 표 (디버그용, 켜져 있을 때 1초마다 갱신)"""
+    COLUMNS = ("구간", "횟수", "평균 ms", "p95 ms", "최대 ms", "합계 ms")
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        layout = QVBoxLayout(self)
+        self.enable_checkbox = QCheckBox("측정 켜기")
+        self.enable_checkbox.setChecked(profiler.enabled)
+        self.enable_checkbox.toggled.connect(self.set_enabled)
+        reset_button = QPushButton("초기화")
+        reset_button.clicked.connect(self.reset)
+        save_button = QPushButton("JSON 저장")
+        save_button.clicked.connect(self.save)
+        button_layout = QHBoxLayout()
+        button_layout.addWidget(self.enable_checkbox)
+        button_layout.addStretch()
+        button_layout.addWidget(reset_button)
+        button_layout.addWidget(save_button)
+        layout.addLayout(button_layout)
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        layout.addWidget(self.table)
+        self.timer = QTimer(self)
+        self.timer.setInterval(1000)
+        self.timer.timeout.connect(self.refresh)
+
+    def set_enabled(self, enabled):
+        if enabled:
+            profiler.enable()
+        else:
+            profiler.disable()
+        self.refresh()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.enable_checkbox.setChecked(profiler.enabled)
+        self.timer.start()
+        self.refresh()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.timer.stop()
+
+    def reset(self):
+        profiler.reset()
+        self.refresh()
+
+    def refresh(self):
+        spans = profiler.snapshot()["spans"]
+        self.table.setRowCount(len(spans))
+        for row, (name, stats) in enumerate(spans.items()):
+            values = (name, stats["count"], stats["mean_ms"], stats["p95_ms"],
+                      stats["max_ms"], stats["total_ms"])
+            for column, value in enumerate(values):
+                self.table.setItem(row, column, QTableWidgetItem(str(value)))
+
+    def save(self):
+        fileName, _ = QFileDialog.getSaveFileName(
+            self, "성능 측정 저장", "namecard_profile.json", "JSON Files (*.json)")
+        if fileName:
+            profiler.dump(fileName)
+
+class PositionBinder(QObject):
+    """필드별 X/Y 슬라이더·입력창을 텍스트 아이템과 연결합니다.
+
+    드래그 중 위치 변경은 모아 두었다가 한 프레임(약 16ms)에 한 번만 위젯에 반영합니다.
+    """
+    FRAME_MS = 16
+
+    def __init__(self, form_layout, width, height, parent=None):
+        super().__init__(parent)
+        self.form_layout = form_layout
+        self.width = int(width)
+        self.height = int(height)
+        self.rows = {}
+        self._connections = []
+        self._pending = {}
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(self.FRAME_MS)
+        self._timer.timeout.connect(self.flush)
+
+    def _axis_row(self, field, axis):
+        slider = QSlider(Qt.Horizontal)
+        slider.setRange(0, self.width if axis == "x" else self.height)
+        edit = QLineEdit()
+        edit.setFixedWidth(60)
+
+        def update_from_slider(v):
+            pos = field.item.pos()
+            if axis == "x":
+                field.item.setPos(v, pos.y())
+            else:
+                field.item.setPos(pos.x(), v)
+            edit.setText(str(v))
+        slider.valueChanged.connect(update_from_slider)
+
+        def update_from_edit():
+            try:
+                slider.setValue(int(edit.text()))
+            except ValueError:
+                pass
+        edit.editingFinished.connect(update_from_edit)
+
+        row_widget = QWidget()
+        row_layout = QHBoxLayout()
+        row_layout.setContentsMargins(0, 0, 0, 0)
+        row_widget.setLayout(row_layout)
+        row_layout.addWidget(slider)
+        row_layout.addWidget(edit)
+        self.form_layout.addRow(QLabel(f"{field.label} {axis.upper()}"), row_widget)
+        return slider, edit
+
+    def bind(self, field, on_visible_changed):
+        """필드 하나에 대한 표시 체크박스와 X/Y 행을 추가합니다."""
+        visible_checkbox = QCheckBox(f"{field.label} 표시")
+        visible_checkbox.setChecked(field.visible)
+        visible_checkbox.toggled.connect(lambda checked: on_visible_changed(field, checked))
+        self.form_layout.addRow(visible_checkbox)
+        x_slider, x_edit = self._axis_row(field, "x")
+        y_slider, y_edit = self._axis_row(field, "y")
+        self.rows[field.key] = (x_slider, x_edit, y_slider, y_edit)
+        slot = lambda x, y, key=field.key: self.queue(key, x, y)
+        field.item.positionChanged.connect(slot)
+        self._connections.append((field.item, slot))
+        self.sync(field.key, field.item.pos().x(), field.item.pos().y())
+
+    def clear(self):
+        self._timer.stop()
+        self._pending.clear()
+        self.rows.clear()
+        for item, slot in self._connections:
+            item.positionChanged.disconnect(slot)
+        self._connections = []
+        while self.form_layout.rowCount() > 0:
+            self.form_layout.removeRow(0)
+
+    def set_position(self, key, x, y):
+        """슬라이더를 통해 아이템 위치를 지정합니다 (설정 불러오기용)."""
+        x_slider, _, y_slider, _ = self.rows[key]
+        x_slider.setValue(int(x))
+        y_slider.setValue(int(y))
+
+    def queue(self, key, x, y):
+        self._pending[key] = (x, y)
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def flush(self):
+        pending, self._pending = self._pending, {}
+        for key, (x, y) in pending.items():
+            self.sync(key, x, y)
+
+    def sync(self, key, x, y):
+        if key not in self.rows:
+            return
+        widgets = self.rows[key]
+        for widget in widgets:
+            widget.blockSignals(True)
+        x_slider, x_edit, y_slider, y_edit = widgets
+        x_slider.setValue(int(x))
+        y_slider.setValue(int(y))
+        x_edit.setText(str(int(x)))
+        y_edit.setText(str(int(y)))
+        for widget in widgets:
+            widget.blockSignals(False)
+
+class BadgeView(QGraphicsView):
+    """확대/축소·창 맞춤을 지원하는 편집 뷰 (드래그 중에는 저품질로 그림)"""
+    MIN_ZOOM = 0.1
+    MAX_ZOOM = 8.0
+    ZOOM_STEP = 1.15
+    QUALITY_HINTS = QPainter.Antialiasing | QPainter.TextAntialiasing | QPainter.SmoothPixmapTransform
+
+    def __init__(self, scene, parent=None):
+        super().__init__(scene, parent)
+        self.setRenderHints(self.QUALITY_HINTS)
+        self.setViewportUpdateMode(QGraphicsView.SmartViewportUpdate)
+        self.setOptimizationFlags(QGraphicsView.DontSavePainterState)
+        self.setCacheMode(QGraphicsView.CacheBackground)
+        self.setTransformationAnchor(QGraphicsView.AnchorUnderMouse)
+        self.setResizeAnchor(QGraphicsView.AnchorViewCenter)
+        self.setFrameShape(QGraphicsView.NoFrame)
+        self.setAlignment(Qt.AlignCenter)
+        self.fit_mode = True
+        self.dragging = False
+
+    def zoom_level(self):
+        return self.transform().m11()
+
+    def set_zoom(self, zoom):
+        zoom = max(self.MIN_ZOOM, min(self.MAX_ZOOM, zoom))
+        self.fit_mode = False
+        self.setTransform(QTransform.fromScale(zoom, zoom))
+
+    def zoom_in(self):
+        self.set_zoom(self.zoom_level() * self.ZOOM_STEP)
+
+    def zoom_out(self):
+        self.set_zoom(self.zoom_level() / self.ZOOM_STEP)
+
+    def fit_to_window(self):
+        self.fit_mode = True
+        self.fitInView(self.sceneRect(), Qt.KeepAspectRatio)
+
+    def wheelEvent(self, event):
+        if event.modifiers() & Qt.ControlModifier:
+            steps = event.angleDelta().y() / 120
+            self.set_zoom(self.zoom_level() * (self.ZOOM_STEP ** steps))
+            event.accept()
+        else:
+            super().wheelEvent(event)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        if self.fit_mode:
+            self.fitInView(self.sceneRect(), Qt.KeepAspectRatio)
+
+    # --- 드래그 중에는 안티앨리어싱/스무딩을 끄고 놓으면 원래 품질로 다시 그림 ---
+    def mousePressEvent(self, event):
+        item = self.itemAt(event.pos())
+        if event.button() == Qt.LeftButton and item is not None and item.flags() & QGraphicsItem.ItemIsMovable:
+            self.dragging = True
+            self.setRenderHints(QPainter.RenderHints())
+        super().mousePressEvent(event)
+
+    def mouseReleaseEvent(self, event):
+        super().mouseReleaseEvent(event)
+        if self.dragging:
+            self.dragging = False
+            self.setRenderHints(self.QUALITY_HINTS)
+            self.viewport().update()
+
+class BadgeRenderer:
+    """layout_profile()로 만든 화면 밖 씬. 편집 화면을 건드리지 않고 텍스트·QR 레이어를 그립니다."""
+    def __init__(self, profile, qr_cache):
+        self.profile = profile
+        self.layout_hash = content_hash(profile)
+        self._static_pictures = {}  # (DPI, 배경 이미지 포함 여부) -> QPicture
+        self._background_images = {}  # DPI -> QImage (출력 해상도로 줄인 배경)
+        self._source_image = None
+        width, height = profile["page"]
+        self.scene = QGraphicsScene()
+        self.scene.setSceneRect(0, 0, width, height)
+        self.text_items = []
+        for spec in profile["fields"]:
+            if not spec["visible"]:
+                continue
+            item = CenteredTextItem("")
+            item.setCacheMode(QGraphicsItem.NoCache)
+            font = QFont()
+            font.fromString(spec["font"])
+            item.setFont(font)
+            item.setDefaultTextColor(QColor(spec.get("color", "#000000")))
+            item.setRotation(spec.get("angle", 0))
+            self.scene.addItem(item)
+            self.text_items.append((spec["key"], spec["center"], item))
+        self.qr_item = None
+        if profile["qr"] is not None:
+            qr = profile["qr"]
+            self.qr_item = QrCodeItem(qr_cache, qr["template"], qr["module_size"])
+            self.qr_item.setCacheMode(QGraphicsItem.NoCache)
+            self.qr_item.setPos(*qr["center"])
+            self.scene.addItem(self.qr_item)
+
+    def set_record(self, record):
+        for key, center, item in self.text_items:
+            text = record.get(key, "")
+            if item.toPlainText() != text:
+                item.setPlainText(text)
+            # 중심 좌표를 편집 화면과 동일하게 맞춤
+            offset = item.mapToScene(item.boundingRect().center())
+            item.moveBy(center[0] - offset.x(), center[1] - offset.y())
+        if self.qr_item is not None:
+            self.qr_item.set_record(record)
+
+    def picture(self, record):
+        """레코드의 텍스트·QR 레이어를 씬 좌표 QPicture로 기록합니다."""
+        self.set_record(record)
+        picture = QPicture()
+        painter = QPainter(picture)
+        self.scene.render(painter, target=self.scene.sceneRect(), source=self.scene.sceneRect())
+        painter.end()
+        return picture
+
+    def record_hash(self, record):
+        """명찰에 실제로 찍히는 값(보이는 필드 + QR 내용)만으로 만든 레코드 해시"""
+        values = {spec["key"]: record.get(spec["key"], "")
+                  for spec in self.profile["fields"] if spec["visible"]}
+        if self.qr_item is not None:
+            values["__qr__"] = self.qr_item.payload_for(record)
+        return content_hash(values)
+
+    def static_picture(self, dpi=SCENE_DPI, include_image=True):
+        """용지·배경 이미지 레이어 (편집 화면과 같은 모양, 출력 DPI마다 한 번만 기록)
+
+        include_image=False면 배경 이미지 없이 용지만 그립니다 ("텍스트만 인쇄").
+        """
+        picture = self._static_pictures.get((dpi, include_image))
+        if picture is None:
+            width, height = self.profile["page"]
+            picture = QPicture()
+            painter = QPainter(picture)
+            painter.setPen(QPen(QColor("blue"), 3))
+            painter.setBrush(QColor("white"))
+            painter.drawRect(QRectF(0, 0, width, height))
+            image = self.profile["image"]
+            if include_image and image is not None and image["visible"] and image["path"]:
+                background = self.background_image(dpi)
+                if background is not None:
+                    painter.setOpacity(image.get("opacity", 1))
+                    x, y = image["pos"]
+                    image_width, image_height = image["size"]
+                    painter.drawImage(QRectF(x, y, image_width, image_height), background)
+            painter.end()
+            self._static_pictures[(dpi, include_image)] = picture
+        return picture
+
+    def background_image(self, dpi):
+        """배경 이미지를 출력 DPI의 장치 픽셀 크기로 미리 줄여 둔 것 (원본보다 키우지 않음)
+
+        프린터가 페이지마다 큰 원본을 다시 축소하지 않도록 DPI별로 한 번만 만듭니다.
+        """
+        if dpi in self._background_images:
+            return self._background_images[dpi]
+        image = self.profile["image"]
+        if self._source_image is None:
+            self._source_image = QImage(image["path"])
+        source = self._source_image
+        background = None
+        if not source.isNull():
+            scale = dpi / SCENE_DPI
+            width = min(source.width(), max(1, round(image["size"][0] * scale)))
+            height = min(source.height(), max(1, round(image["size"][1] * scale)))
+            background = source
+            if (width, height) != (source.width(), source.height()):
+                background = source.scaled(width, height, Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
+        self._background_images[dpi] = background
+        return background
+
+class FabricLayoutConverter:
+    """웹 편집기(fabric.js) 레이아웃 JSON을 layout_profile() 형식으로 바꿉니다.
+
+    namecards.canvas_json(캔버스 전체)과 text_object_snapshots 행(company_layout/
+    name_layout/title_layout 또는 full_state)을 모두 받습니다. 웹 캔버스 좌표(37.8px/cm)를
+    cm 기준으로 환산해 명찰 중심에 맞춰 A4 씬 좌표로 옮기며, 변환 결과는 입력 내용의
+    해시로 캐시합니다. 원격 배경 이미지는 변환 전에 download_image로 image_dir에 한 번만
+    내려받아 둡니다 (변환 중에는 네트워크를 쓰지 않음).
+    """
+    WEB_PX_PER_CM = 37.8
+    WEB_CANVAS_SIZE = (340, 472)  # CanvasEditor 기본 용지 9cm x 12.5cm
+    TEXT_TYPES = ("i-text", "text", "textbox")
+    # 'background'는 웹 편집기에서 가이드용(인쇄 제외) 이미지이므로 가져오지 않음
+    IMAGE_TYPES = ("image",)
+    SNAPSHOT_FIELDS = ("company", "name", "title")
+    ORIGIN_FACTORS = {"left": 0.0, "top": 0.0, "center": 0.5, "right": 1.0, "bottom": 1.0}
+
+    def __init__(self, page_size, badge_center, px_per_cm, image_dir, max_entries=256):
+        self.page_size = page_size
+        self.badge_center = badge_center
+        self.scale = px_per_cm / self.WEB_PX_PER_CM
+        self.image_dir = image_dir
+        self.max_entries = max_entries
+        self._profiles = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def convert(self, data, canvas_size=None):
+        """JSON(문자열 또는 dict)을 레이아웃 프로필로 변환합니다. 반환값은 읽기 전용으로 쓰세요."""
+        if isinstance(data, (str, bytes)):
+            data = json.loads(data)
+        canvas_size = list(canvas_size or self.WEB_CANVAS_SIZE)
+        key = content_hash({"source": data, "canvas": canvas_size})
+        profile = self._profiles.get(key)
+        if profile is not None:
+            self._profiles.move_to_end(key)
+            self.hits += 1
+            return profile
+        self.misses += 1
+        profile = self._build(self.fabric_objects(data), canvas_size)
+        if profile["image"] is None and self.remote_images(data):
+            return profile  # 배경 이미지를 못 받았으면 다음에 다시 받도록 캐시하지 않음
+        self._profiles[key] = profile
+        while len(self._profiles) > self.max_entries:
+            self._profiles.popitem(last=False)
+        return profile
+
+    def fabric_objects(self, data):
+        """canvas_json / 스냅샷 행에서 fabric 객체 목록을 꺼냅니다."""
+        if "objects" in data:
+            return data["objects"]
+        full_state = data.get("full_state")
+        if isinstance(full_state, str):
+            full_state = json.loads(full_state)
+        if isinstance(full_state, dict) and "objects" in full_state:
+            return full_state["objects"]
+        objects = []
+        for key in self.SNAPSHOT_FIELDS:
+            layout = data.get(f"{key}_layout")
+            if not layout and isinstance(full_state, dict):
+                layout = (full_state.get(key) or {}).get("layout")
+            if isinstance(layout, str):
+                layout = json.loads(layout)
+            if layout:
+                objects.append(dict(layout, type="i-text", dataField=key))
+        return objects
+
+    def _origin_factor(self, value):
+        if isinstance(value, (int, float)):
+            return float(value)
+        return self.ORIGIN_FACTORS.get(value, 0.0)
+
+    def _object_center(self, obj):
+        """left/top(원점 기준)과 크기·회전으로 객체 중심의 캔버스 좌표를 구합니다."""
+        width = (obj.get("width") or 0) * (obj.get("scaleX") or 1)
+        height = (obj.get("height") or 0) * (obj.get("scaleY") or 1)
+        dx = (0.5 - self._origin_factor(obj.get("originX", "left"))) * width
+        dy = (0.5 - self._origin_factor(obj.get("originY", "top"))) * height
+        angle = math.radians(obj.get("angle") or 0)
+        left, top = obj.get("left") or 0, obj.get("top") or 0
+        return (left + dx * math.cos(angle) - dy * math.sin(angle),
+                top + dx * math.sin(angle) + dy * math.cos(angle))
+
+    def _to_scene(self, point, canvas_size):
+        x, y = point
+        return [round(self.badge_center[0] + (x - canvas_size[0] / 2) * self.scale, 2),
+                round(self.badge_center[1] + (y - canvas_size[1] / 2) * self.scale, 2)]
+
+    def _text_spec(self, obj, canvas_size):
+        font = QFont(obj.get("fontFamily") or "Arial")
+        font_px = (obj.get("fontSize") or 20) * (obj.get("scaleY") or 1) * self.scale
+        font.setPixelSize(max(1, round(font_px)))
+        weight = str(obj.get("fontWeight") or "normal")
+        font.setBold(weight == "bold" or (weight.isdigit() and int(weight) >= 600))
+        fill = obj.get("fill")
+        color = QColor(fill) if isinstance(fill, str) else QColor("black")
         return {
-            "company": self.company_edit.text().strip(),
-            "name": self.name_edit.text().strip(),
-            "title": self.title_edit.text().strip()
+            "key": obj["dataField"],
+            "visible": obj.get("visible", True) is not False and (obj.get("opacity", 1) or 0) > 0,
+            "center": self._to_scene(self._object_center(obj), canvas_size),
+            "font": font.toString(),
+            "resolved_family": QFontInfo(font).family(),
+            "color": color.name() if color.isValid() else "#000000",
+            "angle": float(obj.get("angle") or 0),
         }
 
+    def _image_spec(self, obj, canvas_size):
+        path = self.resolve_image(obj.get("src") or "")
+        if path is None:
+            return None
+        width = (obj.get("width") or 0) * (obj.get("scaleX") or 1) * self.scale
+        height = (obj.get("height") or 0) * (obj.get("scaleY") or 1) * self.scale
+        center_x, center_y = self._to_scene(self._object_center(obj), canvas_size)
+        return {
+            "path": path,
+            "mtime": os.path.getmtime(path),
+            "pos": [round(center_x - width / 2, 2), round(center_y - height / 2, 2)],
+            "size": [int(round(width)), int(round(height))],
+            "visible": obj.get("visible", True) is not False,
+            "opacity": obj.get("opacity", 1),
+        }
+
+    def _build(self, objects, canvas_size):
+        fields = []
+        image = None
+        for obj in objects:
+            if obj.get("type") in self.TEXT_TYPES and obj.get("dataField"):
+                fields.append(self._text_spec(obj, canvas_size))
+            elif obj.get("type") in self.IMAGE_TYPES and image is None:
+                image = self._image_spec(obj, canvas_size)
+        return {"page": list(self.page_size), "fields": fields, "image": image, "qr": None}
+
+    def cached_image_path(self, src):
+        extension = ".png"
+        if not src.startswith("data:"):
+            extension = os.path.splitext(urllib.parse.urlparse(src).path)[1] or extension
+        return os.path.join(self.image_dir, hashlib.sha256(src.encode("utf-8")).hexdigest()[:32] + extension)
+
+    def _store_image(self, src, data):
+        path = self.cached_image_path(src)
+        os.makedirs(self.image_dir, exist_ok=True)
+        with open(path + ".tmp", "wb") as f:
+            f.write(data)
+        os.replace(path + ".tmp", path)
+        return path
+
+    def remote_images(self, data):
+        """변환 전에 내려받아야 하는(아직 image_dir에 없는) 이미지 URL 목록"""
+        if isinstance(data, (str, bytes)):
+            data = json.loads(data)
+        sources = []
+        for obj in self.fabric_objects(data):
+            src = obj.get("src") or ""
+            if (obj.get("type") in self.IMAGE_TYPES and src.startswith(("http://", "https://"))
+                    and not os.path.exists(self.cached_image_path(src))):
+                sources.append(src)
+        return sources
+
+    def download_image(self, src, timeout=10):
+        """URL을 image_dir에 내려받습니다 (Qt를 쓰지 않으므로 작업 스레드에서 호출 가능).
+        실패하면 None."""
+        try:
+            with urllib.request.urlopen(src, timeout=timeout) as response:
+                return self._store_image(src, response.read())
+        except (OSError, ValueError):
+            return None
+
+    def resolve_image(self, src):
+        """로컬 경로는 그대로, data URL은 풀어서, URL은 미리 받아 둔 파일 경로로 바꿉니다.
+
+        네트워크는 쓰지 않습니다. 받아 두지 않은 URL이면 None.
+        """
+        if src.startswith("file://"):
+            src = src[len("file://"):]
+        if os.path.exists(src):
+            return src
+        if not src.startswith(("http://", "https://", "data:")):
+            return None
+        path = self.cached_image_path(src)
+        if os.path.exists(path):
+            return path
+        if not src.startswith("data:"):
+            return None
+        try:
+            return self._store_image(src, base64.b64decode(src.partition(",")[2]))
+        except (OSError, ValueError):
+            return None
+
+class PrerenderPool(QObject):
+    """선택 주변 행·검색 결과의 명찰 레이어를 유휴 시간에 미리 렌더링해 두는 풀
+
+    Qt 씬은 GUI 스레드에서만 다룰 수 있으므로 QTimer(0)로 이벤트 루프가 한가할 때
+    한 장씩 렌더링합니다. 풀 크기는 capacity로 제한됩니다.
+    """
+    def __init__(self, window, capacity=64, parent=None):
+        super().__init__(parent)
+        self.window = window
+        self.capacity = capacity
+        self._ready = OrderedDict()  # (layout_hash, record_hash) -> (QPicture, 렌더링 ms)
+        self._queue = deque()
+        self._queued = set()
+        self.hits = 0
+        self.misses = 0
+        self.saved_ms = 0.0
+        self._timer = QTimer(self)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self._render_next)
+
+    def schedule(self, record_indices):
+        """우선순위 순서대로 렌더링 대기열 앞쪽에 넣습니다 (이전 요청보다 우선)."""
+        new_jobs = []
+        for index in record_indices:
+            if not (0 <= index < len(self.window.records)):
+                continue
+            record = self.window.records[index]
+            renderer = self.window.record_renderer(record)
+            key = (renderer.layout_hash, renderer.record_hash(record))
+            if key in self._ready or key in self._queued:
+                continue
+            new_jobs.append((key, index))
+        for job in reversed(new_jobs):
+            self._queue.appendleft(job)
+            self._queued.add(job[0])
+        # 대기열도 풀 크기 이상은 의미가 없으므로 오래된 요청은 버림
+        while len(self._queue) > self.capacity:
+            key, _ = self._queue.pop()
+            self._queued.discard(key)
+        if self._queue and not self._timer.isActive():
+            self._timer.start()
+
+    def _render_next(self):
+        if not self._queue:
+            self._timer.stop()
+            return
+        key, index = self._queue.popleft()
+        self._queued.discard(key)
+        if index >= len(self.window.records):
+            return
+        # 대기 중에 레이아웃·템플릿 규칙·레코드가 바뀌었으면 건너뜀
+        record = self.window.records[index]
+        renderer = self.window.record_renderer(record)
+        if (renderer.layout_hash, renderer.record_hash(record)) != key:
+            return
+        started = time.perf_counter()
+        picture = renderer.picture(record)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self._ready[key] = (picture, elapsed_ms)
+        while len(self._ready) > self.capacity:
+            self._ready.popitem(last=False)
+
+    def take(self, layout_hash, record_hash):
+        """미리 렌더링된 레이어를 꺼냅니다. 없으면 None."""
+        entry = self._ready.get((layout_hash, record_hash))
+        if entry is None:
+            self.misses += 1
+            return None
+        self._ready.move_to_end((layout_hash, record_hash))
+        self.hits += 1
+        self.saved_ms += entry[1]
+        return entry[0]
+
+    def clear(self):
+        self._ready.clear()
+        self._queue.clear()
+        self._queued.clear()
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "saved_ms": round(self.saved_ms, 1),
+            "ready": len(self._ready),
+            "queued": len(self._queue),
+        }
+
+class PrinterDevice:
+    """다중 프린터 출력에 쓰는 장치 한 대와 관측된 처리량"""
+    def __init__(self, name, printer, pdf_dir=None):
+        self.name = name
+        self.printer = printer
+        self.pdf_dir = pdf_dir
+        self.pages = 0
+        self.busy_seconds = 0.0
+        self.subjobs = 0
+        self.failed = False
+        self.error = None
+        self.current = None  # (시작 시각, 페이지 목록, 예상 소요 초)
+
+    def pages_per_minute(self):
+        if self.busy_seconds <= 0:
+            return None
+        return self.pages / self.busy_seconds * 60
+
+class PrintDispatcher:
+    """체크된 명찰을 여러 프린터(또는 PDF 테스트 장치)에 나눠 출력합니다.
+
+    장치마다 스레드가 공유 대기열에서 하위 작업을 가져가며, 하위 작업 크기는
+    관측된 분당 페이지 수에 비례합니다 (빠른 장치가 더 많이 가져감). 출력에 실패하거나
+    예상 시간보다 오래 멈춘 장치의 하위 작업은 대기열 앞으로 되돌려 다른 장치가
+    출력합니다. 멈춘 장치가 뒤늦게 끝나면 해당 페이지가 중복 출력될 수 있습니다.
+    QPainter는 QPrinter/QPicture에 한해 GUI 스레드 밖에서 쓸 수 있으므로 렌더링은
+    미리 GUI 스레드에서 QPicture로 끝내 두고, 스레드에서는 재생만 합니다.
+    """
+    FIRST_SUBJOB_PAGES = 4
+    MAX_SUBJOB_PAGES = 50
+    SUBJOB_TARGET_SECONDS = 20
+    STUCK_MIN_SECONDS = 60
+
+    def __init__(self, window, devices, pages):
+        self.window = window
+        self.devices = devices
+        self.pages = pages  # [(배경 레이어, 텍스트 레이어)]
+        self._pending = deque(range(len(pages)))
+        self._lock = threading.Lock()
+        self._threads = []
+        self.started = None
+
+    def start(self):
+        self.started = time.perf_counter()
+        for device in self.devices:
+            thread = threading.Thread(target=self._run_device, args=(device,), daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def subjob_size(self, device):
+        ppm = device.pages_per_minute()
+        if ppm is None:
+            return self.FIRST_SUBJOB_PAGES
+        size = round(ppm * self.SUBJOB_TARGET_SECONDS / 60)
+        return max(1, min(self.MAX_SUBJOB_PAGES, size))
+
+    def _take(self, device):
+        with self._lock:
+            if device.failed or not self._pending:
+                return None
+            count = min(self.subjob_size(device), len(self._pending))
+            pages = [self._pending.popleft() for _ in range(count)]
+            ppm = device.pages_per_minute()
+            expected = count / ppm * 60 if ppm else 0
+            device.current = (time.perf_counter(), pages, expected)
+            return pages
+
+    def _requeue(self, device, error):
+        """장치를 실패 처리하고 진행 중이던 하위 작업을 대기열 앞으로 되돌립니다."""
+        with self._lock:
+            if device.failed:
+                return
+            device.failed = True
+            device.error = error
+            if device.current is not None:
+                self._pending.extendleft(reversed(device.current[1]))
+                device.current = None
+
+    def _run_device(self, device):
+        while True:
+            pages = self._take(device)
+            if pages is None:
+                return
+            started = time.perf_counter()
+            try:
+                self._print_pages(device, pages)
+            except Exception as e:
+                self._requeue(device, str(e))
+                return
+            with self._lock:
+                if device.failed:  # 멈춤으로 판정돼 이미 재배정됨
+                    return
+                device.current = None
+                device.pages += len(pages)
+                device.busy_seconds += time.perf_counter() - started
+                device.subjobs += 1
+
+    def _print_pages(self, device, pages):
+        printer = device.printer
+        if device.pdf_dir is not None:
+            printer.setOutputFileName(os.path.join(
+                device.pdf_dir, f"{pages[0]:05d}-{device.name}.pdf"))
+        printer.setDocName(f"명찰 {pages[0] + 1}-{pages[-1] + 1}")
+        painter = QPainter()
+        if not painter.begin(printer):
+            raise RuntimeError("프린터를 열 수 없습니다.")
+        try:
+            for offset, page in enumerate(pages):
+                if offset and not printer.newPage():
+                    raise RuntimeError("페이지를 넘길 수 없습니다.")
+                static_picture, picture = self.pages[page]
+                page_rect = QRectF(printer.pageRect())
+                self.window.draw_scene_picture(painter, static_picture, page_rect)
+                self.window.draw_scene_picture(painter, picture, page_rect)
+        finally:
+            painter.end()
+        if printer.printerState() == QPrinter.Error:
+            raise RuntimeError("프린터 오류")
+
+    def check_stuck(self):
+        """예상 시간의 3배(최소 STUCK_MIN_SECONDS)를 넘긴 하위 작업을 재배정합니다."""
+        now = time.perf_counter()
+        for device in self.devices:
+            current = device.current
+            if current is None or device.failed:
+                continue
+            started, _, expected = current
+            if now - started > max(self.STUCK_MIN_SECONDS, expected * 3):
+                self._requeue(device, "응답 없음")
+
+    def finished(self):
+        with self._lock:
+            working = [d for d in self.devices if not d.failed and d.current is not None]
+            alive = [d for d in self.devices if not d.failed]
+            return not working and (not self._pending or not alive)
+
+    def remaining(self):
+        with self._lock:
+            return len(self._pending)
+
+    def report(self):
+        """장치별 처리량 (페이지, 분당 페이지, 하위 작업 수, 상태)"""
+        rows = []
+        for device in self.devices:
+            ppm = device.pages_per_minute()
+            rows.append({
+                "device": device.name,
+                "pages": device.pages,
+                "pages_per_minute": round(ppm, 1) if ppm else 0.0,
+                "subjobs": device.subjobs,
+                "status": f"실패: {device.error}" if device.failed else "정상",
+            })
+        return rows
+
 class MainWindow(QMainWindow):
+    webImagesReady = pyqtSignal(object, str)  # 웹 레이아웃 JSON, 템플릿 이름 (배경 이미지 받은 뒤)
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("명찰 출력 프로그램")
         self.resize(1000, 800)
 
-        # A4 용지 크기
+        # A4 용지 크기 (210 x 297mm, 씬 좌표 SCENE_DPI 기준)
         self.A4_WIDTH_PX = 1190
         self.A4_HEIGHT_PX = 1684
 
         # 명찰 실물 사이즈 (cm)
         badge_width_cm = 9
         badge_height_cm = 12
-        px_per_cm = 144 / 2.54
-        self.badge_width_px = badge_width_cm * px_per_cm
-        self.badge_height_px = badge_height_cm * px_per_cm
+        px_per_cm = cm_to_px(1)
+        self.badge_width_px = cm_to_px(badge_width_cm)
+        self.badge_height_px = cm_to_px(badge_height_cm)
         self.badge_left = (self.A4_WIDTH_PX - self.badge_width_px) / 2
         self.badge_top = (self.A4_HEIGHT_PX - self.badge_height_px) / 2
 
@@ -214,47 +1698,60 @@ class MainWindow(QMainWindow):
             QPen(QColor("blue"), 3), QColor("white"))
         self.container_item.setFlag(self.container_item.ItemIsMovable, False)
         self.container_item.setFlag(self.container_item.ItemIsSelectable, False)
+        self.container_item.setCacheMode(QGraphicsItem.DeviceCoordinateCache)
 
-        # 텍스트 아이템들
-        self.company_text = CenteredTextItem("", font_size=20)
-        self.company_text.setParentItem(self.container_item)
-        self.set_centered_pos(
-            self.company_text, 
-            self.badge_center_x(), 
-            self.badge_center_y(0.30)
-        )
-        self.name_text = CenteredTextItem("", font_size=24)
-        self.name_text.setParentItem(self.container_item)
-        self.set_centered_pos(
-            self.name_text, 
-            self.badge_center_x(), 
-            self.badge_center_y(0.50)
-        )
-        self.title_text = CenteredTextItem("", font_size=20)
-        self.title_text.setParentItem(self.container_item)
-        self.set_centered_pos(
-            self.title_text, 
-            self.badge_center_x(), 
-            self.badge_center_y(0.75)
-        )
-        for item in [self.company_text, self.name_text, self.title_text]:
-            font = item.font()
-            font.setFamily(self.custom_font_family)
-            item.setFont(font)
-        # --- 텍스트박스 드래그 이동 시 우측 좌표 UI 동기화 시그널 연결 ---
-        self.company_text.positionChanged.connect(self.sync_company_pos)
-        self.name_text.positionChanged.connect(self.sync_name_pos)
-        self.title_text.positionChanged.connect(self.sync_title_pos)
-
-        # View 생성
-        self.view = QGraphicsView(self.scene)
-        self.view.setFixedSize(int(self.A4_WIDTH_PX), int(self.A4_HEIGHT_PX))  # 씬과 동일하게 고정
-        self.view.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-        self.view.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-        self.view.setFrameShape(QGraphicsView.NoFrame)
-        self.view.setAlignment(Qt.AlignLeft | Qt.AlignTop)
+        # 텍스트 필드 (엑셀 컬럼에 따라 추가될 수 있음)
+        self.fields = []
+        for field in default_fields():
+            self.create_field_item(field)
+
+        # 참가자별 QR 코드 레이어 (기본은 숨김)
+        self.qr_cache = QrCodeCache()
+        self.qr_item = QrCodeItem(self.qr_cache)
+        self.qr_item.setParentItem(self.container_item)
+        self.qr_item.setPos(self.badge_center_x(), self.badge_center_y(0.88))
+        self.qr_item.setVisible(False)
+
+        # View 생성 (확대/축소 및 창 맞춤 지원)
+        self.view = BadgeView(self.scene)
         self.setCentralWidget(self.view)
         self.image_item = None
+        self.image_path = None
+
+        # 재출력용 렌더링 캐시 (레이아웃 해시 + 레코드 내용으로 키 생성)
+        self.render_cache = BadgeRenderCache(
+            os.path.join(os.path.expanduser("~"), ".namecard_maker", "render_cache"))
+        self._renderer = None        # 현재 레이아웃의 BadgeRenderer
+        self._layout_dirty = True    # 씬이 바뀌어 레이아웃 해시를 다시 확인해야 하는지
+        self._template_hashes = {}   # 템플릿 이름 -> (프로필, 해시)
+        self.output_profile = "screen"  # OUTPUT_PROFILES 키
+
+        # 참가자 분류별 템플릿(레이아웃 프로필)과 분류 컬럼 → 템플릿 규칙
+        self.templates_path = os.path.join(
+            os.path.expanduser("~"), ".namecard_maker", "templates.json")
+        self.templates = OrderedDict()
+        self.template_rule = {"column": None, "map": {}}
+        self._template_renderers = {}
+        self.load_templates()
+
+        # 웹 편집기(fabric.js) 레이아웃 변환기 (변환 결과는 내용 해시로 캐시)
+        self.fabric_converter = FabricLayoutConverter(
+            (self.A4_WIDTH_PX, self.A4_HEIGHT_PX),
+            (self.badge_center_x(), self.badge_center_y(0.5)), px_per_cm,
+            os.path.join(os.path.expanduser("~"), ".namecard_maker", "images"))
+        self.webImagesReady.connect(self.finish_web_layout_import)
+
+        # 체크인 키오스크용 사전 렌더링 풀 / 단건 출력 프린터
+        self.prerender_pool = PrerenderPool(self, parent=self)
+        self.kiosk_printer = None
+        self.label_backend = None  # 라벨 프린터(ZPL/ESC-POS) 출력기
+        self.label_target = ""
+
+        # 다중 프린터 출력 (진행 상황은 타이머로 확인)
+        self.dispatcher = None
+        self.dispatch_timer = QTimer(self)
+        self.dispatch_timer.setInterval(500)
+        self.dispatch_timer.timeout.connect(self.poll_dispatch)
 
         # 메인 도구막대
         self.main_toolbar = QToolBar("메인 메뉴")
@@ -278,6 +1775,16 @@ class MainWindow(QMainWindow):
             lambda state: setattr(self, 'print_text_only', state == Qt.Checked))
         self.main_toolbar.addWidget(self.text_only_checkbox)
         
+        self.qr_checkbox = QCheckBox("QR 표시")
+        self.qr_checkbox.setChecked(False)
+        self.qr_checkbox.stateChanged.connect(
+            lambda state: self.set_qr_visible(state == Qt.Checked))
+        self.main_toolbar.addWidget(self.qr_checkbox)
+
+        qr_template_action = QAction("QR 내용 설정", self)
+        qr_template_action.triggered.connect(self.edit_qr_template)
+        self.main_toolbar.addAction(qr_template_action)
+        
         self.group_checkbox = QCheckBox("그룹 이동")
         self.group_checkbox.setChecked(False)
         self.group_checkbox.stateChanged.connect(
@@ -288,6 +1795,58 @@ class MainWindow(QMainWindow):
         group_center_action.triggered.connect(self.center_group)
         self.main_toolbar.addAction(group_center_action)
         
+        fit_action = QAction("창에 맞춤", self)
+        fit_action.setShortcut("Ctrl+0")
+        fit_action.triggered.connect(self.view.fit_to_window)
+        self.main_toolbar.addAction(fit_action)
+
+        actual_size_action = QAction("100%", self)
+        actual_size_action.setShortcut("Ctrl+1")
+        actual_size_action.triggered.connect(lambda: self.view.set_zoom(1.0))
+        self.main_toolbar.addAction(actual_size_action)
+
+        zoom_in_action = QAction("확대", self)
+        zoom_in_action.setShortcut("Ctrl++")
+        zoom_in_action.triggered.connect(self.view.zoom_in)
+        self.main_toolbar.addAction(zoom_in_action)
+
+        zoom_out_action = QAction("축소", self)
+        zoom_out_action.setShortcut("Ctrl+-")
+        zoom_out_action.triggered.connect(self.view.zoom_out)
+        self.main_toolbar.addAction(zoom_out_action)
+
+        save_template_action = QAction("템플릿 저장", self)
+        save_template_action.triggered.connect(self.save_current_as_template)
+        self.main_toolbar.addAction(save_template_action)
+
+        edit_template_action = QAction("템플릿 편집", self)
+        edit_template_action.triggered.connect(self.load_template_into_editor)
+        self.main_toolbar.addAction(edit_template_action)
+
+        template_rule_action = QAction("템플릿 규칙", self)
+        template_rule_action.triggered.connect(self.edit_template_rule)
+        self.main_toolbar.addAction(template_rule_action)
+
+        import_web_action = QAction("웹 레이아웃 가져오기", self)
+        import_web_action.triggered.connect(self.import_web_layout)
+        self.main_toolbar.addAction(import_web_action)
+
+        clear_cache_action = QAction("출력 캐시 비우기", self)
+        clear_cache_action.triggered.connect(self.clear_render_cache)
+        self.main_toolbar.addAction(clear_cache_action)
+
+        self.output_profile_combo = QComboBox()
+        for name, profile in OUTPUT_PROFILES.items():
+            self.output_profile_combo.addItem(f"{profile['label']} ({profile['dpi']} DPI)", name)
+        self.output_profile_combo.setCurrentIndex(list(OUTPUT_PROFILES).index(self.output_profile))
+        self.output_profile_combo.currentIndexChanged.connect(
+            lambda i: self.set_output_profile(self.output_profile_combo.itemData(i)))
+        self.main_toolbar.addWidget(self.output_profile_combo)
+
+        compare_profiles_action = QAction("출력 품질 비교", self)
+        compare_profiles_action.triggered.connect(self.compare_output_profiles)
+        self.main_toolbar.addAction(compare_profiles_action)
+
         preview_action = QAction("미리보기", self)
         preview_action.triggered.connect(self.preview)
         self.main_toolbar.addAction(preview_action)
@@ -295,6 +1854,19 @@ class MainWindow(QMainWindow):
         print_action = QAction("프린트", self)
         print_action.triggered.connect(self.print_)
         self.main_toolbar.addAction(print_action)
+
+        print_multi_action = QAction("다중 프린터 출력", self)
+        print_multi_action.triggered.connect(self.print_multi)
+        self.main_toolbar.addAction(print_multi_action)
+
+        label_print_action = QAction("라벨 프린터 출력", self)
+        label_print_action.triggered.connect(self.print_labels)
+        self.main_toolbar.addAction(label_print_action)
+
+        print_current_action = QAction("선택 명찰 바로 출력", self)
+        print_current_action.setShortcut("Ctrl+Shift+P")
+        print_current_action.triggered.connect(self.print_current)
+        self.main_toolbar.addAction(print_current_action)
         
         export_settings_action = QAction("설정 내보내기", self)
         export_settings_action.triggered.connect(self.export_settings)
@@ -315,11 +1887,15 @@ class MainWindow(QMainWindow):
         # 명단 관련 위젯 (Dock)
         self.list_widget = QListWidget()
         self.list_widget.currentRowChanged.connect(self.on_list_currentRowChanged)
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("이름/회사명 검색")
+        self.search_edit.textChanged.connect(self.filter_records)
         self.select_all_checkbox = QCheckBox("전체 선택")
         self.select_all_checkbox.stateChanged.connect(self.select_all_items)
         list_container = QWidget()
         list_layout = QVBoxLayout()
         list_container.setLayout(list_layout)
+        list_layout.addWidget(self.search_edit)
         list_layout.addWidget(self.select_all_checkbox)
         list_layout.addWidget(self.list_widget)
         self.list_dock = QDockWidget("명단", self)
@@ -327,158 +1903,86 @@ class MainWindow(QMainWindow):
         self.list_dock.setWidget(list_container)
         self.addDockWidget(Qt.LeftDockWidgetArea, self.list_dock)
 
-        # --- 텍스트 위치 조정 슬라이더 + 입력창 추가 ---
+        # --- 텍스트 위치 조정 슬라이더 + 입력창 (필드별로 자동 생성) ---
         self.slider_group = QGroupBox("텍스트 위치 조정")
         slider_layout = QFormLayout()
-        # 회사명 X
-        self.company_x_slider = QSlider(Qt.Horizontal)
-        self.company_x_slider.setRange(0, int(self.A4_WIDTH_PX))
-        self.company_x_slider.setValue(int(self.company_text.pos().x()))
-        self.company_x_edit = QLineEdit(str(int(self.company_text.pos().x())))
-        self.company_x_edit.setFixedWidth(60)
-        def update_company_x_from_slider(v):
-            self.company_text.setPos(v, self.company_text.pos().y())
-            self.company_x_edit.setText(str(v))
-        self.company_x_slider.valueChanged.connect(update_company_x_from_slider)
-        def update_company_x_from_edit():
-            try:
-                v = int(self.company_x_edit.text())
-                self.company_x_slider.setValue(v)
-            except ValueError:
-                pass
-        self.company_x_edit.editingFinished.connect(update_company_x_from_edit)
-        row_widget = QWidget()
-        row_layout = QHBoxLayout()
-        row_layout.setContentsMargins(0, 0, 0, 0)
-        row_widget.setLayout(row_layout)
-        row_layout.addWidget(self.company_x_slider)
-        row_layout.addWidget(self.company_x_edit)
-        slider_layout.addRow(QLabel("회사명 X"), row_widget)
-        # 회사명 Y
-        self.company_y_slider = QSlider(Qt.Horizontal)
-        self.company_y_slider.setRange(0, int(self.A4_HEIGHT_PX))
-        self.company_y_slider.setValue(int(self.company_text.pos().y()))
-        self.company_y_edit = QLineEdit(str(int(self.company_text.pos().y())))
-        self.company_y_edit.setFixedWidth(60)
-        def update_company_y_from_slider(v):
-            self.company_text.setPos(self.company_text.pos().x(), v)
-            self.company_y_edit.setText(str(v))
-        self.company_y_slider.valueChanged.connect(update_company_y_from_slider)
-        def update_company_y_from_edit():
-            try:
-                v = int(self.company_y_edit.text())
-                self.company_y_slider.setValue(v)
-            except ValueError:
-                pass
-        self.company_y_edit.editingFinished.connect(update_company_y_from_edit)
-        row_widget_y = QWidget()
-        row_layout_y = QHBoxLayout()
-        row_layout_y.setContentsMargins(0, 0, 0, 0)
-        row_widget_y.setLayout(row_layout_y)
-        row_layout_y.addWidget(self.company_y_slider)
-        row_layout_y.addWidget(self.company_y_edit)
-        slider_layout.addRow(QLabel("회사명 Y"), row_widget_y)
-        # 이름 X
-        self.name_x_slider = QSlider(Qt.Horizontal)
-        self.name_x_slider.setRange(0, int(self.A4_WIDTH_PX))
-        self.name_x_slider.setValue(int(self.name_text.pos().x()))
-        self.name_x_edit = QLineEdit(str(int(self.name_text.pos().x())))
-        self.name_x_edit.setFixedWidth(60)
-        def update_name_x_from_slider(v):
-            self.name_text.setPos(v, self.name_text.pos().y())
-            self.name_x_edit.setText(str(v))
-        self.name_x_slider.valueChanged.connect(update_name_x_from_slider)
-        def update_name_x_from_edit():
-            try:
-                v = int(self.name_x_edit.text())
-                self.name_x_slider.setValue(v)
-            except ValueError:
-                pass
-        self.name_x_edit.editingFinished.connect(update_name_x_from_edit)
-        row_widget_nx = QWidget()
-        row_layout_nx = QHBoxLayout()
-        row_layout_nx.setContentsMargins(0, 0, 0, 0)
-        row_widget_nx.setLayout(row_layout_nx)
-        row_layout_nx.addWidget(self.name_x_slider)
-        row_layout_nx.addWidget(self.name_x_edit)
-        slider_layout.addRow(QLabel("이름 X"), row_widget_nx)
-        # 이름 Y
-        self.name_y_slider = QSlider(Qt.Horizontal)
-        self.name_y_slider.setRange(0, int(self.A4_HEIGHT_PX))
-        self.name_y_slider.setValue(int(self.name_text.pos().y()))
-        self.name_y_edit = QLineEdit(str(int(self.name_text.pos().y())))
-        self.name_y_edit.setFixedWidth(60)
-        def update_name_y_from_slider(v):
-            self.name_text.setPos(self.name_text.pos().x(), v)
-            self.name_y_edit.setText(str(v))
-        self.name_y_slider.valueChanged.connect(update_name_y_from_slider)
-        def update_name_y_from_edit():
-            try:
-                v = int(self.name_y_edit.text())
-                self.name_y_slider.setValue(v)
-            except ValueError:
-                pass
-        self.name_y_edit.editingFinished.connect(update_name_y_from_edit)
-        row_widget_ny = QWidget()
-        row_layout_ny = QHBoxLayout()
-        row_layout_ny.setContentsMargins(0, 0, 0, 0)
-        row_widget_ny.setLayout(row_layout_ny)
-        row_layout_ny.addWidget(self.name_y_slider)
-        row_layout_ny.addWidget(self.name_y_edit)
-        slider_layout.addRow(QLabel("이름 Y"), row_widget_ny)
-        # 직급 X
-        self.title_x_slider = QSlider(Qt.Horizontal)
-        self.title_x_slider.setRange(0, int(self.A4_WIDTH_PX))
-        self.title_x_slider.setValue(int(self.title_text.pos().x()))
-        self.title_x_edit = QLineEdit(str(int(self.title_text.pos().x())))
-        self.title_x_edit.setFixedWidth(60)
-        def update_title_x_from_slider(v):
-            self.title_text.setPos(v, self.title_text.pos().y())
-            self.title_x_edit.setText(str(v))
-        self.title_x_slider.valueChanged.connect(update_title_x_from_slider)
-        def update_title_x_from_edit():
-            try:
-                v = int(self.title_x_edit.text())
-                self.title_x_slider.setValue(v)
-            except ValueError:
-                pass
-        self.title_x_edit.editingFinished.connect(update_title_x_from_edit)
-        row_widget_tx = QWidget()
-        row_layout_tx = QHBoxLayout()
-        row_layout_tx.setContentsMargins(0, 0, 0, 0)
-        row_widget_tx.setLayout(row_layout_tx)
-        row_layout_tx.addWidget(self.title_x_slider)
-        row_layout_tx.addWidget(self.title_x_edit)
-        slider_layout.addRow(QLabel("직급 X"), row_widget_tx)
-        # 직급 Y
-        self.title_y_slider = QSlider(Qt.Horizontal)
-        self.title_y_slider.setRange(0, int(self.A4_HEIGHT_PX))
-        self.title_y_slider.setValue(int(self.title_text.pos().y()))
-        self.title_y_edit = QLineEdit(str(int(self.title_text.pos().y())))
-        self.title_y_edit.setFixedWidth(60)
-        def update_title_y_from_slider(v):
-            self.title_text.setPos(self.title_text.pos().x(), v)
-            self.title_y_edit.setText(str(v))
-        self.title_y_slider.valueChanged.connect(update_title_y_from_slider)
-        def update_title_y_from_edit():
-            try:
-                v = int(self.title_y_edit.text())
-                self.title_y_slider.setValue(v)
-            except ValueError:
-                pass
-        self.title_y_edit.editingFinished.connect(update_title_y_from_edit)
-        row_widget_ty = QWidget()
-        row_layout_ty = QHBoxLayout()
-        row_layout_ty.setContentsMargins(0, 0, 0, 0)
-        row_widget_ty.setLayout(row_layout_ty)
-        row_layout_ty.addWidget(self.title_y_slider)
-        row_layout_ty.addWidget(self.title_y_edit)
-        slider_layout.addRow(QLabel("직급 Y"), row_widget_ty)
+        self.position_binder = PositionBinder(
+            slider_layout, self.A4_WIDTH_PX, self.A4_HEIGHT_PX, self)
+        self.rebuild_field_panel()
         self.slider_group.setLayout(slider_layout)
         self.slider_dock = QDockWidget("텍스트 위치", self)
         self.slider_dock.setWidget(self.slider_group)
         self.addDockWidget(Qt.RightDockWidgetArea, self.slider_dock)
 
+        # --- 명찰 한눈에 보기 (전체 명단 축소 이미지, 기본은 숨김) ---
+        self.sheet_thumbnailer = BadgeThumbnailer(self, max_bytes=32 * 1024 * 1024, parent=self)
+        self.sheet_model = BadgePageModel(self, [], self)
+        self.sheet_delegate = BadgePageDelegate(
+            self.sheet_thumbnailer, (self.A4_WIDTH_PX, self.A4_HEIGHT_PX),
+            low_width=48, page_width=110, parent=self)
+        self.sheet_thumbnailer.thumbnailReady.connect(
+            lambda record_index, width: self.sheet_model.record_updated(record_index, width))
+        self.sheet_view = QListView()
+        self.sheet_view.setViewMode(QListView.IconMode)
+        self.sheet_view.setResizeMode(QListView.Adjust)
+        self.sheet_view.setMovement(QListView.Static)
+        self.sheet_view.setUniformItemSizes(True)
+        self.sheet_view.setModel(self.sheet_model)
+        self.sheet_view.setItemDelegate(self.sheet_delegate)
+        self.sheet_view.clicked.connect(
+            lambda index: self.list_widget.setCurrentRow(index.data(Qt.UserRole)))
+        self.sheet_dock = QDockWidget("명찰 한눈에 보기", self)
+        self.sheet_dock.setWidget(self.sheet_view)
+        self.addDockWidget(Qt.BottomDockWidgetArea, self.sheet_dock)
+        self.sheet_dock.hide()
+        self.main_toolbar.addAction(self.sheet_dock.toggleViewAction())
+
+        # 성능 측정 패널 (운영자 화면에는 숨기고 Ctrl+Shift+D로만 엶)
+        self.profiler_dock = QDockWidget("성능 측정", self)
+        self.profiler_dock.setWidget(ProfilerPanel())
+        self.addDockWidget(Qt.RightDockWidgetArea, self.profiler_dock)
+        self.profiler_dock.hide()
+        profiler_action = self.profiler_dock.toggleViewAction()
+        profiler_action.setShortcut("Ctrl+Shift+D")
+        self.addAction(profiler_action)
+
+        # 레이아웃·명단 변경은 모아서 한 번에 반영 (드래그 중에는 다시 그리지 않음)
+        self._sheet_signature = None
+        self._sheet_records_dirty = True
+        self.sheet_refresh_timer = QTimer(self)
+        self.sheet_refresh_timer.setSingleShot(True)
+        self.sheet_refresh_timer.setInterval(300)
+        self.sheet_refresh_timer.timeout.connect(self.refresh_contact_sheet)
+        self.scene.changed.connect(lambda _: self.sheet_refresh_timer.start())
+        self.scene.changed.connect(self.invalidate_layout)
+        self.sheet_dock.visibilityChanged.connect(lambda _: self.sheet_refresh_timer.start())
+        list_model = self.list_widget.model()
+        for signal in (list_model.rowsInserted, list_model.rowsRemoved,
+                       list_model.modelReset, list_model.dataChanged):
+            signal.connect(self.mark_sheet_records_dirty)
+
+    def mark_sheet_records_dirty(self, *args):
+        self._sheet_records_dirty = True
+        self.sheet_refresh_timer.start()
+
+    def refresh_contact_sheet(self):
+        """레이아웃·템플릿·명단이 바뀌었으면 축소 이미지를 무효화합니다 (보일 때만)."""
+        if not self.sheet_dock.isVisible():
+            return
+        signature = content_hash([self.cached_layout_hashes(), self.template_rule])
+        if signature == self._sheet_signature and not self._sheet_records_dirty:
+            return
+        if self.sheet_model.rowCount() != len(self.records):
+            old_model = self.sheet_model
+            self.sheet_model = BadgePageModel(self, list(range(len(self.records))), self)
+            self.sheet_view.setModel(self.sheet_model)
+            old_model.deleteLater()
+        self._sheet_signature = signature
+        self._sheet_records_dirty = False
+        # 캐시 이미지는 해시 키라서 그대로 두고, 레코드별 키만 다시 계산
+        self.sheet_thumbnailer.reset_layout()
+        self.sheet_view.viewport().update()
+
     def badge_center_x(self):
         """명찰의 X축 중심 좌표를 반환합니다."""
         return self.badge_left + self.badge_width_px / 2
@@ -495,13 +1999,462 @@ class MainWindow(QMainWindow):
             center_y - br.center().y()
         )
 
+    @contextmanager
+    def uncached_rendering(self):
+        """인쇄 시 화면용 비트맵 캐시를 끄고 원본 해상도로 렌더링합니다."""
+        items = [item for item in self.scene.items()
+                 if item.cacheMode() != QGraphicsItem.NoCache]
+        for item in items:
+            item.setCacheMode(QGraphicsItem.NoCache)
+        try:
+            yield
+        finally:
+            for item in items:
+                item.setCacheMode(QGraphicsItem.DeviceCoordinateCache)
+
+    def create_field_item(self, field):
+        """필드 정의에 맞는 텍스트 아이템을 만들어 명찰 위에 배치합니다."""
+        item = CenteredTextItem("", font_size=field.font_size)
+        item.setParentItem(self.container_item)
+        self.set_centered_pos(item, self.badge_center_x(), self.badge_center_y(field.ratio))
+        font = item.font()
+        font.setFamily(self.custom_font_family)
+        item.setFont(font)
+        item.setVisible(field.visible)
+        field.item = item
+        self.fields.append(field)
+        return field
+
+    def field_by_key(self, key):
+        for field in self.fields:
+            if field.key == key:
+                return field
+        return None
+
+    def text_items(self):
+        return [field.item for field in self.fields]
+
+    def rebuild_field_panel(self):
+        """필드 목록에 맞춰 우측 위치 조정 패널을 다시 만듭니다."""
+        self.position_binder.clear()
+        for field in self.fields:
+            self.position_binder.bind(field, self.set_field_visible)
+
+    def set_field_visible(self, field, visible):
+        field.visible = visible
+        field.item.setVisible(visible)
+        self.invalidate_layout()
+        if visible:
+            self.update_name_tag()
+        if self.group_mode:
+            self.update_grouping(True)
+
+    def sync_fields_with_columns(self, columns):
+        """엑셀 컬럼 중 아직 필드가 없는 컬럼을 숨김 필드로 추가합니다."""
+        known_columns = {field.column for field in self.fields}
+        added = False
+        for column in columns:
+            if column in known_columns:
+                continue
+            self.create_field_item(
+                BadgeField(column, column, column, font_size=16, ratio=0.90, visible=False))
+            added = True
+        if added:
+            self.invalidate_layout()
+            self.rebuild_field_panel()
+
+    def record_label(self, record):
+        return f"{record.get('company', '')} - {record.get('name', '')}"
+
+    QR_PREFETCH_CHUNK = 256  # QrCodeCache 용량보다 작아야 함
+
+    def item_center(self, item):
+        """아이템 중심의 씬 좌표 (텍스트가 바뀌어도 유지되는 기준점)"""
+        center = item.mapToScene(item.boundingRect().center())
+        return [round(center.x(), 2), round(center.y(), 2)]
+
+    def layout_profile(self):
+        """필드 배치·폰트·배경 이미지·QR 설정의 스냅샷 (레코드 내용은 제외)"""
+        fields = []
+        for field in self.fields:
+            font = field.item.font()
+            fields.append({
+                "key": field.key,
+                "visible": field.visible,
+                "center": self.item_center(field.item),
+                "font": font.toString(),
+                "resolved_family": QFontInfo(font).family(),
+                "color": field.item.defaultTextColor().name(),
+                "angle": field.item.rotation(),
+            })
+        image = None
+        if self.image_item is not None:
+            pos = self.image_item.scenePos()
+            image = {
+                "path": self.image_path,
+                "mtime": os.path.getmtime(self.image_path) if self.image_path and os.path.exists(self.image_path) else None,
+                "pos": [round(pos.x(), 2), round(pos.y(), 2)],
+                "size": [self.image_item.pixmap().width(), self.image_item.pixmap().height()],
+                "visible": self.image_item.isVisible(),
+                "opacity": self.image_item.opacity(),
+            }
+        qr = None
+        if self.qr_item.isVisible():
+            qr = {
+                "template": self.qr_item.template,
+                "module_size": self.qr_item.module_size,
+                "center": self.item_center(self.qr_item),
+            }
+        return {
+            "page": [self.A4_WIDTH_PX, self.A4_HEIGHT_PX],
+            "fields": fields,
+            "image": image,
+            "qr": qr,
+        }
+
+    def layout_hash(self):
+        return self.badge_renderer().layout_hash
+
+    def invalidate_layout(self, *args):
+        """레이아웃이 바뀌었을 수 있음을 표시 (다음 렌더러 조회 때 한 번만 다시 해시)
+
+        씬 변경 신호(비동기)와, 이벤트 루프를 거치지 않고 바로 출력할 수 있는 변경 메서드에서
+        호출합니다.
+        """
+        self._layout_dirty = True
+
+    @contextmanager
+    def layer_visibility(self, dynamic):
+        """dynamic=True면 텍스트·QR만, False면 용지·배경 이미지만 그려지도록 잠시 바꿉니다."""
+        dynamic_items = self.text_items() + [self.qr_item]
+        visible_states = [(item, item.isVisible()) for item in dynamic_items]
+        pen, brush = self.container_item.pen(), self.container_item.brush()
+        image_visible = self.image_item.isVisible() if self.image_item is not None else None
+        if dynamic:
+            self.container_item.setPen(QPen(Qt.NoPen))
+            self.container_item.setBrush(Qt.NoBrush)
+            if self.image_item is not None:
+                self.image_item.setVisible(False)
+        else:
+            for item in dynamic_items:
+                item.setVisible(False)
+        try:
+            yield
+        finally:
+            self.container_item.setPen(pen)
+            self.container_item.setBrush(brush)
+            for item, visible in visible_states:
+                item.setVisible(visible)
+            if image_visible is not None:
+                self.image_item.setVisible(image_visible)
+
+    def record_layer_picture(self, dynamic):
+        """현재 씬의 한 레이어를 씬 좌표 그대로 QPicture에 기록합니다."""
+        picture = QPicture()
+        painter = QPainter(picture)
+        with self.layer_visibility(dynamic):
+            self.scene.render(painter, target=self.scene.sceneRect(), source=self.scene.sceneRect())
+        painter.end()
+        return picture
+
+    def draw_scene_picture(self, painter, picture, target):
+        """씬 좌표로 기록된 QPicture를 scene.render와 같은 비율(KeepAspectRatio)로 그립니다."""
+        scale = min(target.width() / self.A4_WIDTH_PX, target.height() / self.A4_HEIGHT_PX)
+        painter.save()
+        painter.translate(
+            target.left() + (target.width() - self.A4_WIDTH_PX * scale) / 2,
+            target.top() + (target.height() - self.A4_HEIGHT_PX * scale) / 2)
+        painter.scale(scale, scale)
+        painter.drawPicture(0, 0, picture)
+        painter.restore()
+
+    def badge_renderer(self):
+        """현재 레이아웃의 화면 밖 렌더러 (레이아웃이 바뀌면 새로 만듦)
+
+        레이아웃 프로필과 해시는 invalidate_layout() 뒤 처음 조회할 때만 다시 계산합니다.
+        """
+        if self._renderer is None or self._layout_dirty:
+            profile = self.layout_profile()
+            if self._renderer is None or self._renderer.layout_hash != content_hash(profile):
+                self._renderer = BadgeRenderer(profile, self.qr_cache)
+            self._layout_dirty = False
+        return self._renderer
+
+    def output_dpi(self):
+        return OUTPUT_PROFILES[self.output_profile]["dpi"]
+
+    def set_output_profile(self, name):
+        self.output_profile = name
+        self.statusBar().showMessage(
+            f"출력 품질: {OUTPUT_PROFILES[name]['label']} ({OUTPUT_PROFILES[name]['dpi']} DPI)")
+
+    def load_templates(self):
+        """저장된 템플릿과 선택 규칙을 읽습니다 (없거나 깨진 파일은 무시)."""
+        try:
+            with open(self.templates_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        self.templates = OrderedDict(data.get("templates", {}))
+        self.template_rule = data.get("rule", self.template_rule)
+        self._template_renderers.clear()
+
+    def save_templates(self):
+        os.makedirs(os.path.dirname(self.templates_path), exist_ok=True)
+        with open(self.templates_path, "w", encoding="utf-8") as f:
+            json.dump({"templates": self.templates, "rule": self.template_rule},
+                      f, ensure_ascii=False, indent=2)
+
+    def save_current_as_template(self):
+        name, ok = QInputDialog.getText(self, "템플릿 저장", "템플릿 이름 (예: VIP, 연사, 스태프):")
+        name = name.strip()
+        if not ok or not name:
+            return
+        self.templates[name] = self.layout_profile()
+        self._template_renderers.pop(name, None)
+        self.save_templates()
+        self.statusBar().showMessage(f"현재 레이아웃을 '{name}' 템플릿으로 저장했습니다.")
+
+    def edit_template_rule(self):
+        """분류 컬럼 값 → 템플릿 이름 규칙을 설정합니다. 규칙에 없는 값은 현재 레이아웃으로 출력."""
+        if not self.templates:
+            QMessageBox.warning(self, "오류", "먼저 '템플릿 저장'으로 템플릿을 만들어주세요.")
+            return
+        columns = ["(사용 안 함)"] + [field.key for field in self.fields]
+        current = self.template_rule.get("column")
+        column, ok = QInputDialog.getItem(
+            self, "템플릿 규칙", "분류 기준 컬럼:", columns,
+            columns.index(current) if current in columns else 0, False)
+        if not ok:
+            return
+        if column == columns[0]:
+            self.template_rule = {"column": None, "map": {}}
+            self.save_templates()
+            return
+        lines = "\n".join(f"{value}={name}" for value, name in self.template_rule.get("map", {}).items())
+        text, ok = QInputDialog.getMultiLineText(
+            self, "템플릿 규칙",
+            f"'{column}' 값=템플릿 (한 줄에 하나)\n템플릿: {', '.join(self.templates)}", lines)
+        if not ok:
+            return
+        mapping = {}
+        for line in text.splitlines():
+            value, sep, name = line.partition("=")
+            if not sep:
+                continue
+            if name.strip() not in self.templates:
+                QMessageBox.warning(self, "오류", f"'{name.strip()}' 템플릿이 없습니다.")
+                return
+            mapping[value.strip()] = name.strip()
+        self.template_rule = {"column": column, "map": mapping}
+        self.save_templates()
+
+    def load_template_into_editor(self):
+        if not self.templates:
+            QMessageBox.warning(self, "오류", "저장된 템플릿이 없습니다.")
+            return
+        name, ok = QInputDialog.getItem(self, "템플릿 편집", "편집할 템플릿:", list(self.templates), 0, False)
+        if ok:
+            self.apply_layout_profile(self.templates[name])
+
+    def import_web_layout(self):
+        """웹 편집기에서 내보낸 canvas_json / 텍스트 스냅샷 JSON을 템플릿으로 가져옵니다."""
+        fileName, _ = QFileDialog.getOpenFileName(
+            self, "웹 레이아웃 가져오기", "", "JSON Files (*.json);;All Files (*)")
+        if not fileName:
+            return
+        name, ok = QInputDialog.getText(
+            self, "웹 레이아웃 가져오기", "템플릿 이름:",
+            text=os.path.splitext(os.path.basename(fileName))[0])
+        if not ok or not name.strip():
+            return
+        try:
+            data = self.read_web_layout_file(fileName)
+            sources = self.fabric_converter.remote_images(data)
+        except Exception as e:
+            QMessageBox.critical(self, "오류", f"웹 레이아웃 변환 오류:\n{str(e)}")
+            return
+        if not sources:
+            self.finish_web_layout_import(data, name.strip())
+            return
+
+        # 원격 배경 이미지는 작업 스레드에서 받고, 변환·적용은 신호로 GUI 스레드에서
+        self.statusBar().showMessage(f"웹 레이아웃 배경 이미지 {len(sources)}개 내려받는 중...")
+
+        def work():
+            for src in sources:
+                self.fabric_converter.download_image(src)
+            try:
+                self.webImagesReady.emit(data, name.strip())
+            except RuntimeError:  # 창이 닫혀 이미 삭제됨
+                pass
+        threading.Thread(target=work, daemon=True).start()
+
+    def finish_web_layout_import(self, data, name):
+        try:
+            self.import_web_layout_data(data, name)
+        except Exception as e:
+            QMessageBox.critical(self, "오류", f"웹 레이아웃 변환 오류:\n{str(e)}")
+            return
+        self.statusBar().showMessage(f"웹 레이아웃을 '{name}' 템플릿으로 가져왔습니다.")
+
+    def read_web_layout_file(self, fileName):
+        """JSON 파일에서 변환할 레이아웃을 꺼냅니다.
+
+        Supabase에서 내보낸 행 목록이면 첫 행을 씁니다. 행에 canvas_json이 있으면 그것을 씁니다.
+        """
+        with open(fileName, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if isinstance(data, list):
+            data = data[0]
+        if "canvas_json" in data:
+            data = data["canvas_json"]
+        return data
+
+    def import_web_layout_data(self, data, name):
+        """레이아웃을 변환해 템플릿으로 저장하고 편집 화면에 적용합니다.
+
+        원격 배경 이미지는 미리 받아 두어야 합니다 (FabricLayoutConverter.remote_images).
+        """
+        profile = self.fabric_converter.convert(data)
+        self.templates[name] = profile
+        self._template_renderers.pop(name, None)
+        self.save_templates()
+        self.apply_layout_profile(profile)
+        return profile
+
+    def apply_layout_profile(self, profile):
+        """layout_profile() 형식의 레이아웃을 편집 화면에 적용합니다."""
+        for spec in profile["fields"]:
+            field = self.field_by_key(spec["key"])
+            if field is None:
+                field = self.create_field_item(BadgeField(spec["key"], spec["key"], visible=spec["visible"]))
+            font = QFont()
+            font.fromString(spec["font"])
+            field.item.setFont(font)
+            field.item.setDefaultTextColor(QColor(spec.get("color", "#000000")))
+            field.item.setRotation(spec.get("angle", 0))
+            field.visible = spec["visible"]
+            field.item.setVisible(spec["visible"])
+        image = profile["image"]
+        if image is not None and image["path"] and os.path.exists(image["path"]):
+            self.load_image_file(image["path"])
+            width, height = image["size"]
+            if (self.image_item.pixmap().width(), self.image_item.pixmap().height()) != (width, height):
+                self.image_item.setPixmap(self.image_item.original_pixmap.scaled(
+                    width, height, Qt.IgnoreAspectRatio, Qt.SmoothTransformation))
+            self.image_item.setPos(*image["pos"])
+            self.image_item.setOpacity(image.get("opacity", 1))
+            self.image_item.setVisible(image["visible"])
+        qr = profile["qr"]
+        if qr is not None:
+            self.qr_item.template = qr["template"]
+            self.qr_item.module_size = qr["module_size"]
+            self.qr_item.payload = None
+        self.qr_checkbox.setChecked(qr is not None)
+        self.update_name_tag()
+        # 텍스트가 채워진 뒤 중심 좌표로 배치
+        for spec in profile["fields"]:
+            self.set_centered_pos(self.field_by_key(spec["key"]).item, *spec["center"])
+        if qr is not None:
+            self.set_centered_pos(self.qr_item, *qr["center"])
+        self.rebuild_field_panel()
+        self.invalidate_layout()
+        if self.group_mode:
+            self.update_grouping(True)
+
+    def template_for(self, record):
+        """레코드에 적용할 템플릿 이름 (규칙에 없으면 None = 현재 레이아웃)"""
+        column = self.template_rule.get("column")
+        if not column:
+            return None
+        name = self.template_rule.get("map", {}).get(record.get(column, "").strip())
+        return name if name in self.templates else None
+
+    def template_renderer(self, name):
+        """템플릿별 화면 밖 렌더러 (씬·배경 레이어는 템플릿마다 한 번만 만듦)"""
+        profile = self.templates[name]
+        renderer = self._template_renderers.get(name)
+        if renderer is None or renderer.profile is not profile:
+            renderer = BadgeRenderer(profile, self.qr_cache)
+            self._template_renderers[name] = renderer
+        return renderer
+
+    def template_groups(self, records_to_print, dpi):
+        """출력할 레코드를 템플릿별로 묶어 (렌더러, 배경 레이어, 레코드 목록)을 내보냅니다.
+
+        배경 레이어는 출력 DPI에 맞춘 것을 씁니다. uncached_rendering() 안에서 소비해야 합니다.
+        """
+        groups = OrderedDict()
+        for record_index in records_to_print:
+            name = None if record_index is None else self.template_for(self.records[record_index])
+            groups.setdefault(name, []).append(record_index)
+        for name, record_indices in groups.items():
+            renderer = self.badge_renderer() if name is None else self.template_renderer(name)
+            yield renderer, renderer.static_picture(dpi), record_indices
+
+    def record_renderer(self, record):
+        """레코드에 적용할 렌더러 (템플릿 규칙에 맞는 템플릿, 없으면 현재 레이아웃)"""
+        name = self.template_for(record)
+        return self.badge_renderer() if name is None else self.template_renderer(name)
+
+    def template_hash(self, name):
+        """템플릿 프로필의 해시 (프로필 객체가 바뀔 때만 다시 계산)"""
+        profile = self.templates[name]
+        cached = self._template_hashes.get(name)
+        if cached is None or cached[0] is not profile:
+            cached = self._template_hashes[name] = (profile, content_hash(profile))
+        return cached[1]
+
+    def cached_layout_hashes(self):
+        """디스크 캐시에 남겨 둘 레이아웃 (현재 레이아웃 + 모든 템플릿)"""
+        return [self.layout_hash()] + [self.template_hash(name) for name in self.templates]
+
+    def clear_render_cache(self):
+        self.render_cache.clear()
+        QMessageBox.information(self, "출력 캐시", "출력 캐시를 비웠습니다.")
+
     def update_name_tag(self):
         if self.records and 0 <= self.current_index < len(self.records):
             record = self.records[self.current_index]
-            # 텍스트만 변경 (위치는 건드리지 않음)
-            self.company_text.setPlainText(record["company"])
-            self.name_text.setPlainText(record["name"])
-            self.title_text.setPlainText(record["title"])
+            # 텍스트만 변경 (위치는 건드리지 않음), 숨김 필드와 바뀌지 않은 텍스트는 건너뜀
+            for field in self.fields:
+                if not field.visible:
+                    continue
+                text = record.get(field.key, "")
+                if field.item.toPlainText() != text:
+                    field.item.setPlainText(text)
+            if self.qr_item.isVisible():
+                self.qr_item.set_record(record)
+
+    def set_qr_visible(self, visible):
+        self.qr_item.setVisible(visible)
+        self.invalidate_layout()
+        if visible:
+            self.prefetch_qr_codes(range(min(len(self.records), self.QR_PREFETCH_CHUNK)))
+            self.update_name_tag()
+        if self.group_mode:
+            self.update_grouping(True)
+
+    def edit_qr_template(self):
+        columns = ", ".join(f"{{{field.key}}}" for field in self.fields)
+        template, ok = QInputDialog.getText(
+            self, "QR 내용 설정",
+            f"QR 코드에 넣을 내용을 입력하세요.\n사용 가능한 항목: {columns}",
+            QLineEdit.Normal, self.qr_item.template)
+        if ok:
+            self.qr_item.template = template
+            self.qr_item.payload = None
+            self.invalidate_layout()
+            self.update_name_tag()
+
+    def prefetch_qr_codes(self, record_indices):
+        """출력할 레코드들의 QR을 미리 생성해 인쇄 루프에서는 인코딩하지 않도록 합니다."""
+        if not self.qr_item.isVisible():
+            return
+        payloads = [self.qr_item.payload_for(self.records[i])
+                    for i in record_indices if i is not None and 0 <= i < len(self.records)]
+        self.qr_cache.prefetch(payloads, self.qr_item.module_size)
 
     def load_excel_data(self):
         fileName, _ = QFileDialog.getOpenFileName(
@@ -509,48 +2462,73 @@ class MainWindow(QMainWindow):
             "Excel Files (*.xlsx *.xls)")
         if fileName:
             try:
-                df = pd.read_excel(fileName)
-                df.columns = df.columns.str.strip()  # 컬럼명 앞뒤 공백 제거
+                self.load_excel_file(fileName)
+            except ValueError as e:
+                QMessageBox.critical(self, "오류", str(e))
             except Exception as e:
                 QMessageBox.critical(
                     self, "오류", 
                     f"엑셀 파일 읽기 오류:\n{str(e)}")
-                return
-            required_cols = ["이름", "회사명", "직급"]
-            for col in required_cols:
-                if col not in df.columns:
-                    QMessageBox.critical(
-                        self, "오류", 
-                        f"엑셀 파일에 '{col}' 컬럼이 없습니다.")
-                    return
-            self.records = []
-            self.list_widget.clear()
-            for idx, row in df.iterrows():
-                name = str(row["이름"]).strip()
-                if name == "" or name.lower() == "nan":
-                    continue
-                record = {
-                    "name": name,
-                    "company": str(row["회사명"]).strip(),
-                    "title": str(row["직급"]).strip()
-                }
-                self.records.append(record)
-                item_text = f"{record['company']} - {record['name']}"
-                item = QListWidgetItem(item_text)
-                item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
-                item.setCheckState(Qt.Checked)
-                self.list_widget.addItem(item)
-            if self.records:
-                self.current_index = 0
-                self.update_name_tag()
+
+    def load_excel_file(self, fileName):
+        """엑셀 명단을 읽어 명단 목록을 채웁니다. 필수 컬럼이 없으면 ValueError."""
+        df = pd.read_excel(fileName)
+        df.columns = df.columns.str.strip()  # 컬럼명 앞뒤 공백 제거
+        required_cols = ["이름", "회사명", "직급"]
+        for col in required_cols:
+            if col not in df.columns:
+                raise ValueError(f"엑셀 파일에 '{col}' 컬럼이 없습니다.")
+        self.sync_fields_with_columns(df.columns)
+        column_keys = [(field.column, field.key) for field in self.fields
+                       if field.column in df.columns]
+        self.records = []
+        self.list_widget.clear()
+        for idx, row in df.iterrows():
+            name = str(row["이름"]).strip()
+            if name == "" or name.lower() == "nan":
+                continue
+            record = {}
+            for column, key in column_keys:
+                value = str(row[column]).strip()
+                record[key] = "" if value.lower() == "nan" else value
+            self.records.append(record)
+            item = QListWidgetItem(self.record_label(record))
+            item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
+            item.setCheckState(Qt.Checked)
+            self.list_widget.addItem(item)
+        if self.records:
+            self.current_index = 0
+            self.update_name_tag()
+
+    PRERENDER_RADIUS = 5  # 선택 행 앞뒤로 미리 렌더링할 행 수
+    PRERENDER_SEARCH_HITS = 10
 
     def on_list_currentRowChanged(self, row):
         if 0 <= row < len(self.records):
             self.current_index = row
             self.update_name_tag()
+            # 선택 행, 다음 행, 이전 행 ... 순서로 미리 렌더링
+            neighbors = [row]
+            for distance in range(1, self.PRERENDER_RADIUS + 1):
+                neighbors += [row + distance, row - distance]
+            self.prerender_pool.schedule(
+                [i for i in neighbors if not self.list_widget.isRowHidden(i)])
+
+    def filter_records(self, text):
+        """검색어에 맞는 행만 보여주고 상위 결과를 미리 렌더링합니다."""
+        keyword = text.strip().lower()
+        hits = []
+        for i, record in enumerate(self.records):
+            matched = not keyword or any(
+                keyword in record.get(key, "").lower() for key in ("name", "company"))
+            self.list_widget.setRowHidden(i, not matched)
+            if matched and keyword:
+                hits.append(i)
+        if hits:
+            self.prerender_pool.schedule(hits[:self.PRERENDER_SEARCH_HITS])
 
     def add_record(self):
-        dialog = RecordDialog(self)
+        dialog = RecordDialog(self, fields=self.fields)
         if dialog.exec_() == QDialog.Accepted:
             new_record = dialog.get_record()
             if new_record["name"] == "":
@@ -559,8 +2537,7 @@ class MainWindow(QMainWindow):
                     "이름은 필수 입력 항목입니다.")
                 return
             self.records.append(new_record)
-            item_text = f"{new_record['company']} - {new_record['name']}"
-            item = QListWidgetItem(item_text)
+            item = QListWidgetItem(self.record_label(new_record))
             item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
             item.setCheckState(Qt.Checked)
             self.list_widget.addItem(item)
@@ -574,7 +2551,7 @@ class MainWindow(QMainWindow):
                 "수정할 명단 항목을 선택해주세요.")
             return
         record = self.records[current_row]
-        dialog = RecordDialog(self, record)
+        dialog = RecordDialog(self, record, fields=self.fields)
         if dialog.exec_() == QDialog.Accepted:
             updated_record = dialog.get_record()
             if updated_record["name"] == "":
@@ -582,9 +2559,9 @@ class MainWindow(QMainWindow):
                     self, "입력 오류", 
                     "이름은 필수 입력 항목입니다.")
                 return
-            self.records[current_row] = updated_record
-            item_text = f"{updated_record['company']} - {updated_record['name']}"
-            self.list_widget.item(current_row).setText(item_text)
+            self.records[current_row] = {**record, **updated_record}
+            self.list_widget.item(current_row).setText(
+                self.record_label(self.records[current_row]))
             self.update_name_tag()
 
     def select_all_items(self, state):
@@ -599,7 +2576,9 @@ class MainWindow(QMainWindow):
     def update_grouping(self, enabled):
         self.group_mode = enabled
         if self.group_mode:
-            items_to_group = [self.company_text, self.name_text, self.title_text]
+            items_to_group = self.text_items()
+            if self.qr_item.isVisible():
+                items_to_group.append(self.qr_item)
             if self.image_item is not None:
                 items_to_group.append(self.image_item)
             if self.group_item is not None:
@@ -635,53 +2614,93 @@ class MainWindow(QMainWindow):
                 QMessageBox.information(
                     self, "폰트 적용", 
                     f"선택한 폰트: {self.custom_font_family}")
-                for item in [self.company_text, self.name_text, self.title_text]:
+                for item in self.text_items():
                     font = item.font()
                     font.setFamily(self.custom_font_family)
                     item.setFont(font)
+                self.invalidate_layout()
 
     def load_image(self):
         fileName, _ = QFileDialog.getOpenFileName(
             self, "이미지 파일 선택", "", 
             "Images (*.png *.jpg *.jpeg *.bmp)")
         if fileName:
-            pixmap = QPixmap(fileName)
-            if self.image_item:
-                self.container_item.removeChildItem(self.image_item)
-            self.image_item = DraggablePixmapItem(pixmap)
-            self.image_item.setParentItem(self.container_item)
-            self.image_item.setZValue(-1)
-            scene_center_x = self.A4_WIDTH_PX / 2
-            scene_center_y = self.A4_HEIGHT_PX / 2
-            img_width = pixmap.width()
-            img_height = pixmap.height()
-            x = scene_center_x - (img_width / 2)
-            y = scene_center_y - (img_height / 2)
-            self.image_item.setPos(x, y)
-            if self.group_mode:
-                self.update_grouping(True)
+            self.load_image_file(fileName)
 
-    def preview(self):
+    def load_image_file(self, fileName):
+        """배경 이미지를 용지 중앙에 배치합니다."""
+        pixmap = QPixmap(fileName)
+        self.image_path = fileName
+        if self.image_item:
+            self.scene.removeItem(self.image_item)
+        self.image_item = DraggablePixmapItem(pixmap)
+        self.image_item.setParentItem(self.container_item)
+        self.image_item.setZValue(-1)
+        scene_center_x = self.A4_WIDTH_PX / 2
+        scene_center_y = self.A4_HEIGHT_PX / 2
+        img_width = pixmap.width()
+        img_height = pixmap.height()
+        x = scene_center_x - (img_width / 2)
+        y = scene_center_y - (img_height / 2)
+        self.image_item.setPos(x, y)
+        self.invalidate_layout()
+        if self.group_mode:
+            self.update_grouping(True)
+
+    def create_printer(self):
         printer = QPrinter(QPrinter.HighResolution)
         printer.setFullPage(True)
         printer.setPageSize(QPrinter.A4)
         printer.setOrientation(QPrinter.Portrait)
         printer.setPageMargins(0, 0, 0, 0, QPrinter.Millimeter)
-        printer.setResolution(144)
+        printer.setResolution(self.output_dpi())
+        return printer
+
+    def compare_output_profiles(self, sample_size=10):
+        """체크된 명찰 일부를 프로필별로 PDF에 출력해 렌더링 시간과 출력 크기를 비교합니다."""
+        records_to_print = self.checked_record_indices()[:sample_size] or [None]
+        lines = []
+        with tempfile.TemporaryDirectory() as directory:
+            for name, profile in OUTPUT_PROFILES.items():
+                path = os.path.join(directory, f"{name}.pdf")
+                printer = self.create_printer()
+                printer.setResolution(profile["dpi"])
+                printer.setOutputFormat(QPrinter.PdfFormat)
+                printer.setOutputFileName(path)
+                started = time.perf_counter()
+                painter = QPainter(printer)
+                with self.uncached_rendering():
+                    for page, (static_picture, picture) in enumerate(
+                            self.page_pictures(records_to_print, profile["dpi"])):
+                        if page:
+                            printer.newPage()
+                        page_rect = QRectF(printer.pageRect())
+                        self.draw_scene_picture(painter, static_picture, page_rect)
+                        self.draw_scene_picture(painter, picture, page_rect)
+                painter.end()
+                elapsed = time.perf_counter() - started
+                size = os.path.getsize(path)
+                lines.append(f"{profile['label']} ({profile['dpi']} DPI): {elapsed:.2f}초, "
+                             f"{size / 1024:.0f}KB ({size / 1024 / len(records_to_print):.0f}KB/장)")
+        QMessageBox.information(
+            self, "출력 품질 비교", f"{len(records_to_print)}장 기준\n" + "\n".join(lines))
+
+    def preview(self):
+        """체크된 명찰 전체를 페이지로 미리 봅니다 (명단이 없으면 편집 화면 그대로)."""
+        if self.records:
+            record_indices = self.checked_record_indices()
+            if not record_indices and 0 <= self.current_index < len(self.records):
+                record_indices = [self.current_index]
+            if record_indices:
+                BadgePreviewDialog(self, record_indices, self).exec_()
+                return
+        printer = self.create_printer()
         preview_dialog = QPrintPreviewDialog(printer, self)
         preview_dialog.paintRequested.connect(
             lambda p: self.handle_paint_request(p))
         preview_dialog.exec_()
 
     def handle_paint_request(self, printer):
-        text_visible = True
-        company_visible = self.company_text.isVisible()
-        name_visible = self.name_text.isVisible()
-        title_visible = self.title_text.isVisible()
-        self.company_text.setVisible(text_visible)
-        self.name_text.setVisible(text_visible)
-        self.title_text.setVisible(text_visible)
-
         image_visible = None
         if self.image_item is not None:
             image_visible = self.image_item.isVisible()
@@ -689,60 +2708,236 @@ class MainWindow(QMainWindow):
                 self.image_item.setVisible(False)
 
         printer.setFullPage(True)
-        printer.setResolution(144)
+        printer.setResolution(self.output_dpi())
         painter = QPainter(printer)
         page_rect = printer.pageRect()
         painter.save()
-        self.scene.render(painter, target=QRectF(page_rect), 
-                         source=self.scene.sceneRect())
+        with self.uncached_rendering():
+            self.scene.render(painter, target=QRectF(page_rect), 
+                             source=self.scene.sceneRect())
         painter.restore()
         painter.end()
 
-        self.company_text.setVisible(company_visible)
-        self.name_text.setVisible(name_visible)
-        self.title_text.setVisible(title_visible)
         if self.image_item is not None and image_visible is not None:
             self.image_item.setVisible(image_visible)
 
     def print_(self):
-        printer = QPrinter(QPrinter.HighResolution)
-        printer.setFullPage(True)
-        printer.setPageSize(QPrinter.A4)
-        printer.setOrientation(QPrinter.Portrait)
-        printer.setPageMargins(0, 0, 0, 0, QPrinter.Millimeter)
-        printer.setResolution(144)
+        printer = self.create_printer()
         dialog = QPrintDialog(printer, self)
         if dialog.exec_() == QPrintDialog.Accepted:
-            checked_indices = []
-            for i in range(self.list_widget.count()):
-                item = self.list_widget.item(i)
-                if item.checkState() == Qt.Checked:
-                    checked_indices.append(i)
-            if checked_indices:
-                records_to_print = checked_indices
-            else:
-                records_to_print = [None]
+            records_to_print = self.checked_record_indices() or [None]
 
             painter = QPainter(printer)
-            for idx, record_index in enumerate(records_to_print):
-                if record_index is not None:
-                    self.current_index = record_index
-                    self.update_name_tag()
-                page_rect = printer.pageRect()
-                painter.save()
-                self.scene.render(painter, target=QRectF(page_rect), source=self.scene.sceneRect())
-                painter.restore()
-                if idx != len(records_to_print) - 1:
-                    printer.newPage()
+            pages = self.page_pictures(records_to_print, printer.resolution())
+            with self.uncached_rendering():
+                # 템플릿별로 묶어 배경(용지·이미지)은 템플릿·DPI마다 한 번만 기록하고,
+                # 텍스트 레이어는 레코드별로 캐시에서 재생
+                for page, (static_picture, picture) in enumerate(pages):
+                    if page:
+                        printer.newPage()
+                    page_rect = QRectF(printer.pageRect())
+                    self.draw_scene_picture(painter, static_picture, page_rect)
+                    self.draw_scene_picture(painter, picture, page_rect)
             painter.end()
 
+    def checked_record_indices(self):
+        return [i for i in range(self.list_widget.count())
+                if self.list_widget.item(i).checkState() == Qt.Checked]
+
+    def page_pictures(self, records_to_print, dpi):
+        """출력 순서(템플릿별로 묶음)대로 (배경 레이어, 텍스트 레이어)를 내보냅니다."""
+        groups = list(self.template_groups(records_to_print, dpi))
+        keep = self.cached_layout_hashes()
+        for renderer, static_picture, record_indices in groups:
+            for picture in self.record_pictures(record_indices, renderer, keep):
+                yield static_picture, picture
+
+    def record_pictures(self, records_to_print, renderer, keep=()):
+        """레코드별 텍스트 레이어 QPicture를 순서대로 내보냅니다.
+
+        청크 단위로 디스크 캐시를 먼저 확인하고, 캐시에 없는 레코드의 QR만 미리
+        인코딩한 뒤 렌더링합니다. None은 현재 편집 화면의 텍스트 레이어입니다.
+        uncached_rendering() 안에서 소비해야 합니다.
+        """
+        for chunk_start in range(0, len(records_to_print), self.QR_PREFETCH_CHUNK):
+            chunk = records_to_print[chunk_start:chunk_start + self.QR_PREFETCH_CHUNK]
+            # 다른 템플릿 묶음이 사이에 끼어도 같은 캐시 디렉터리를 쓰도록 청크마다 지정
+            self.render_cache.set_layout(renderer.layout_hash, keep)
+            cached = {}
+            for record_index in chunk:
+                if record_index is not None:
+                    record_hash = renderer.record_hash(self.records[record_index])
+                    cached[record_index] = (record_hash, self.render_cache.load(record_hash))
+            self.prefetch_qr_codes(
+                [i for i, (_, picture) in cached.items() if picture is None])
+            for record_index in chunk:
+                if record_index is None:
+                    yield self.record_layer_picture(dynamic=True)
+                    continue
+                record_hash, picture = cached[record_index]
+                if picture is None:
+                    picture = renderer.picture(self.records[record_index])
+                    self.render_cache.store(record_hash, picture)
+                yield picture
+
+    def print_multi(self):
+        """체크된 명찰을 여러 프린터에 처리량 기준으로 나눠 출력합니다."""
+        if self.dispatcher is not None:
+            QMessageBox.warning(self, "오류", "다중 프린터 출력이 이미 진행 중입니다.")
+            return
+        records_to_print = self.checked_record_indices()
+        if not records_to_print:
+            QMessageBox.warning(self, "오류", "출력할 명단을 체크해주세요.")
+            return
+        dialog = MultiPrinterDialog(self)
+        if dialog.exec_() != QDialog.Accepted:
+            return
+        devices = []
+        for name in dialog.printer_names():
+            printer = self.create_printer()
+            printer.setPrinterName(name)
+            devices.append(PrinterDevice(name, printer))
+        if dialog.pdf_device_count():
+            pdf_dir = QFileDialog.getExistingDirectory(self, "PDF 저장 폴더 선택")
+            if not pdf_dir:
+                return
+            for n in range(dialog.pdf_device_count()):
+                printer = self.create_printer()
+                printer.setOutputFormat(QPrinter.PdfFormat)
+                devices.append(PrinterDevice(f"pdf{n + 1}", printer, pdf_dir))
+        if not devices:
+            QMessageBox.warning(self, "오류", "프린터를 하나 이상 선택해주세요.")
+            return
+
+        # 렌더링은 GUI 스레드에서 끝내고, 장치 스레드는 QPicture 재생만 함
+        with self.uncached_rendering():
+            pages = list(self.page_pictures(records_to_print, self.output_dpi()))
+        self.dispatcher = PrintDispatcher(self, devices, pages)
+        self.dispatcher.start()
+        self.dispatch_timer.start()
+
+    def poll_dispatch(self):
+        dispatcher = self.dispatcher
+        dispatcher.check_stuck()
+        summary = ", ".join(
+            f"{row['device']} {row['pages']}장 ({row['pages_per_minute']:.1f}장/분)"
+            for row in dispatcher.report())
+        self.statusBar().showMessage(f"다중 프린터 출력: 남은 {dispatcher.remaining()}장 | {summary}")
+        if not dispatcher.finished():
+            return
+        self.dispatch_timer.stop()
+        self.dispatcher = None
+        elapsed = time.perf_counter() - dispatcher.started
+        lines = [f"{row['device']}: {row['pages']}장, {row['pages_per_minute']:.1f}장/분, "
+                 f"하위 작업 {row['subjobs']}개, {row['status']}"
+                 for row in dispatcher.report()]
+        lines.append(f"전체 {elapsed:.1f}초")
+        if dispatcher.remaining():
+            lines.append(f"출력하지 못한 명찰 {dispatcher.remaining()}장 (모든 장치 실패)")
+        QMessageBox.information(self, "다중 프린터 출력", "\n".join(lines))
+
+    def print_current(self):
+        """선택된 명찰 한 장을 바로 출력합니다 (체크인 데스크용).
+
+        사전 렌더링 풀 → 디스크 캐시 → 렌더링 순서로 텍스트 레이어를 찾으므로
+        미리 렌더링된 경우 레이아웃/래스터 작업 없이 그리기만 합니다.
+        """
+        if not (0 <= self.current_index < len(self.records)):
+            QMessageBox.warning(self, "오류", "출력할 명단 항목을 선택해주세요.")
+            return
+        if self.kiosk_printer is None:
+            printer = self.create_printer()
+            if QPrintDialog(printer, self).exec_() != QPrintDialog.Accepted:
+                return
+            self.kiosk_printer = printer
+        self.print_record(self.kiosk_printer, self.records[self.current_index])
+        self.show_prerender_stats()
+
+    def print_record(self, printer, record):
+        """레코드 한 장을 printer에 한 페이지로 출력합니다 (편집 화면은 건드리지 않음)."""
+        _, static_picture, picture = self.record_layers(
+            record, use_prerendered=True, dpi=printer.resolution())
+        painter = QPainter(printer)
+        page_rect = QRectF(printer.pageRect())
+        self.draw_scene_picture(painter, static_picture, page_rect)
+        self.draw_scene_picture(painter, picture, page_rect)
+        painter.end()
+
+    def record_layers(self, record, use_prerendered=False, dpi=None, include_image=True):
+        """레코드 한 장의 (렌더러, 배경 레이어, 텍스트 레이어)
+
+        텍스트 레이어는 (사전 렌더링 풀 →) 디스크 캐시 → 렌더링 순서로 찾습니다.
+        배경 레이어는 dpi(기본은 현재 출력 프로필)에 맞춘 것이며, include_image=False면
+        배경 이미지를 뺀 것입니다.
+        """
+        renderer = self.record_renderer(record)
+        record_hash = renderer.record_hash(record)
+        picture = None
+        if use_prerendered:
+            picture = self.prerender_pool.take(renderer.layout_hash, record_hash)
+        if picture is None:
+            self.render_cache.set_layout(renderer.layout_hash, self.cached_layout_hashes())
+            picture = self.render_cache.load(record_hash)
+            if picture is None:
+                picture = renderer.picture(record)
+                self.render_cache.store(record_hash, picture)
+        return renderer, renderer.static_picture(dpi or self.output_dpi(), include_image), picture
+
+    def print_labels(self):
+        """체크된(없으면 선택된) 명찰을 라벨 프린터 고유 DPI의 1비트 래스터로 출력합니다."""
+        from label_printer import LabelPrinterBackend, LANGUAGES
+        record_indices = self.checked_record_indices()
+        if not record_indices and 0 <= self.current_index < len(self.records):
+            record_indices = [self.current_index]
+        if not record_indices:
+            QMessageBox.warning(self, "오류", "출력할 명단이 없습니다.")
+            return
+        backend = self.label_backend
+        language, ok = QInputDialog.getItem(
+            self, "라벨 프린터 출력", "명령 언어:", list(LANGUAGES),
+            LANGUAGES.index(backend.language) if backend else 0, False)
+        if not ok:
+            return
+        dpi, ok = QInputDialog.getInt(
+            self, "라벨 프린터 출력", "프린터 DPI:", backend.dpi if backend else 203, 100, 600)
+        if not ok:
+            return
+        target, ok = QInputDialog.getText(
+            self, "라벨 프린터 출력", "출력 대상 (tcp://IP:9100 또는 파일/장치 경로):",
+            text=self.label_target)
+        if not ok or not target.strip():
+            return
+        # 같은 설정이면 인코딩된 배경 캐시를 재사용
+        if backend is None or (backend.language, backend.dpi) != (language, dpi):
+            backend = self.label_backend = LabelPrinterBackend(self, language, dpi)
+        self.label_target = target.strip()
+        started = time.perf_counter()
+        try:
+            with self.uncached_rendering():
+                written = backend.print_records(
+                    [self.records[i] for i in record_indices], self.label_target)
+        except OSError as e:
+            QMessageBox.critical(self, "오류", f"라벨 프린터 출력 오류:\n{str(e)}")
+            return
+        self.statusBar().showMessage(
+            f"라벨 {len(record_indices)}장 출력: {written / 1024:.0f}KB, "
+            f"{time.perf_counter() - started:.1f}초")
+
+    def show_prerender_stats(self):
+        stats = self.prerender_pool.stats()
+        self.statusBar().showMessage(
+            f"사전 렌더링 적중 {stats['hits']}/{stats['hits'] + stats['misses']} "
+            f"({stats['hit_rate']:.0%}), 절약 {stats['saved_ms']:.0f}ms, "
+            f"준비 {stats['ready']}장 / 대기 {stats['queued']}장")
+
     def export_settings(self):
         options = QFileDialog.Options()
         fileName, _ = QFileDialog.getSaveFileName(
             self, "설정 내보내기", "", 
             "HTML Files (*.html);;All Files (*)", options=options)
         if fileName:
-            def get_info(item):
+            def get_info(field):
+                item = field.item
                 font = item.font()
                 return {
                     "x": float(item.pos().x()),
@@ -750,13 +2945,11 @@ class MainWindow(QMainWindow):
                     "text": item.toPlainText(),
                     "font_size": font.pointSize(),
                     "font_family": font.family(),
-                    "font_bold": font.bold()
+                    "font_bold": font.bold(),
+                    "column": field.column,
+                    "visible": field.visible
                 }
-            settings = {
-                "company_text": get_info(self.company_text),
-                "name_text": get_info(self.name_text),
-                "title_text": get_info(self.title_text)
-            }
+            settings = {field.role: get_info(field) for field in self.fields}
             try:
                 with open(fileName, "w", encoding="utf-8") as f:
                     f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
@@ -771,7 +2964,13 @@ class MainWindow(QMainWindow):
                         f.write(f'    title="{info["text"]}" href=""\n')
                         f.write(f'    data-x="{info["x"]}" data-y="{info["y"]}"\n')
                         f.write(f'    data-font-size="{info["font_size"]}" data-font-family="{info["font_family"]}" data-font-bold="{str(info["font_bold"]).lower()}"\n')
+                        f.write(f'    data-column="{info["column"]}" data-visible="{str(info["visible"]).lower()}"\n')
                         f.write('    shape="rect" />\n')
+                    qr = self.qr_item
+                    f.write('  <area role="qr_code" alt="QR" href=""\n')
+                    f.write(f'    data-x="{float(qr.pos().x())}" data-y="{float(qr.pos().y())}"\n')
+                    f.write(f'    data-template="{html.escape(qr.template)}" data-module-size="{qr.module_size}" data-visible="{str(qr.isVisible()).lower()}"\n')
+                    f.write('    shape="rect" />\n')
                     f.write('</map>\n')
                     f.write('</body>\n</html>')
                 QMessageBox.information(
@@ -789,42 +2988,7 @@ class MainWindow(QMainWindow):
             "HTML Files (*.html);;All Files (*)", options=options)
         if fileName:
             try:
-                from bs4 import BeautifulSoup
-                with open(fileName, "r", encoding="utf-8") as f:
-                    soup = BeautifulSoup(f, "html.parser")
-                for area in soup.find_all("area"):
-                    role = area.get('role')
-                    text = area.get('title')
-                    x = area.get('data-x')
-                    y = area.get('data-y')
-                    font_size = area.get('data-font-size')
-                    font_family = area.get('data-font-family')
-                    font_bold = area.get('data-font-bold')
-                    if role == "company_text":
-                        item = self.company_text
-                        self.company_x_slider.setValue(int(float(x)))
-                        self.company_y_slider.setValue(int(float(y)))
-                    elif role == "name_text":
-                        item = self.name_text
-                        self.name_x_slider.setValue(int(float(x)))
-                        self.name_y_slider.setValue(int(float(y)))
-                    elif role == "title_text":
-                        item = self.title_text
-                        self.title_x_slider.setValue(int(float(x)))
-                        self.title_y_slider.setValue(int(float(y)))
-                    else:
-                        continue
-                    item.setParentItem(self.container_item)
-                    item.setPlainText(text)
-                    font = item.font()
-                    if font_size:
-                        font.setPointSize(int(font_size))
-                    if font_family:
-                        font.setFamily(font_family)
-                    if font_bold:
-                        font.setBold(font_bold == 'true')
-                    item.setFont(font)
-                    item.setPos(float(x), float(y))
+                self.apply_settings_file(fileName)
                 QMessageBox.information(
                     self, "설정 불러오기", 
                     "설정이 성공적으로 불러와졌습니다.")
@@ -833,51 +2997,71 @@ class MainWindow(QMainWindow):
                     self, "오류", 
                     f"설정 불러오기 오류:\n{str(e)}")
 
-    # --- 텍스트박스 드래그 이동 시 우측 좌표 UI 동기화 함수 ---
-    def sync_company_pos(self, x, y):
-        self.company_x_slider.blockSignals(True)
-        self.company_y_slider.blockSignals(True)
-        self.company_x_edit.blockSignals(True)
-        self.company_y_edit.blockSignals(True)
-        self.company_x_slider.setValue(int(x))
-        self.company_y_slider.setValue(int(y))
-        self.company_x_edit.setText(str(int(x)))
-        self.company_y_edit.setText(str(int(y)))
-        self.company_x_slider.blockSignals(False)
-        self.company_y_slider.blockSignals(False)
-        self.company_x_edit.blockSignals(False)
-        self.company_y_edit.blockSignals(False)
-    def sync_name_pos(self, x, y):
-        self.name_x_slider.blockSignals(True)
-        self.name_y_slider.blockSignals(True)
-        self.name_x_edit.blockSignals(True)
-        self.name_y_edit.blockSignals(True)
-        self.name_x_slider.setValue(int(x))
-        self.name_y_slider.setValue(int(y))
-        self.name_x_edit.setText(str(int(x)))
-        self.name_y_edit.setText(str(int(y)))
-        self.name_x_slider.blockSignals(False)
-        self.name_y_slider.blockSignals(False)
-        self.name_x_edit.blockSignals(False)
-        self.name_y_edit.blockSignals(False)
-    def sync_title_pos(self, x, y):
-        self.title_x_slider.blockSignals(True)
-        self.title_y_slider.blockSignals(True)
-        self.title_x_edit.blockSignals(True)
-        self.title_y_edit.blockSignals(True)
-        self.title_x_slider.setValue(int(x))
-        self.title_y_slider.setValue(int(y))
-        self.title_x_edit.setText(str(int(x)))
-        self.title_y_edit.setText(str(int(y)))
-        self.title_x_slider.blockSignals(False)
-        self.title_y_slider.blockSignals(False)
-        self.title_x_edit.blockSignals(False)
-        self.title_y_edit.blockSignals(False)
+    def apply_settings_file(self, fileName):
+        """내보낸 설정 HTML 을 읽어 필드/QR 배치를 복원합니다."""
+        from bs4 import BeautifulSoup
+        with open(fileName, "r", encoding="utf-8") as f:
+            soup = BeautifulSoup(f, "html.parser")
+        for area in soup.find_all("area"):
+            role = area.get('role')
+            text = area.get('title')
+            x = area.get('data-x')
+            y = area.get('data-y')
+            font_size = area.get('data-font-size')
+            font_family = area.get('data-font-family')
+            font_bold = area.get('data-font-bold')
+            column = area.get('data-column')
+            visible = area.get('data-visible')
+            if role == "qr_code":
+                self.qr_item.template = area.get('data-template') or self.qr_item.template
+                self.qr_item.module_size = int(area.get('data-module-size') or self.qr_item.module_size)
+                self.qr_item.payload = None
+                self.qr_item.setPos(float(x), float(y))
+                self.qr_checkbox.setChecked(visible == 'true')
+                self.update_name_tag()
+                continue
+            if not role or not role.endswith("_text"):
+                continue
+            key = role[:-len("_text")]
+            field = self.field_by_key(key)
+            if field is None:
+                field = self.create_field_item(BadgeField(key, column or key, column))
+                self.rebuild_field_panel()
+            if visible:
+                self.set_field_visible(field, visible == 'true')
+            item = field.item
+            self.position_binder.set_position(key, float(x), float(y))
+            item.setParentItem(self.container_item)
+            item.setPlainText(text)
+            font = item.font()
+            if font_size:
+                font.setPointSize(int(font_size))
+            if font_family:
+                font.setFamily(font_family)
+            if font_bold:
+                font.setBold(font_bold == 'true')
+            item.setFont(font)
+            item.setPos(float(x), float(y))
+        self.invalidate_layout()
+
+# 성능 측정 구간 (Profiler.enable() 때만 래퍼로 교체됨)
+profiler.register("excel.load", MainWindow, "load_excel_file")
+profiler.register("name_tag.update", MainWindow, "update_name_tag")
+profiler.register("text.set_plain_text", CenteredTextItem, "setPlainText")
+profiler.register("scene.render", QGraphicsScene, "render")
+profiler.register("printer.new_page", QPrinter, "newPage")
+profiler.register("image.load", MainWindow, "load_image_file")
+
+if os.environ.get("NAMECARD_PROFILE"):
+    profiler.enable()
+    if os.environ["NAMECARD_PROFILE"].endswith(".json"):
+        atexit.register(profiler.dump, os.environ["NAMECARD_PROFILE"])
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
     QApplication.setAttribute(Qt.AA_EnableHighDpiScaling, True)
     QApplication.setAttribute(Qt.AA_UseHighDpiPixmaps, True)
+    QPixmapCache.setCacheLimit(64 * 1024)  # 아이템 비트맵 캐시용 (KB)
     mainWin = MainWindow()
     mainWin.show()
     sys.exit(app.exec_()) 
\ No newline at end of file
@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+"""
+명찰 출력 서버 (여러 체크인 태블릿 → 프린터 한 대)
+
+namecard_maker.py의 렌더링/출력 파이프라인을 창 없이 띄우고, 로컬 HTTP API로
+"명단 X번 출력" / "즉석 이름 출력" 요청을 받아 우선순위 작업 큐로 처리합니다.
+
+- 요청 처리는 별도 스레드의 asyncio 서버가 맡고, 큐에 넣은 뒤 바로 응답합니다.
+- 렌더링/출력은 Qt 메인 스레드의 RenderWorker가 한 장씩 처리합니다
+  (Qt 씬은 GUI 스레드에서만 다룰 수 있으므로). 요청 처리가 그리기를 기다리지 않습니다.
+- priority 값이 작을수록 먼저 출력하고, 같은 우선순위는 들어온 순서대로 출력합니다.
+
+사용 방법:
+1. 서버 실행 (테스트용 PDF 출력)
+   python namecard_server.py serve --excel 명단.xlsx --settings 설정.html --pdf-dir out
+   실제 프린터: --printer "프린터 이름" (생략하면 기본 프린터)
+2. 클라이언트
+   python namecard_server.py print --record 3
+   python namecard_server.py print --name 홍길동 --company 유스튜디오 --title 팀장 --priority 0
+   python namecard_server.py job 1
+   python namecard_server.py status
+
+HTTP API:
+  POST /print      {"record": 3} 또는 {"name": "...", "company": "...", "title": "..."}, 선택 "priority"
+  GET  /jobs/<id>  작업 상태 (queued / printing / done / failed)
+  GET  /status     큐·출력 통계
+"""
+
+import os
+import sys
+import json
+import time
+import queue
+import asyncio
+import argparse
+import itertools
+import threading
+import urllib.request
+import urllib.error
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_PRIORITY = 5
+
+
+class PrintJob:
+    """출력 작업 한 건의 상태"""
+    def __init__(self, job_id, priority, record_index=None, record=None):
+        self.id = job_id
+        self.priority = priority
+        self.record_index = record_index
+        self.record = record
+        self.status = "queued"
+        self.error = None
+        self.output = None
+        self.created = time.time()
+        self.finished = None
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "priority": self.priority,
+            "record": self.record_index if self.record is None else self.record,
+            "status": self.status,
+            "error": self.error,
+            "output": self.output,
+            "created": self.created,
+            "finished": self.finished,
+        }
+
+
+class JobQueue:
+    """스레드 간에 공유하는 우선순위 작업 큐 (asyncio 스레드가 넣고 Qt 스레드가 꺼냄)"""
+    def __init__(self):
+        self._queue = queue.PriorityQueue()
+        self._seq = itertools.count()
+        self._ids = itertools.count(1)
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, priority, record_index=None, record=None):
+        with self._lock:
+            job = PrintJob(next(self._ids), priority, record_index, record)
+            self._jobs[job.id] = job
+        # 같은 우선순위는 접수 순서(seq)대로
+        self._queue.put((priority, next(self._seq), job.id))
+        return job
+
+    def next_job(self):
+        """대기 중인 작업을 하나 꺼냅니다. 없으면 None."""
+        try:
+            _, _, job_id = self._queue.get_nowait()
+        except queue.Empty:
+            return None
+        with self._lock:
+            job = self._jobs[job_id]
+            job.status = "printing"
+        return job
+
+    def finish(self, job, output=None, error=None):
+        with self._lock:
+            job.status = "failed" if error else "done"
+            job.output = output
+            job.error = error
+            job.finished = time.time()
+
+    def get(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return job.to_dict() if job is not None else None
+
+    def stats(self):
+        with self._lock:
+            counts = {"queued": 0, "printing": 0, "done": 0, "failed": 0}
+            for job in self._jobs.values():
+                counts[job.status] += 1
+        return counts
+
+
+def parse_print_request(payload):
+    """POST /print 본문을 (priority, record_index, record)로 바꿉니다. 형식 오류는 ValueError."""
+    if not isinstance(payload, dict):
+        raise ValueError("JSON 객체가 필요합니다.")
+    priority = payload.get("priority", DEFAULT_PRIORITY)
+    if not isinstance(priority, int):
+        raise ValueError("priority는 정수여야 합니다.")
+    if "record" in payload:
+        record_index = payload["record"]
+        if not isinstance(record_index, int) or record_index < 0:
+            raise ValueError("record는 0 이상의 명단 번호여야 합니다.")
+        return priority, record_index, None
+    record = {key: str(value) for key, value in payload.items()
+              if key != "priority" and value is not None}
+    if not record.get("name", "").strip():
+        raise ValueError("record 번호 또는 name이 필요합니다.")
+    return priority, None, record
+
+
+# ---------------------------------------------------------------------------
+# asyncio HTTP 프런트엔드 (Qt와 무관, 별도 스레드에서 실행)
+# ---------------------------------------------------------------------------
+
+HTTP_REASONS = {200: "OK", 202: "Accepted", 400: "Bad Request", 404: "Not Found",
+                405: "Method Not Allowed"}
+
+
+class PrintServer:
+    """요청을 받아 JobQueue에 넣기만 하는 최소 HTTP 서버"""
+    def __init__(self, jobs, record_count, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        self.jobs = jobs
+        self.record_count = record_count
+        self.host = host
+        self.port = port
+
+    def handle(self, method, path, body):
+        if path == "/print":
+            if method != "POST":
+                return 405, {"error": "POST만 지원합니다."}
+            try:
+                priority, record_index, record = parse_print_request(json.loads(body or b"{}"))
+            except ValueError as e:
+                return 400, {"error": str(e)}
+            if record_index is not None and record_index >= self.record_count():
+                return 400, {"error": f"명단 번호 {record_index}가 범위를 벗어났습니다."}
+            job = self.jobs.submit(priority, record_index, record)
+            return 202, job.to_dict()
+        if method != "GET":
+            return 405, {"error": "GET만 지원합니다."}
+        if path == "/status":
+            return 200, {"records": self.record_count(), "jobs": self.jobs.stats()}
+        if path.startswith("/jobs/"):
+            try:
+                job = self.jobs.get(int(path[len("/jobs/"):]))
+            except ValueError:
+                job = None
+            if job is None:
+                return 404, {"error": "작업을 찾을 수 없습니다."}
+            return 200, job
+        return 404, {"error": "알 수 없는 경로입니다."}
+
+    async def _serve_client(self, reader, writer):
+        try:
+            request_line = (await reader.readline()).decode("latin-1").split()
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            body = await reader.readexactly(int(headers.get("content-length", 0) or 0))
+            if len(request_line) < 2:
+                status, result = 400, {"error": "잘못된 요청입니다."}
+            else:
+                status, result = self.handle(request_line[0].upper(), request_line[1], body)
+        except (ValueError, asyncio.IncompleteReadError):
+            status, result = 400, {"error": "잘못된 요청입니다."}
+        data = json.dumps(result, ensure_ascii=False).encode("utf-8")
+        writer.write(
+            f"HTTP/1.1 {status} {HTTP_REASONS[status]}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(data)}\r\n"
+            f"Connection: close\r\n\r\n".encode("latin-1") + data)
+        try:
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def serve_forever(self):
+        server = await asyncio.start_server(self._serve_client, self.host, self.port)
+        async with server:
+            await server.serve_forever()
+
+    def start_in_thread(self):
+        thread = threading.Thread(
+            target=lambda: asyncio.run(self.serve_forever()), name="namecard-http", daemon=True)
+        thread.start()
+        return thread
+
+
+# ---------------------------------------------------------------------------
+# 출력 대상 (PDF 파일 / 실제 프린터)
+# ---------------------------------------------------------------------------
+
+class PdfSink:
+    """작업마다 PDF 한 파일로 출력 (테스트용)"""
+    def __init__(self, window, directory):
+        self.window = window
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def print_record(self, job, record):
+        from PyQt5.QtPrintSupport import QPrinter
+        printer = self.window.create_printer()
+        printer.setOutputFormat(QPrinter.PdfFormat)
+        path = os.path.join(self.directory, f"job-{job.id:05d}.pdf")
+        printer.setOutputFileName(path)
+        self.window.print_record(printer, record)
+        return path
+
+
+class PrinterSink:
+    """지정한(또는 기본) 프린터로 출력. 프린터 객체는 재사용합니다."""
+    def __init__(self, window, printer_name=None):
+        self.window = window
+        self.printer = window.create_printer()
+        if printer_name:
+            self.printer.setPrinterName(printer_name)
+
+    def print_record(self, job, record):
+        self.printer.setDocName(f"명찰 #{job.id}")
+        self.window.print_record(self.printer, record)
+        return self.printer.printerName()
+
+
+def create_render_worker(window, jobs, sink, poll_ms=10):
+    """Qt 메인 스레드에서 큐를 비우는 워커 (타이머 틱마다 한 장)"""
+    from PyQt5.QtCore import QObject, QTimer
+
+    class RenderWorker(QObject):
+        def __init__(self):
+            super().__init__(window)
+            self.timer = QTimer(self)
+            self.timer.setInterval(poll_ms)
+            self.timer.timeout.connect(self.process_next)
+            self.timer.start()
+
+        def process_next(self):
+            job = jobs.next_job()
+            if job is None:
+                return
+            try:
+                if job.record is not None:
+                    record = job.record
+                else:
+                    if job.record_index >= len(window.records):
+                        raise IndexError(f"명단 번호 {job.record_index}가 범위를 벗어났습니다.")
+                    record = window.records[job.record_index]
+                jobs.finish(job, output=sink.print_record(job, record))
+            except Exception as e:
+                jobs.finish(job, error=str(e))
+
+    return RenderWorker()
+
+
+def serve(args):
+    # 창을 띄우지 않는 환경에서도 동작하도록 (이미 지정돼 있으면 그대로)
+    if args.pdf_dir:
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    import signal
+    from PyQt5.QtWidgets import QApplication
+    from PyQt5.QtGui import QPixmapCache
+    from namecard_maker import MainWindow
+
+    app = QApplication(sys.argv)
+    QPixmapCache.setCacheLimit(64 * 1024)
+    window = MainWindow()
+    if args.settings:
+        window.apply_settings_file(args.settings)
+    if args.image:
+        window.load_image_file(args.image)
+    if args.excel:
+        window.load_excel_file(args.excel)
+
+    jobs = JobQueue()
+    sink = PdfSink(window, args.pdf_dir) if args.pdf_dir else PrinterSink(window, args.printer)
+    create_render_worker(window, jobs, sink)  # 창이 부모라 창과 함께 유지됨
+    server = PrintServer(jobs, lambda: len(window.records), args.host, args.port)
+    server.start_in_thread()
+    print(f"명찰 출력 서버: http://{args.host}:{args.port} (명단 {len(window.records)}명)")
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    sys.exit(app.exec_())
+
+
+# ---------------------------------------------------------------------------
+# 클라이언트
+# ---------------------------------------------------------------------------
+
+def request(base_url, method, path, payload=None):
+    data = json.dumps(payload).encode("utf-8") if payload is not None else None
+    req = urllib.request.Request(base_url + path, data=data, method=method,
+                                 headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(req, timeout=10) as response:
+            return json.loads(response.read().decode("utf-8"))
+    except urllib.error.HTTPError as e:
+        return json.loads(e.read().decode("utf-8"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="명찰 출력 서버")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = sub.add_parser("serve", help="출력 서버 실행")
+    serve_parser.add_argument("--excel", help="명단 엑셀 파일")
+    serve_parser.add_argument("--settings", help="내보낸 설정 HTML")
+    serve_parser.add_argument("--image", help="배경 이미지")
+    serve_parser.add_argument("--pdf-dir", help="프린터 대신 작업별 PDF를 저장할 폴더")
+    serve_parser.add_argument("--printer", help="프린터 이름 (생략하면 기본 프린터)")
+
+    print_parser = sub.add_parser("print", help="출력 요청")
+    print_parser.add_argument("--record", type=int, help="명단 번호 (0부터)")
+    print_parser.add_argument("--name")
+    print_parser.add_argument("--company", default="")
+    print_parser.add_argument("--title", default="")
+    print_parser.add_argument("--priority", type=int, default=DEFAULT_PRIORITY)
+
+    job_parser = sub.add_parser("job", help="작업 상태 조회")
+    job_parser.add_argument("job_id", type=int)
+
+    sub.add_parser("status", help="서버 상태 조회")
+
+    args = parser.parse_args()
+    if args.command == "serve":
+        serve(args)
+        return
+
+    base_url = f"http://{args.host}:{args.port}"
+    if args.command == "print":
+        if args.record is not None:
+            payload = {"record": args.record}
+        else:
+            payload = {"name": args.name, "company": args.company, "title": args.title}
+        payload["priority"] = args.priority
+        result = request(base_url, "POST", "/print", payload)
+    elif args.command == "job":
+        result = request(base_url, "GET", f"/jobs/{args.job_id}")
+    else:
+        result = request(base_url, "GET", "/status")
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
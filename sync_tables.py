@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+전환(cut-over) 기간 동안 원래 프로젝트 → 새 프로젝트 증분 동기화
+
+테이블마다 마지막으로 옮긴 행의 (updated_at, id)를 로컬 체크포인트에 기록해 두고,
+다음 실행에서는 그 뒤에 바뀐 행만 읽어 id 기준 업서트로 반영합니다.
+배치마다 체크포인트를 저장하므로 중간에 끊겨도 이어서 진행합니다.
+
+- updated_at이 없는 테이블(profiles 등)은 created_at을 기준으로 씁니다. 이 경우 새로
+  생긴 행만 따라가므로 기존 행의 수정(체크인 등)은 --full 로 한 번씩 전체 동기화합니다.
+- 테이블별로 기준 컬럼을 따로 정할 수 있고(TABLE_CHANGE_COLUMNS, prize_winners는 won_at),
+  기준으로 쓸 시각 컬럼이 없는 테이블은 실행할 때마다 id 순서로 전부 업서트합니다.
+- 변경 시각이 NULL인 행은 키셋으로 따라갈 수 없으므로 실행할 때마다 id 순서로 전부 다시
+  업서트합니다.
+- 체크포인트는 읽기 시작 시각보다 SAFETY_MARGIN만큼 앞선 행까지만 전진합니다. 아직 커밋되지
+  않은 트랜잭션이 더 이른 변경 시각으로 나중에 커밋돼도 다음 실행에서 다시 읽습니다
+  (그 사이의 행은 매번 다시 업서트되지만 id 기준 업서트라 결과는 같음).
+- 삭제된 행은 반영하지 않습니다.
+
+사용 방법:
+  python sync_tables.py                 # 체크포인트 이후 바뀐 행만
+  python sync_tables.py --full          # 체크포인트 무시하고 전체 업서트 (체크포인트 갱신)
+  python sync_tables.py --tables profiles namecards
+"""
+
+import os
+import json
+import time
+import argparse
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from supabase import create_client, Client
+from migration_utils import iter_table_rows, batched, upsert_rows
+from migrate_data_automated import (
+    OLD_PROJECT_URL, OLD_PROJECT_KEY, NEW_PROJECT_URL, NEW_PROJECT_KEY, TABLES_ORDER,
+)
+
+CHECKPOINT_PATH = "table_sync_checkpoint.json"
+
+# 변경 시각 컬럼 후보 (앞에서부터 테이블에 있는 것을 씀)
+CHANGE_COLUMNS = ['updated_at', 'created_at']
+
+# 후보 컬럼이 없는 테이블의 기준 컬럼
+TABLE_CHANGE_COLUMNS = {
+    'prize_winners': 'won_at',
+}
+
+# 체크포인트를 읽기 시작 시각보다 이만큼 뒤에 둠 (진행 중인 트랜잭션이 늦게 커밋되는 경우 대비)
+SAFETY_MARGIN = timedelta(minutes=5)
+
+
+def parse_timestamp(value: str) -> datetime:
+    """PostgREST timestamptz 문자열 → datetime (시간대가 없으면 UTC로 간주)"""
+    parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+class SyncCheckpoint:
+    """테이블별 동기화 위치 (기준 컬럼, 마지막 값, 마지막 id)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.tables = {}
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self.tables = json.load(f)
+
+    def position(self, table: str):
+        entry = self.tables.get(table)
+        if not entry or entry.get('value') is None:
+            return None
+        return {entry['column']: entry['value'], 'id': entry['id']}
+
+    def advance(self, table: str, column: str, row: dict) -> None:
+        self.tables[table] = {
+            'column': column,
+            'value': row[column],
+            'id': row['id'],
+            'synced_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        }
+        self.save()
+
+    def save(self) -> None:
+        partial_path = self.path + '.tmp'
+        with open(partial_path, 'w', encoding='utf-8') as f:
+            json.dump(self.tables, f, ensure_ascii=False, indent=2)
+        os.replace(partial_path, self.path)
+
+
+def change_column(client: Client, table: str, checkpoint: SyncCheckpoint) -> Optional[str]:
+    """테이블의 변경 시각 컬럼 (체크포인트에 있으면 그대로, 없으면 후보를 조회해 봄)
+
+    쓸 수 있는 컬럼이 없으면 None (전체 업서트).
+    """
+    entry = checkpoint.tables.get(table)
+    if entry:
+        return entry['column']
+    candidates = [TABLE_CHANGE_COLUMNS[table]] if table in TABLE_CHANGE_COLUMNS else []
+    for column in candidates + CHANGE_COLUMNS:
+        try:
+            client.table(table).select(column).limit(1).execute()
+            return column
+        except Exception:
+            continue
+    return None
+
+
+def sync_table(old_client: Client, new_client: Client, table: str, checkpoint: SyncCheckpoint,
+               full: bool = False, batch_size: int = 500) -> int:
+    """체크포인트 이후 바뀐 행(과 변경 시각이 NULL인 행)을 업서트하고 옮긴 행 수를 돌려줍니다."""
+    column = change_column(old_client, table, checkpoint)
+    if column is None:
+        # 기준 컬럼이 없으면 체크포인트 없이 id 순서로 전부
+        count = 0
+        for batch in batched(iter_table_rows(old_client, table), batch_size):
+            upsert_rows(new_client, table, batch)
+            count += len(batch)
+        return count
+    cutoff = datetime.now(timezone.utc) - SAFETY_MARGIN
+    start_after = None if full else checkpoint.position(table)
+    rows = iter_table_rows(old_client, table, order_by=column, start_after=start_after)
+    count = 0
+    for batch in batched(rows, batch_size):
+        upsert_rows(new_client, table, batch)
+        count += len(batch)
+        # 적용한 배치 중 cutoff 이전 행까지만 체크포인트 전진 (중단돼도 다음 실행이 여기서 이어감)
+        settled = [row for row in batch if parse_timestamp(row[column]) < cutoff]
+        if settled:
+            checkpoint.advance(table, column, settled[-1])
+
+    # 변경 시각이 NULL인 행은 id 순서로 따로 (체크포인트 없이 매번 전부)
+    null_rows = iter_table_rows(old_client, table, where=lambda query: query.is_(column, 'null'))
+    for batch in batched(null_rows, batch_size):
+        upsert_rows(new_client, table, batch)
+        count += len(batch)
+    return count
+
+
+def sync_all_tables(args) -> None:
+    print("=" * 60)
+    print("증분 동기화" + (" (전체)" if args.full else ""))
+    print("=" * 60)
+
+    old_client: Client = create_client(OLD_PROJECT_URL, OLD_PROJECT_KEY)
+    new_client: Client = create_client(NEW_PROJECT_URL, NEW_PROJECT_KEY)
+    checkpoint = SyncCheckpoint(args.checkpoint)
+
+    started = time.perf_counter()
+    total = 0
+    tables = [table for table in TABLES_ORDER if not args.tables or table in args.tables]
+    for table in tables:
+        table_started = time.perf_counter()
+        try:
+            count = sync_table(old_client, new_client, table, checkpoint, args.full, args.batch_size)
+        except Exception as e:
+            # 의존 테이블이 어긋나지 않도록 실패하면 이후 테이블은 진행하지 않음
+            print(f"❌ {table} 동기화 실패: {e}")
+            break
+        total += count
+        position = checkpoint.tables.get(table)
+        basis = (f"기준 {position['column']} = {position['value']}" if position
+                 else "체크포인트 없음")
+        print(f"✅ {table}: {count}개 반영 ({time.perf_counter() - table_started:.1f}초, {basis})")
+
+    print(f"\n총 {total}개 반영, {time.perf_counter() - started:.1f}초")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="테이블 증분 동기화")
+    parser.add_argument('--full', action='store_true', help="체크포인트를 무시하고 전체 업서트")
+    parser.add_argument('--tables', nargs='+', help="동기화할 테이블 (기본: 전체, 의존 순서)")
+    parser.add_argument('--batch-size', type=int, default=500)
+    parser.add_argument('--checkpoint', default=CHECKPOINT_PATH)
+    sync_all_tables(parser.parse_args())
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        print("\n\n동기화가 중단되었습니다. 다시 실행하면 이어서 진행합니다.")
@@ -0,0 +1,37 @@
+-- 마이그레이션 검증용 구간 체크섬 함수 (원래 프로젝트와 새 프로젝트 모두에 설치)
+-- verify_migration.py가 호출합니다. 없으면 id·변경 시각만 읽어 클라이언트에서 계산합니다.
+--
+-- id가 [p_from, p_to) 구간인 행을 공통 컬럼(p_columns)만 남긴 JSONB로 바꾼 뒤
+-- id 순서로 해시합니다. JSONB는 키 순서가 정규화되므로 두 프로젝트의 컬럼 순서가
+-- 달라도 같은 내용이면 같은 체크섬이 나옵니다.
+
+CREATE OR REPLACE FUNCTION public.range_checksum(
+  p_schema text,
+  p_table text,
+  p_columns text[],
+  p_from text DEFAULT NULL,
+  p_to text DEFAULT NULL
+)
+RETURNS TABLE(row_count bigint, checksum text)
+LANGUAGE plpgsql STABLE
+AS $$
+DECLARE
+  condition text := 'true';
+BEGIN
+  -- 따옴표 리터럴은 id 컬럼 타입(uuid 등)으로 해석되어 PostgREST 정렬 순서와 같음
+  IF p_from IS NOT NULL THEN
+    condition := condition || format(' AND t.id >= %L', p_from);
+  END IF;
+  IF p_to IS NOT NULL THEN
+    condition := condition || format(' AND t.id < %L', p_to);
+  END IF;
+  RETURN QUERY EXECUTE format(
+    'SELECT count(*), coalesce(md5(string_agg(md5((
+         SELECT jsonb_object_agg(e.key, e.value)
+           FROM jsonb_each(to_jsonb(t)) e
+          WHERE e.key = ANY(%L::text[]))::text), '''' ORDER BY t.id)), md5(''''))
+       FROM %I.%I t
+      WHERE %s',
+    p_columns, p_schema, p_table, condition);
+END;
+$$;
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+마이그레이션 결과 검증 (행 수 + id 구간별 체크섬)
+
+테이블 전체를 양쪽에서 내려받아 len()을 비교하는 대신:
+1. 양쪽 행 수를 count 쿼리로만 조회하고,
+2. 원래 프로젝트의 id만 읽어 chunk_size개씩 id 구간을 나눈 뒤,
+3. 구간마다 양쪽 체크섬을 비교해서,
+4. 체크섬이 다른 구간만 행을 내려받아 빠진/남는/내용이 다른 id를 정확히 찾습니다.
+
+체크섬은 두 프로젝트에 verify_checksums.sql의 range_checksum 함수가 있으면 서버에서
+계산합니다(전체 행 내용 비교). 한쪽이라도 없으면 id와 변경 시각(updated_at 또는
+created_at)만 읽어 클라이언트에서 계산합니다. 이 경우 빠진 행과 변경 시각이 다른 행은
+찾지만, 변경 시각이 같은데 내용만 다른 행은 찾지 못합니다.
+
+사용 방법:
+  python verify_migration.py [--tables profiles namecards] [--chunk-size 1000] [--report verify_report.json]
+"""
+
+import json
+import hashlib
+import argparse
+from typing import Any, Dict, List, Optional, Tuple
+from supabase import Client
+from migration_utils import iter_table_rows, table_query, count_rows, rpc_missing
+
+CHECKSUM_RPC = 'range_checksum'
+DEFAULT_CHUNK_SIZE = 1000
+SOURCE_SCHEMA = 'public'
+TARGET_SCHEMA = 'nametag'
+
+
+def row_digest(row: Dict[str, Any], columns: List[str]) -> str:
+    """공통 컬럼만 정렬된 JSON으로 바꿔 해시 (키 순서·컬럼 순서와 무관)"""
+    canonical = json.dumps({column: row.get(column) for column in columns}, sort_keys=True,
+                           ensure_ascii=False, separators=(',', ':'), default=str)
+    return hashlib.md5(canonical.encode('utf-8')).hexdigest()
+
+
+def range_filter(low: Optional[str], high: Optional[str]):
+    def where(query):
+        if low is not None:
+            query = query.gte('id', low)
+        if high is not None:
+            query = query.lt('id', high)
+        return query
+    return where
+
+
+class TableVerifier:
+    """테이블 하나를 원래 프로젝트(source)와 새 프로젝트(target) 사이에서 검증"""
+
+    def __init__(self, source: Client, target: Client, table: str, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self.source = source
+        self.target = target
+        self.table = table
+        self.chunk_size = chunk_size
+        self.columns = self.common_columns()
+        self.use_rpc = True
+        fallback = [column for column in ('updated_at', 'created_at') if column in self.columns][:1]
+        self.fallback_columns = ['id'] + fallback
+
+    def _sides(self):
+        return ((self.source, SOURCE_SCHEMA), (self.target, TARGET_SCHEMA))
+
+    def common_columns(self) -> List[str]:
+        """양쪽에 모두 있는 컬럼 (새 프로젝트에만 추가된 컬럼은 비교에서 제외)"""
+        column_sets = []
+        for client, schema in self._sides():
+            rows = table_query(client, self.table, schema).select('*').limit(1).execute().data or []
+            if rows:
+                column_sets.append(set(rows[0]))
+        if not column_sets:
+            return ['id']
+        return sorted(set.intersection(*column_sets))
+
+    def boundaries(self) -> List[Tuple[Optional[str], Optional[str]]]:
+        """원래 프로젝트의 id를 chunk_size개씩 나눈 [low, high) 구간 (처음과 끝은 열린 구간)"""
+        starts = [row['id'] for n, row in enumerate(iter_table_rows(self.source, self.table, columns='id'))
+                  if n % self.chunk_size == 0]
+        lows = [None] + starts[1:]
+        highs = starts[1:] + [None]
+        return list(zip(lows, highs)) or [(None, None)]
+
+    def _rpc_checksum(self, client: Client, schema: str, low, high) -> Tuple[int, str]:
+        data = client.rpc(CHECKSUM_RPC, {
+            'p_schema': schema, 'p_table': self.table, 'p_columns': self.columns,
+            'p_from': low, 'p_to': high,
+        }).execute().data
+        return data[0]['row_count'], data[0]['checksum']
+
+    def _client_checksum(self, client: Client, schema: str, low, high) -> Tuple[int, str]:
+        digest = hashlib.md5()
+        count = 0
+        for row in iter_table_rows(client, self.table, schema=schema,
+                                   columns=','.join(self.fallback_columns), where=range_filter(low, high)):
+            digest.update(row_digest(row, self.fallback_columns).encode('ascii'))
+            count += 1
+        return count, digest.hexdigest()
+
+    def checksums(self, low, high) -> Tuple[Tuple[int, str], Tuple[int, str]]:
+        """(원본, 대상) 구간 체크섬. 한쪽이라도 RPC가 없으면 양쪽 모두 클라이언트 계산으로."""
+        if self.use_rpc:
+            try:
+                return tuple(self._rpc_checksum(client, schema, low, high) for client, schema in self._sides())
+            except Exception as e:
+                if not rpc_missing(e):
+                    raise
+                print(f"  ⚠️  {CHECKSUM_RPC} 함수 없음, id·변경 시각으로 비교합니다 (verify_checksums.sql 참고)")
+                self.use_rpc = False
+        return tuple(self._client_checksum(client, schema, low, high) for client, schema in self._sides())
+
+    def diff_range(self, low, high) -> Dict[str, List[Any]]:
+        """체크섬이 다른 구간만 행을 내려받아 빠진/남는/다른 id를 찾습니다."""
+        digests = []
+        for client, schema in self._sides():
+            rows = iter_table_rows(client, self.table, schema=schema,
+                                   columns=','.join(self.columns), where=range_filter(low, high))
+            digests.append({row['id']: row_digest(row, self.columns) for row in rows})
+        source, target = digests
+        return {
+            'missing': [key for key in source if key not in target],
+            'extra': [key for key in target if key not in source],
+            'divergent': [key for key in source if key in target and source[key] != target[key]],
+        }
+
+    def verify(self) -> Dict[str, Any]:
+        report = {
+            'table': self.table,
+            'source_count': count_rows(self.source, self.table, SOURCE_SCHEMA),
+            'target_count': count_rows(self.target, self.table, TARGET_SCHEMA),
+            'ranges': 0,
+            'mismatched_ranges': 0,
+            'missing': [],
+            'extra': [],
+            'divergent': [],
+        }
+        for low, high in self.boundaries():
+            report['ranges'] += 1
+            source_checksum, target_checksum = self.checksums(low, high)
+            if source_checksum == target_checksum:
+                continue
+            report['mismatched_ranges'] += 1
+            for key, ids in self.diff_range(low, high).items():
+                report[key].extend(ids)
+        report['mode'] = 'rpc' if self.use_rpc else 'client'
+        report['ok'] = not (report['missing'] or report['extra'] or report['divergent'])
+        return report
+
+
+def verify_tables(source: Client, target: Client, tables: List[str],
+                  chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[Dict[str, Any]]:
+    """테이블마다 검증하고 결과를 출력합니다."""
+    reports = []
+    for table in tables:
+        try:
+            report = TableVerifier(source, target, table, chunk_size).verify()
+        except Exception as e:
+            print(f"❌ {table} 검증 실패: {e}")
+            reports.append({'table': table, 'ok': False, 'error': str(e)})
+            continue
+        reports.append(report)
+        status = "✅" if report['ok'] else "⚠️"
+        print(f"{status} {table}: 기존 {report['source_count']}개 → 새 {report['target_count']}개, "
+              f"구간 {report['mismatched_ranges']}/{report['ranges']}개 불일치 ({report['mode']})")
+        for key, label in (('missing', '빠짐'), ('extra', '새 프로젝트에만 있음'), ('divergent', '내용 다름')):
+            if report[key]:
+                preview = ', '.join(str(key_id) for key_id in report[key][:5])
+                more = f" 외 {len(report[key]) - 5}개" if len(report[key]) > 5 else ""
+                print(f"    {label} {len(report[key])}개: {preview}{more}")
+    return reports
+
+
+def main():
+    from supabase import create_client
+    from migrate_data_automated import (
+        OLD_PROJECT_URL, OLD_PROJECT_KEY, NEW_PROJECT_URL, NEW_PROJECT_KEY, TABLES_ORDER,
+    )
+
+    parser = argparse.ArgumentParser(description="마이그레이션 결과 검증")
+    parser.add_argument('--tables', nargs='+', help="검증할 테이블 (기본: 전체)")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help="체크섬 구간당 행 수")
+    parser.add_argument('--report', default='verify_report.json', help="결과 JSON 경로")
+    args = parser.parse_args()
+
+    reports = verify_tables(create_client(OLD_PROJECT_URL, OLD_PROJECT_KEY),
+                            create_client(NEW_PROJECT_URL, NEW_PROJECT_KEY),
+                            args.tables or TABLES_ORDER, args.chunk_size)
+    with open(args.report, 'w', encoding='utf-8') as f:
+        json.dump(reports, f, ensure_ascii=False, indent=2, default=str)
+    print(f"\n결과: {args.report}")
+
+
+if __name__ == "__main__":
+    main()